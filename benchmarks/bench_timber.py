@@ -0,0 +1,285 @@
+'''Benchmarks for material loading, scalar checks, auto-design and batches.
+
+Each benchmark records the best and median time per call over several
+repeats and the peak memory allocated by a single call. Results are written
+to a JSON file so runs of different versions can be compared.
+
+Run with the timber package installed, e.g. pip install -e . from the repo root.
+
+Usage:
+    python benchmarks/bench_timber.py                     # run all, save results
+    python benchmarks/bench_timber.py --filter auto_design
+    python benchmarks/bench_timber.py --compare benchmarks/results/old.json
+'''
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+from timber.material import TimberMaterial, reload_material_data
+from timber.beam import TimberBeam
+from timber.design import TimberDesign
+from timber.joist import TimberJoist
+from timber.batch import find_utilisation_results_batch
+from timber.schedule import design_schedule
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+MATERIAL_GRADES = {
+    "softwood": "C24",
+    "hardwood": "D30",
+    "glulam": "GL28H",
+    "lvl": "LVL_S44",
+    "green_oak": "TH1",
+    }
+DESIGN_ARGS = ("medium_term", True, 1.5, 2.0, 0.3, 16, False)
+AUTO_DESIGN_LENGTHS = {
+    "softwood": 4000,
+    "hardwood": 4000,
+    "glulam": 8000,
+    "lvl": 8000,
+    "green_oak": 4000,
+    }
+
+
+def _material_benchmarks() -> dict:
+    def construct_uncached():
+        reload_material_data()
+        TimberMaterial("softwood", "C24", 1)
+
+    def construct_cached():
+        TimberMaterial("softwood", "C24", 1)
+
+    return {
+        "material/construct_uncached": construct_uncached,
+        "material/construct_cached": construct_cached,
+        }
+
+
+def _beam_getter_benchmarks() -> dict:
+    material = TimberMaterial("softwood", "C24", 1)
+    getter_args = {
+        "get_beam_selfweight_per_m": (),
+        "get_shear_stress": (5,),
+        "get_shear_strength": (True, "medium_term"),
+        "get_bending_stress": (5,),
+        "get_critical_bending_stress": (),
+        "get_relative_slenderness": (),
+        "get_bending_strength": (True, "medium_term"),
+        "get_buckling_strength": (True, "medium_term"),
+        "get_bearing_stress": (100, 5),
+        "get_bearing_strength": ("medium_term", 0),
+        "get_flexural_deflection": (2, 0.3),
+        "get_shear_deflection": (2, 0.3),
+        "get_design_bending_moment": (1.5, 2),
+        "get_design_shear_force": (1.5, 2),
+        "get_final_deflection": (1.5, 2),
+        }
+    benchmarks = {}
+    for getter, args in getter_args.items():
+        def run(getter=getter, args=args):
+            # a fresh beam per call so derived value caching does not hide the cost
+            beam = TimberBeam(4000, 47, 200, material)
+            getattr(beam, getter)(*args)
+        benchmarks[f"beam/{getter}"] = run
+    return benchmarks
+
+
+def _design_benchmarks() -> dict:
+    material = TimberMaterial("softwood", "C24", 1)
+    design = TimberDesign(4000, 47, 200, material)
+
+    def find_utilisation_results_fresh():
+        TimberDesign(4000, 47, 200, material)._find_utilisation_results(*DESIGN_ARGS)
+
+    def find_utilisation_results_reused():
+        design._find_utilisation_results(*DESIGN_ARGS)
+
+    benchmarks = {
+        "design/find_utilisation_results_fresh": find_utilisation_results_fresh,
+        "design/find_utilisation_results_reused": find_utilisation_results_reused,
+        }
+    for material_type, grade in MATERIAL_GRADES.items():
+        material = TimberMaterial(material_type, grade, 1)
+        length = AUTO_DESIGN_LENGTHS[material_type]
+        max_height = 1800 if material_type in ["glulam", "lvl"] else 600
+
+        def size_list(material=material, length=length):
+            TimberDesign(length, 100, 100, material).get_auto_designed_timber_size_list(*DESIGN_ARGS)
+
+        def size_height(material=material, length=length, max_height=max_height, search_method="linear"):
+            TimberDesign(length, 65, 100, material).get_auto_designed_timber_size_height(
+                *DESIGN_ARGS, max_height=max_height, search_method=search_method)
+
+        def size_breadth(material=material, length=length, search_method="linear"):
+            TimberDesign(length, 40, 300, material).get_auto_designed_timber_size_breadth(
+                *DESIGN_ARGS, search_method=search_method)
+
+        benchmarks[f"auto_design/list/{material_type}"] = size_list
+        for search_method in TimberDesign.VALID_SEARCH_METHODS:
+            benchmarks[f"auto_design/height/{search_method}/{material_type}"] = (
+                lambda run=size_height, search_method=search_method: run(search_method=search_method))
+            benchmarks[f"auto_design/breadth/{search_method}/{material_type}"] = (
+                lambda run=size_breadth, search_method=search_method: run(search_method=search_method))
+    return benchmarks
+
+
+def _joist_benchmarks() -> dict:
+    joist = TimberJoist(4000, 4000, 47, 200)
+    joist_stiffness_per_metre = 11000 * joist.get_second_moment_of_area() / 0.4
+    return {
+        "joist/get_fundamental_frequency": lambda: joist.get_fundamental_frequency(
+            joist_stiffness_per_metre, 50),
+        "joist/get_number_of_first_order_modes": lambda: joist.get_number_of_first_order_modes(
+            50, 2.66e9, joist_stiffness_per_metre),
+        "joist/get_impulse_velocity_response": lambda: joist.get_impulse_velocity_response(1.5, 50),
+        "joist/get_impulse_velocity_limit": lambda: joist.get_impulse_velocity_limit(10, 0.02),
+        "joist/get_k_dist": lambda: joist.get_k_dist(2.66e9, 400),
+        "joist/get_floor_utilisation_results": lambda: joist.get_floor_utilisation_results(
+            400, 0.5, 1.5, 2.66e9),
+        "joist/get_max_span": lambda: joist.get_max_span(400, 0.5, 1.5, 2.66e9),
+        }
+
+
+def _batch_benchmarks(sizes: list) -> dict:
+    material = TimberMaterial("softwood", "C24", 1)
+    benchmarks = {}
+    for size in sizes:
+        rng = np.random.default_rng(0)
+        lengths = rng.uniform(1000, 6000, size)
+        breadths = rng.choice([47, 63, 75], size)
+        heights = rng.choice([150, 200, 250], size)
+
+        def vectorised(lengths=lengths, breadths=breadths, heights=heights):
+            find_utilisation_results_batch(material, lengths, breadths, heights,
+                                           "medium_term", True, 1.5, 2.0, 0.3, 16, False,
+                                           include_selfweight=True)
+
+        def scalar(lengths=lengths, breadths=breadths, heights=heights):
+            for length, breadth, height in zip(lengths, breadths, heights):
+                TimberDesign(length, breadth, height, material)._find_utilisation_results_with_selfweight(
+                    *DESIGN_ARGS)
+
+        benchmarks[f"batch/vectorised/{size}"] = vectorised
+        benchmarks[f"batch/scalar/{size}"] = scalar
+
+    schedule_size = sizes[0]
+    rows = [{"length": 1000 + i % 5000, "permanent_udl": 1.5, "imposed_udl": 2.0,
+             "deflection_limit_ratio": 250, "is_restrained": False}
+            for i in range(schedule_size)]
+    benchmarks[f"batch/schedule_list_in_process/{schedule_size}"] = lambda: design_schedule(rows, workers=1)
+    return benchmarks
+
+
+def get_benchmarks(batch_sizes: list) -> dict:
+    benchmarks = {}
+    benchmarks.update(_material_benchmarks())
+    benchmarks.update(_beam_getter_benchmarks())
+    benchmarks.update(_design_benchmarks())
+    benchmarks.update(_joist_benchmarks())
+    benchmarks.update(_batch_benchmarks(batch_sizes))
+    return benchmarks
+
+
+def run_benchmark(function, repeats: int, min_time: float) -> dict:
+    '''Returns the best and median seconds per call and the peak memory in bytes.'''
+    function()  # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 10**6:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "best_s": min(timings),
+        "median_s": statistics.median(timings),
+        "calls_per_repeat": number,
+        "repeats": repeats,
+        "peak_memory_bytes": peak_memory,
+        }
+
+
+def _get_git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the timber design benchmarks.")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds per repeat, calls are batched to reach it")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--output", default=None,
+                        help="results file, defaults to benchmarks/results/<git revision>.json")
+    parser.add_argument("--compare", default=None, help="previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    revision = _get_git_revision()
+    results = {
+        "metadata": {
+            "revision": revision,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            },
+        "benchmarks": {},
+        }
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)["benchmarks"]
+
+    for name, function in get_benchmarks(args.batch_sizes).items():
+        if args.filter not in name:
+            continue
+        result = run_benchmark(function, args.repeats, args.min_time)
+        results["benchmarks"][name] = result
+        line = (f"{name:60} {_format_time(result['best_s'])}"
+                f" {result['peak_memory_bytes'] / 1024:10.1f} KiB")
+        if previous and name in previous:
+            line += f"  x{previous[name]['best_s'] / result['best_s']:.2f} vs previous"
+        print(line)
+
+    output = args.output or os.path.join(REPO_ROOT, "benchmarks", "results", f"{revision}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding='utf-8') as f:
+        json.dump(results, f, indent=4)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
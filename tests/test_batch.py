@@ -0,0 +1,102 @@
+import math
+import random
+from types import MappingProxyType
+
+import pytest
+
+from timber import FrozenTimberBeam, LoadDuration, TimberDesign, TimberMaterial, reload_material_data
+from timber import material
+from timber.batch import find_utilisation_results_batch_for_beams
+
+
+GRADES = {"softwood": "C24", "hardwood": "D30", "glulam": "GL28H", "lvl": "LVL_S44", "green_oak": "TH1"}
+
+
+def random_members(count, seed):
+    generator = random.Random(seed)
+    beams = []
+    inputs = []
+    for index in range(count):
+        material_type = list(GRADES)[index % len(GRADES)]
+        service_class = generator.choice([1, 2, 3])
+        length = generator.uniform(1000, 8000)
+        breadth = generator.choice([38, 47, 63, 100, 200, 300])
+        height = generator.choice([75, 150, 200, 300, 450])
+        effective_length_factor = generator.choice([0.9, 1.0, 1.2])
+        if generator.random() < 0.5:
+            beam = FrozenTimberBeam(length, breadth, height, material_type, GRADES[material_type],
+                                    service_class, effective_length_factor)
+        else:
+            beam = TimberDesign(length, breadth, height,
+                                TimberMaterial(material_type, GRADES[material_type], service_class),
+                                effective_length_factor)
+        beams.append(beam)
+        inputs.append({
+            "load_duration": generator.choice(list(LoadDuration)),
+            "is_load_sharing": generator.random() < 0.5,
+            "permanent_udl": generator.uniform(0, 5),
+            "imposed_udl": generator.uniform(0, 5),
+            "imposed_combination_factor": generator.choice([0.3, 0.6]),
+            "deflection_limit": length / 250,
+            "is_restrained": generator.random() < 0.5,
+            "permanent_load_factor": generator.choice([1.0, 1.35]),
+            "variable_load_factor": generator.choice([1.0, 1.5]),
+            "with_creep": generator.random() < 0.7,
+            })
+    return beams, inputs
+
+
+def scalar_results(beam, member_inputs, include_selfweight=False):
+    design = beam if isinstance(beam, TimberDesign) else beam.to_timber_design()
+    find = (design._find_utilisation_results_with_selfweight if include_selfweight
+            else design._find_utilisation_results)
+    return find(**member_inputs)
+
+
+def assert_batch_results_match(results, beams, inputs, include_selfweight=False):
+    for index, (beam, member_inputs) in enumerate(zip(beams, inputs)):
+        expected = scalar_results(beam, member_inputs, include_selfweight)
+        for check, ur in expected.items():
+            if ur is None:
+                assert math.isnan(results[check][index]), (check, beam, member_inputs)
+            else:
+                assert results[check][index] == pytest.approx(ur, rel=1e-12), (check, beam, member_inputs)
+
+
+@pytest.mark.parametrize("include_selfweight", [False, True])
+def test_batch_results_match_the_scalar_results(include_selfweight):
+    beams, inputs = random_members(250, seed=2)
+    arrays = {field: [member_inputs[field] for member_inputs in inputs] for field in inputs[0]}
+    results = find_utilisation_results_batch_for_beams(beams, include_selfweight=include_selfweight, **arrays)
+    assert_batch_results_match(results, beams, inputs, include_selfweight)
+    for field in ["is_load_sharing", "is_restrained", "with_creep"]:
+        assert 0 < sum(arrays[field]) < len(beams)
+
+
+def test_scalar_load_duration_and_creep_apply_to_every_beam():
+    beams, inputs = random_members(50, seed=3)
+    for member_inputs in inputs:
+        member_inputs.update(load_duration="short_term", with_creep=False)
+    arrays = {field: [member_inputs[field] for member_inputs in inputs] for field in inputs[0]}
+    arrays.update(load_duration="short_term", with_creep=False)
+    results = find_utilisation_results_batch_for_beams(beams, **arrays)
+    assert_batch_results_match(results, beams, inputs)
+
+
+def test_beams_of_reloaded_material_data_are_not_grouped_together(monkeypatch):
+    reload_material_data()
+    old_design = TimberDesign(4000, 47, 200, TimberMaterial("softwood", "C24", 1))
+    softwood_data = dict(material.load_material_data("softwood"))
+    softwood_data["C24"] = MappingProxyType(dict(softwood_data["C24"], f_m_y_k=20.0))
+    reload_material_data("softwood")
+    monkeypatch.setitem(material._MATERIAL_DATA, "softwood", MappingProxyType(softwood_data))
+    try:
+        beams = [old_design, FrozenTimberBeam(4000, 47, 200)]
+        inputs = [{"load_duration": "medium_term", "is_load_sharing": False, "permanent_udl": 1.5,
+                   "imposed_udl": 2.0, "imposed_combination_factor": 0.3, "deflection_limit": 16}] * 2
+        results = find_utilisation_results_batch_for_beams(beams, "medium_term", False, 1.5, 2.0, 0.3, 16)
+        assert_batch_results_match(results, beams, inputs)
+        assert results["bending_UR"][1] > results["bending_UR"][0]
+    finally:
+        monkeypatch.undo()
+        reload_material_data()
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from timber import BeamAnalysis, TimberDesign, TimberMaterial
+
+
+FLEXURAL_RIGIDITY = 11000 * 47 * 200**3 / 12
+
+
+def stations(analysis, position):
+    '''Returns the indices of the stations at the position, two at interior supports.'''
+    return np.flatnonzero(np.isclose(analysis.positions, position))
+
+
+def test_cantilever_point_load_at_the_tip():
+    length, load = 2500, 3.0
+    analysis = BeamAnalysis([length], "cantilever")
+    effects = analysis.find_load_effects([{"type": "point", "position": length, "magnitude": load}],
+                                         FLEXURAL_RIGIDITY)
+    expected_deflection = load * 1000 * length**3 / (3 * FLEXURAL_RIGIDITY)
+    assert effects["deflection"][0, -1] == pytest.approx(expected_deflection, rel=1e-9)
+    assert effects["moment"][0, 0] == pytest.approx(-load * length / 1000, rel=1e-9)
+    assert effects["reaction"][0] == pytest.approx([load, load * length / 1000], rel=1e-9)
+
+
+def test_simply_supported_point_load_at_midspan():
+    length, load = 4000, 5.0
+    analysis = BeamAnalysis([length])
+    effects = analysis.find_load_effects([{"type": "point", "position": length / 2, "magnitude": load}],
+                                         FLEXURAL_RIGIDITY)
+    expected_deflection = load * 1000 * length**3 / (48 * FLEXURAL_RIGIDITY)
+    assert effects["deflection"][0, stations(analysis, length / 2)] == pytest.approx(expected_deflection, rel=1e-9)
+    assert effects["moment"][0].max() == pytest.approx(load * length / 4000, rel=1e-9)
+    assert effects["reaction"][0] == pytest.approx([load / 2, load / 2], rel=1e-9)
+
+
+def test_two_span_continuous_udl():
+    span, udl = 3600, 2.5
+    analysis = BeamAnalysis([span, span], "continuous")
+    effects = analysis.find_load_effects([{"type": "udl", "magnitude": udl}])
+    total_load = udl * span / 1000
+    assert effects["reaction"][0] == pytest.approx([3 / 8 * total_load, 10 / 8 * total_load,
+                                                    3 / 8 * total_load], rel=1e-9)
+    support_moment = -udl * (span / 1000)**2 / 8
+    assert len(stations(analysis, span)) == 2
+    assert effects["moment"][0, stations(analysis, span)] == pytest.approx(support_moment, rel=1e-9)
+    assert effects["moment"][0].min() == pytest.approx(support_moment, rel=1e-9)
+
+
+@pytest.mark.parametrize("start, end", [(0, 1500), (1000, 2600), (2200, 4000)])
+def test_simply_supported_partial_udl(start, end):
+    length, udl = 4000, 3.0
+    analysis = BeamAnalysis([length], stations_per_span=41)
+    effects = analysis.find_load_effects([{"type": "udl", "start": start, "end": end, "magnitude": udl}],
+                                         FLEXURAL_RIGIDITY)
+    # udl in [N/mm], reactions in [N]
+    left_reaction = udl * (end - start) * (length - (start + end) / 2) / length
+    assert effects["reaction"][0] == pytest.approx([left_reaction / 1000,
+                                                    (udl * (end - start) - left_reaction) / 1000], rel=1e-9)
+
+    def moment(x):
+        return (left_reaction * x - udl / 2 * max(x - start, 0)**2 + udl / 2 * max(x - end, 0)**2)
+
+    def deflection(x):
+        # Macaulay's method with EI d2v/dx2 = -M, v = 0 at both supports
+        def integrated_moment(x):
+            return (left_reaction * x**3 / 6 - udl / 24 * max(x - start, 0)**4
+                    + udl / 24 * max(x - end, 0)**4)
+        return (integrated_moment(length) * x / length - integrated_moment(x)) / FLEXURAL_RIGIDITY
+
+    for index, x in enumerate(analysis.positions):
+        assert effects["moment"][0, index] == pytest.approx(moment(x) / 10**6, rel=1e-9, abs=1e-9)
+        assert effects["deflection"][0, index] == pytest.approx(deflection(x), rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("is_restrained", [True, False])
+@pytest.mark.parametrize("include_selfweight", [True, False])
+def test_simply_supported_udl_matches_the_utilisation_results(is_restrained, include_selfweight):
+    design = TimberDesign(4500, 63, 250, TimberMaterial("glulam", "GL24H", 2))
+    design_args = {
+        "load_duration": "medium_term",
+        "is_load_sharing": True,
+        "imposed_combination_factor": 0.3,
+        "deflection_limit": 4500 / 250,
+        "is_restrained": is_restrained,
+        }
+    results = design.find_beam_analysis_utilisation_results(
+        BeamAnalysis.for_geometry([4500]),
+        permanent_loads=[{"type": "udl", "magnitude": 1.5}],
+        imposed_loads=[{"type": "udl", "magnitude": 2.0}],
+        include_selfweight=include_selfweight,
+        **design_args)
+    find = (design._find_utilisation_results_with_selfweight if include_selfweight
+            else design._find_utilisation_results)
+    expected = find(permanent_udl=1.5, imposed_udl=2.0, **design_args)
+    for check, ur in expected.items():
+        if ur is None:
+            assert results[check] is None
+        else:
+            assert results[check] == pytest.approx(ur, rel=1e-9)
@@ -0,0 +1,94 @@
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+
+from timber import DesignCache, TimberDesign, get_shared_material, reload_material_data
+from timber import design_cache, material
+
+
+DESIGN_ARGS = ("medium_term", True, 1.5, 2.0, 0.3, 16)
+
+AUTO_DESIGN_METHODS = ["get_auto_designed_timber_size_list",
+                       "get_auto_designed_timber_size_height",
+                       "get_auto_designed_timber_size_breadth"]
+
+
+def new_design():
+    return TimberDesign(4000, 47, 200, get_shared_material("softwood", "C24", 1))
+
+
+@pytest.fixture(autouse=True)
+def fresh_material_data():
+    reload_material_data()
+    yield
+    reload_material_data()
+
+
+@pytest.mark.parametrize("method", AUTO_DESIGN_METHODS)
+def test_repeated_query_on_the_same_design_hits(method):
+    cache = DesignCache()
+    design = new_design()
+    results = cache.auto_design(design, method, *DESIGN_ARGS)
+    assert cache.auto_design(design, method, *DESIGN_ARGS) == results
+    assert cache.get_stats()["misses"] == 1
+    assert cache.get_stats()["memory_hits"] == 1
+    assert (design.breadth, design.height) == (results["breadth"], results["height"])
+
+
+@pytest.mark.parametrize("method", AUTO_DESIGN_METHODS)
+def test_keyword_and_positional_queries_share_a_key(method):
+    cache = DesignCache()
+    cache.auto_design(new_design(), method, *DESIGN_ARGS)
+    cache.auto_design(new_design(), method,
+                      load_duration="medium_term",
+                      is_load_sharing=True,
+                      permanent_udl=1.5,
+                      imposed_udl=2,
+                      imposed_combination_factor=0.3,
+                      deflection_limit=16,
+                      is_restrained=True)
+    assert cache.get_stats()["misses"] == 1
+    assert cache.get_stats()["memory_hits"] == 1
+
+
+def test_fixed_dimension_is_part_of_the_key():
+    cache = DesignCache()
+    cache.auto_design(new_design(), "get_auto_designed_timber_size_height", *DESIGN_ARGS)
+    design = new_design()
+    design.breadth = 63
+    cache.auto_design(design, "get_auto_designed_timber_size_height", *DESIGN_ARGS)
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_changed_material_data_misses(monkeypatch):
+    cache = DesignCache()
+    method = "get_auto_designed_timber_size_list"
+    cache.auto_design(new_design(), method, *DESIGN_ARGS)
+    reload_material_data("softwood")
+    cache.auto_design(new_design(), method, *DESIGN_ARGS)
+    assert cache.get_stats()["memory_hits"] == 1
+
+    softwood_data = dict(material.load_material_data("softwood"))
+    softwood_data["C24"] = MappingProxyType(dict(softwood_data["C24"], f_m_y_k=20.0))
+    reload_material_data("softwood")
+    monkeypatch.setitem(material._MATERIAL_DATA, "softwood", MappingProxyType(softwood_data))
+    cache.auto_design(new_design(), method, *DESIGN_ARGS)
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_disk_tier_is_shared_and_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = iter(range(1, 1000))
+    monkeypatch.setattr(design_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    file_path = str(tmp_path / "design_cache.sqlite")
+    with DesignCache(file_path, max_memory_entries=0, max_disk_entries=2) as cache:
+        for key in ["a", "b"]:
+            cache.put(key, {"key": key})
+        assert cache.get("a") == {"key": "a"}
+        cache.put("c", {"key": "c"})
+        assert cache.get_stats()["disk_entries"] == 2
+        assert cache.get("b") is None
+
+    with DesignCache(file_path, max_memory_entries=0, max_disk_entries=2) as cache:
+        assert cache.get("a") == {"key": "a"}
+        assert cache.get("c") == {"key": "c"}
+        assert cache.get_stats()["disk_hits"] == 2
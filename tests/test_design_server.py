@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+import pytest
+
+from timber import design_server
+from timber.design_server import DesignBatcher
+from timber.schedule import design_schedule_row
+
+
+def member_row(member_id, length=4000):
+    return {"id": member_id, "length": length, "permanent_udl": 1.5, "imposed_udl": 2.0,
+            "deflection_limit_ratio": 250}
+
+
+def test_identical_concurrent_requests_are_designed_once():
+    rows = [member_row(f"B{index}", 3000 + 500 * (index % 3)) for index in range(30)]
+
+    async def design_rows():
+        async with DesignBatcher(workers=1, batch_window=0.05) as batcher:
+            results = await asyncio.gather(*(batcher.design(row) for row in rows))
+            return results, batcher.get_stats()
+
+    results, stats = asyncio.run(design_rows())
+    assert stats == {"requests": 30, "batches": 1, "designed_members": 3}
+    assert results == [design_schedule_row(row) for row in rows]
+
+
+def test_failing_member_does_not_fail_its_batch_mates():
+    rows = [member_row("B1"), ["not", "a", "member"], member_row("B2", 5000), member_row("B3", 0)]
+
+    async def design_rows():
+        async with DesignBatcher(workers=1, batch_window=0.05) as batcher:
+            results = await asyncio.gather(*(batcher.design(row) for row in rows), return_exceptions=True)
+            return results, batcher.get_stats()
+
+    results, stats = asyncio.run(design_rows())
+    assert stats["batches"] == 1
+    assert isinstance(results[1], AttributeError)
+    assert results[0] == design_schedule_row(rows[0])
+    assert results[2] == design_schedule_row(rows[2])
+    assert results[0]["error"] == results[2]["error"] == ""
+    assert "must be positive" in results[3]["error"]
+
+
+def test_requests_wait_while_the_queue_is_full(monkeypatch):
+    release = threading.Event()
+
+    def blocked_design_schedule_rows(rows):
+        release.wait(5)
+        return [design_schedule_row(row) for row in rows]
+
+    monkeypatch.setattr(design_server, "design_schedule_rows", blocked_design_schedule_rows)
+
+    async def design_rows():
+        async with DesignBatcher(workers=1, batch_window=0, max_batch_size=1, max_batches_in_flight=1,
+                                 max_pending_requests=2) as batcher:
+            # one batch being designed, one waiting for a slot and two queued
+            futures = [await batcher.submit(member_row(f"B{index}", 3000 + index)) for index in range(4)]
+            await asyncio.sleep(0.05)
+            blocked_submit = asyncio.create_task(batcher.submit(member_row("B4", 3004)))
+            await asyncio.sleep(0.05)
+            assert not blocked_submit.done()
+            release.set()
+            futures.append(await blocked_submit)
+            return await asyncio.gather(*futures)
+
+    results = asyncio.run(design_rows())
+    assert [result["id"] for result in results] == ["B0", "B1", "B2", "B3", "B4"]
+
+
+def test_closed_batcher_rejects_requests():
+    async def design_after_close():
+        batcher = DesignBatcher(workers=1)
+        await batcher.design(member_row("B1"))
+        await batcher.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            await batcher.design(member_row("B2"))
+
+    asyncio.run(design_after_close())
@@ -0,0 +1,95 @@
+import random
+
+import numpy as np
+import pytest
+
+from timber import TimberJoist
+from timber.batch import find_floor_vibration_results_batch
+
+
+def random_floors(count, seed):
+    generator = random.Random(seed)
+    floors = []
+    for _ in range(count):
+        floors.append({
+            "length": generator.uniform(1500, 7000),
+            "floor_width": generator.uniform(2000, 9000),
+            "joist_stiffness_per_metre": generator.uniform(0.5e12, 5e12),
+            "floor_stiffness_per_metre": generator.uniform(0.5e9, 5e9),
+            "mass_of_floor_per_unit_area": generator.uniform(20, 120),
+            "modal_damping_ratio": generator.choice([0.01, 0.02, 0.03]),
+            "joist_spacing": generator.choice([300, 400, 450, 600]),
+            "is_strutted": generator.random() < 0.5,
+            })
+    return floors
+
+
+def scalar_results(floor, joist_type_index):
+    joist = TimberJoist(floor["length"], floor["floor_width"], 47, 200)
+    frequency = joist.get_fundamental_frequency(floor["joist_stiffness_per_metre"],
+                                                floor["mass_of_floor_per_unit_area"])
+    n_40 = 0
+    if frequency < 40:
+        n_40 = joist.get_number_of_first_order_modes(floor["mass_of_floor_per_unit_area"],
+                                                     floor["floor_stiffness_per_metre"],
+                                                     floor["joist_stiffness_per_metre"])
+    impulse_velocity = joist.get_impulse_velocity_response(n_40, floor["mass_of_floor_per_unit_area"])
+    impulse_velocity_limit = joist.get_impulse_velocity_limit(frequency, floor["modal_damping_ratio"])
+    a_limit = joist.get_deflection_limit_for_1kn_point_load()
+    k_dist = joist.get_k_dist(floor["floor_stiffness_per_metre"], floor["joist_spacing"], floor["is_strutted"])
+    point_load_deflection = joist.get_instanteous_deflection_under_point_load(
+        k_dist, joist.get_k_amp(joist_type_index), floor["length"],
+        floor["joist_stiffness_per_metre"] * floor["joist_spacing"] / 1000)
+    return {
+        "fundamental_frequency": frequency,
+        "n_40": n_40,
+        "impulse_velocity": impulse_velocity,
+        "impulse_velocity_limit": impulse_velocity_limit,
+        "point_load_deflection_limit": a_limit,
+        "impulse_velocity_constant": joist.get_constant_for_unit_impulse_velocity(),
+        "frequency_passes": frequency >= TimberJoist.MIN_FUNDAMENTAL_FREQUENCY,
+        "impulse_velocity_passes": impulse_velocity <= impulse_velocity_limit,
+        "point_load_deflection": point_load_deflection,
+        "point_load_deflection_passes": point_load_deflection <= a_limit,
+        }
+
+
+@pytest.mark.parametrize("joist_type_index", [0, 1, 2])
+def test_batch_results_equal_the_scalar_joist_methods(joist_type_index):
+    floors = random_floors(300, seed=joist_type_index)
+    arrays = {field: np.array([floor[field] for floor in floors]) for field in floors[0]}
+    results = find_floor_vibration_results_batch(**arrays, joist_type_index=joist_type_index)
+    for index, floor in enumerate(floors):
+        for field, value in scalar_results(floor, joist_type_index).items():
+            assert results[field][index] == pytest.approx(value, rel=1e-12), (field, floor)
+    # both sides of the 4m span, and of 40 Hz, are covered
+    assert 0 < np.sum(arrays["length"] <= 4000) < len(floors)
+    assert 0 < np.sum(results["n_40"] == 0) < len(floors)
+
+
+def test_scalar_inputs_broadcast_and_spacing_is_optional():
+    results = find_floor_vibration_results_batch([3000, 4500, 6000], 4000, 2e12, 2.66e9, 50)
+    assert "point_load_deflection" not in results
+    for index, length in enumerate([3000, 4500, 6000]):
+        floor = {"length": length, "floor_width": 4000, "joist_stiffness_per_metre": 2e12,
+                 "floor_stiffness_per_metre": 2.66e9, "mass_of_floor_per_unit_area": 50,
+                 "modal_damping_ratio": 0.02, "joist_spacing": 400, "is_strutted": False}
+        expected = scalar_results(floor, 0)
+        for field, values in results.items():
+            assert values[index] == pytest.approx(expected[field], rel=1e-12)
+
+
+def test_batch_matches_the_floor_utilisation_results():
+    joist = TimberJoist(3800, 4000, 47, 200, "C16")
+    spacing, dead_load, floor_stiffness_per_metre = 400, 0.5, 2.66e9
+    ur_results = joist.get_floor_utilisation_results(spacing, dead_load, 1.5, floor_stiffness_per_metre)
+    joist_stiffness = joist.material.material_properties["E_0_mean"] * joist.get_second_moment_of_area(True)
+    mass = (dead_load + joist.get_beam_selfweight_per_m() / (spacing / 1000)) * 1000 / 9.81
+    results = find_floor_vibration_results_batch([joist.length], joist.floor_width,
+                                                 joist_stiffness / (spacing / 1000),
+                                                 floor_stiffness_per_metre, mass, joist_spacing=spacing)
+    assert ur_results["frequency_UR"] == pytest.approx(8 / results["fundamental_frequency"][0], rel=1e-12)
+    assert ur_results["impulse_velocity_UR"] == pytest.approx(
+        results["impulse_velocity"][0] / results["impulse_velocity_limit"][0], rel=1e-12)
+    assert ur_results["point_load_deflection_UR"] == pytest.approx(
+        results["point_load_deflection"][0] / results["point_load_deflection_limit"][0], rel=1e-12)
@@ -0,0 +1,86 @@
+import pickle
+from types import MappingProxyType
+
+import pytest
+
+from timber import FrozenTimberBeam, TimberDesign, TimberMaterial, reload_material_data
+from timber import material
+from timber.frozen_beam import find_utilisation_results
+
+
+DESIGN_ARGS = [
+    ("medium_term", True, 1.5, 2.0, 0.3, 16, True),
+    ("long_term", False, 3.0, 1.0, 0.5, 20, False, 1.35, 1.5, False),
+    ("instantaneous", True, 0.5, 6.0, 0.3, 12, False, 1.0, 1.0),
+    ]
+
+BEAMS = [
+    FrozenTimberBeam(4000, 47, 200),
+    FrozenTimberBeam(6000, 90, 360, "glulam", "GL24H", 2, 0.9),
+    FrozenTimberBeam(3500, 63, 225, "hardwood", "D30", 3),
+    FrozenTimberBeam(5000, 45, 300, "lvl", "LVL_S44", 1, 1.2),
+    FrozenTimberBeam(3000, 100, 200, "green_oak", "TH1", 3),
+    FrozenTimberBeam(2000, 200, 150),
+    ]
+
+
+@pytest.fixture(autouse=True)
+def fresh_material_data():
+    reload_material_data()
+    yield
+    reload_material_data()
+
+
+def scalar_results(beam, design_args):
+    design = TimberDesign(beam.length, beam.breadth, beam.height,
+                          TimberMaterial(beam.material_type, beam.strength_grade, beam.service_class),
+                          beam.effective_length_factor)
+    return design._find_utilisation_results(*design_args)
+
+
+@pytest.mark.parametrize("beam", BEAMS, ids=repr)
+def test_frozen_results_match_scalar_results(beam):
+    for design_args in DESIGN_ARGS:
+        assert find_utilisation_results(beam, *design_args) == scalar_results(beam, design_args)
+        assert beam.to_timber_design()._find_utilisation_results(*design_args) == \
+            scalar_results(beam, design_args)
+
+
+def test_timber_designs_are_accepted():
+    beam = BEAMS[1]
+    design = beam.to_timber_design()
+    assert find_utilisation_results(design, *DESIGN_ARGS[0]) == scalar_results(beam, DESIGN_ARGS[0])
+    design.height = 400
+    assert find_utilisation_results(design, *DESIGN_ARGS[0]) == \
+        scalar_results(beam.replace(height=400), DESIGN_ARGS[0])
+    assert FrozenTimberBeam.from_timber_beam(design) == beam.replace(height=400)
+
+
+def test_frozen_results_follow_reloaded_material_data(monkeypatch):
+    beam = BEAMS[0]
+    results = find_utilisation_results(beam, *DESIGN_ARGS[0])
+
+    softwood_data = dict(material.load_material_data("softwood"))
+    softwood_data["C24"] = MappingProxyType(dict(softwood_data["C24"], f_m_y_k=20.0, E_0_mean=9000.0))
+    reload_material_data("softwood")
+    monkeypatch.setitem(material._MATERIAL_DATA, "softwood", MappingProxyType(softwood_data))
+    reloaded_results = find_utilisation_results(beam, *DESIGN_ARGS[0])
+    assert reloaded_results == scalar_results(beam, DESIGN_ARGS[0])
+    assert reloaded_results["bending_UR"] > results["bending_UR"]
+    assert reloaded_results["deflection_UR"] > results["deflection_UR"]
+
+
+def test_results_are_copies():
+    results = find_utilisation_results(BEAMS[0], *DESIGN_ARGS[0])
+    results["bending_UR"] = None
+    assert find_utilisation_results(BEAMS[0], *DESIGN_ARGS[0])["bending_UR"] is not None
+
+
+def test_frozen_beams_are_immutable_hashable_values():
+    beam = BEAMS[1]
+    with pytest.raises(AttributeError):
+        beam.height = 400
+    assert not hasattr(beam, "__dict__")
+    assert pickle.loads(pickle.dumps(beam)) == beam
+    assert hash(beam.replace(height=360)) == hash(beam)
+    assert beam.replace(height=400).height == 400
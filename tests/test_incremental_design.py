@@ -0,0 +1,79 @@
+from timber import TimberDesign, TimberMaterial, instrumentation
+
+
+DESIGN_ARGS = {
+    "load_duration": "medium_term",
+    "is_load_sharing": False,
+    "permanent_udl": 1.5,
+    "imposed_udl": 2.0,
+    "imposed_combination_factor": 0.3,
+    "deflection_limit": 16,
+    "is_restrained": False,
+    "permanent_load_factor": 1.35,
+    "variable_load_factor": 1.5,
+    "with_creep": True,
+    }
+
+# (member edit, design input changes, checks which must be recomputed)
+EDITS = [
+    ({"length": 4500}, {}, {"bending_UR", "shear_UR", "LTB_UR", "deflection_UR"}),
+    ({"height": 250}, {}, {"bending_UR", "shear_UR", "LTB_UR", "deflection_UR"}),
+    ({"breadth": 63}, {}, {"bending_UR", "shear_UR", "LTB_UR", "deflection_UR"}),
+    ({"effective_length_factor": 0.8}, {}, {"LTB_UR"}),
+    ({}, {"deflection_limit": 18}, {"deflection_UR"}),
+    ({}, {"imposed_udl": 3.0}, {"bending_UR", "shear_UR", "LTB_UR", "deflection_UR"}),
+    ({}, {"load_duration": "short_term"}, {"bending_UR", "shear_UR", "LTB_UR"}),
+    ({}, {"is_load_sharing": True}, {"bending_UR", "shear_UR", "LTB_UR"}),
+    ({}, {"with_creep": False, "imposed_combination_factor": 0.5}, {"deflection_UR"}),
+    ({}, {"permanent_load_factor": 1.0, "variable_load_factor": 1.6}, {"bending_UR", "shear_UR", "LTB_UR"}),
+    ({}, {"is_restrained": True}, {"LTB_UR"}),
+    ({}, {"is_restrained": False}, {"LTB_UR"}),
+    ({"material": TimberMaterial("glulam", "GL24H", 1)}, {},
+     {"bending_UR", "shear_UR", "LTB_UR", "deflection_UR"}),
+    ({"material": TimberMaterial("glulam", "GL24H", 3)}, {},
+     {"bending_UR", "shear_UR", "LTB_UR", "deflection_UR"}),
+    ({"height": 250}, {}, set()),
+    ]
+
+
+def full_results(design, design_args):
+    fresh = TimberDesign(design.length, design.breadth, design.height, design.material,
+                         design.effective_length_factor)
+    return fresh._find_utilisation_results(**design_args)
+
+
+def test_incremental_results_equal_a_full_recompute_after_each_edit():
+    design = TimberDesign(4000, 47, 200, TimberMaterial("softwood", "C24", 1), is_incremental=True)
+    design_args = dict(DESIGN_ARGS)
+    assert design._find_utilisation_results(**design_args) == full_results(design, design_args)
+    for member_edit, design_input_changes, recomputed_checks in EDITS:
+        for attribute, value in member_edit.items():
+            setattr(design, attribute, value)
+        design_args.update(design_input_changes)
+        with instrumentation.collect() as summary:
+            results = design._find_utilisation_results(**design_args)
+        assert results == full_results(design, design_args), (member_edit, design_input_changes)
+        assert {check for check in TimberDesign.UTILISATION_CHECKS
+                if f"check/{check}" in summary.timers} == recomputed_checks, (member_edit, design_input_changes)
+        assert {check for check in TimberDesign.UTILISATION_CHECKS
+                if summary.counters[f"check/{check}/reused"]} == (
+            set(TimberDesign.UTILISATION_CHECKS) - recomputed_checks)
+
+
+def test_service_class_change_of_the_material_is_picked_up():
+    material = TimberMaterial("softwood", "C24", 1)
+    design = TimberDesign(4000, 47, 200, material, is_incremental=True)
+    results = design._find_utilisation_results(**DESIGN_ARGS)
+    material.service_class = 3
+    changed_results = design._find_utilisation_results(**DESIGN_ARGS)
+    assert changed_results == full_results(design, DESIGN_ARGS)
+    assert changed_results["bending_UR"] > results["bending_UR"]
+
+
+def test_auto_design_is_the_same_in_incremental_mode():
+    material = TimberMaterial("softwood", "C24", 2)
+    design = TimberDesign(4000, 47, 100, material, is_incremental=True)
+    results = design.get_auto_designed_timber_size_height(**DESIGN_ARGS, search_method="linear")
+    expected = TimberDesign(4000, 47, 100, material).get_auto_designed_timber_size_height(
+        **DESIGN_ARGS, search_method="linear")
+    assert results == expected
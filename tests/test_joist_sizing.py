@@ -0,0 +1,55 @@
+import pytest
+
+from timber import TimberJoist, TimberSectionCatalogue
+
+
+FLOOR_STIFFNESS_PER_METRE = 2.66e9
+
+DESIGN_CASES = [
+    ("C24", 3600, 400, 0.5, 1.5, {}),
+    ("C16", 4500, 600, 0.75, 1.5, {"is_strutted": True}),
+    ("C24", 5200, [300, 400, 600], 0.5, 2.0, {"modal_damping_ratio": 0.01}),
+    ("C16", 2800, [400, 450, 600], 1.0, 4.0, {"joist_type_index": 1, "load_duration": "long_term"}),
+    ]
+
+
+def passes(joist, size, spacing, dead_load, imposed_load, kwargs):
+    joist.breadth, joist.height = size
+    ur_results = joist.get_floor_utilisation_results(spacing, dead_load, imposed_load,
+                                                     FLOOR_STIFFNESS_PER_METRE, **kwargs)
+    return joist._passes_checks(ur_results)
+
+
+@pytest.mark.parametrize("grade, length, joist_spacing, dead_load, imposed_load, kwargs", DESIGN_CASES)
+def test_chosen_joist_passes_and_the_next_smaller_fails(grade, length, joist_spacing, dead_load,
+                                                         imposed_load, kwargs):
+    joist = TimberJoist(length, 4000, 47, 100, grade)
+    results = joist.get_auto_designed_joist_size(joist_spacing, dead_load, imposed_load,
+                                                 FLOOR_STIFFNESS_PER_METRE, **kwargs)
+    size = (results["breadth"], results["height"])
+    assert (joist.breadth, joist.height) == size
+    assert max(ur for check, ur in results.items() if check.endswith("_UR") and ur is not None) <= 1
+
+    spacings = sorted(joist_spacing) if isinstance(joist_spacing, list) else [joist_spacing]
+    catalogue = list(TimberSectionCatalogue.for_material("softwood"))
+    index = catalogue.index(size)
+    assert index > 0
+    checker = TimberJoist(length, 4000, 47, 100, grade)
+    for spacing in spacings:
+        assert not passes(checker, catalogue[index - 1], spacing, dead_load, imposed_load, kwargs)
+        assert passes(checker, size, spacing, dead_load, imposed_load, kwargs) == (
+            spacing <= results["joist_spacing"])
+
+    # no smaller section in the catalogue passes at any spacing
+    for smaller_size in catalogue[:index]:
+        assert not any(passes(checker, smaller_size, spacing, dead_load, imposed_load, kwargs)
+                       for spacing in spacings)
+
+
+def test_largest_section_at_the_smallest_spacing_when_none_pass():
+    catalogue = TimberSectionCatalogue([(47, 100), (47, 125), (63, 125)])
+    joist = TimberJoist(6000, 4000, 47, 100, "C16")
+    results = joist.get_auto_designed_joist_size([400, 600], 1.0, 3.0, FLOOR_STIFFNESS_PER_METRE,
+                                                 section_catalogue=catalogue)
+    assert (results["breadth"], results["height"], results["joist_spacing"]) == (63, 125, 400)
+    assert results["bending_UR"] > 1
@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+
+from timber import JoistSpanTable, TimberJoist
+
+
+FLOOR_STIFFNESS_PER_METRE = 2.66e9
+
+TABLE_AXES = (["C16", "C24"], [47], [150, 200], [400, 600], [0.25, 0.5], [1.5, 2.5])
+
+
+@pytest.fixture(scope="module")
+def table():
+    return JoistSpanTable.generate(*TABLE_AXES, floor_stiffness_per_metre=FLOOR_STIFFNESS_PER_METRE)
+
+
+def floor_passes(joist, span, joist_spacing, dead_load, imposed_load):
+    joist.length = span
+    ur_results = joist.get_floor_utilisation_results(joist_spacing, dead_load, imposed_load,
+                                                     FLOOR_STIFFNESS_PER_METRE)
+    return joist._passes_checks(ur_results)
+
+
+@pytest.mark.parametrize("grade, height, joist_spacing, dead_load, imposed_load", [
+    ("C16", 150, 400, 0.25, 1.5),
+    ("C24", 200, 600, 0.5, 2.5),
+    ("C24", 225, 300, 0.75, 4.0),
+    ("C16", 75, 600, 1.0, 5.0),
+    ])
+def test_max_span_is_the_largest_passing_span(grade, height, joist_spacing, dead_load, imposed_load):
+    joist = TimberJoist(3000, 4000, 47, height, grade)
+    max_span = joist.get_max_span(joist_spacing, dead_load, imposed_load, FLOOR_STIFFNESS_PER_METRE,
+                                  span_iteration=50)
+    assert joist.length == 3000
+    # the spans on the grid pass up to the max span and fail after it
+    for span in np.arange(1000, 8001, 50):
+        assert floor_passes(joist, span, joist_spacing, dead_load, imposed_load) == (span <= max_span)
+
+
+def test_tabulated_spans_match_the_joist(table):
+    joist = TimberJoist(1000, 4000, 47, 200, "C24")
+    expected = joist.get_max_span(600, 0.5, 2.5, FLOOR_STIFFNESS_PER_METRE)
+    assert table.get_max_span("C24", 47, 200, 600, 0.5, 2.5) == expected
+    assert table.max_spans.shape == (2, 1, 2, 2, 2, 2)
+
+
+def test_queries_between_entries_return_the_least_bracketing_span(table):
+    spans = [table.get_max_span("C16", 47, 150, joist_spacing, dead_load, imposed_load)
+             for joist_spacing in [400, 600] for dead_load in [0.25, 0.5] for imposed_load in [1.5, 2.5]]
+    assert table.get_max_span("C16", 47, 150, 500, 0.4, 2.0) == min(spans)
+    assert table.get_max_span("C16", 47, 150, 400, 0.25, 2.0) == min(spans[:2])
+
+
+@pytest.mark.parametrize("query", [
+    ("C16", 47, 150, 300, 0.25, 1.5),
+    ("C16", 47, 150, 700, 0.25, 1.5),
+    ("C16", 47, 150, 400, 0.1, 1.5),
+    ("C16", 47, 150, 400, 0.25, 3.0),
+    ])
+def test_out_of_range_queries_are_rejected(table, query):
+    with pytest.raises(ValueError, match="outside"):
+        table.get_max_span(*query)
+
+
+@pytest.mark.parametrize("query", [("C22", 47, 150, 400, 0.25, 1.5), ("C16", 63, 150, 400, 0.25, 1.5),
+                                   ("C16", 47, 175, 400, 0.25, 1.5)])
+def test_sections_not_in_the_table_are_rejected(table, query):
+    with pytest.raises(ValueError, match="not in the span table"):
+        table.get_max_span(*query)
+
+
+def test_saved_table_loads_equal(table, tmp_path):
+    file_path = str(tmp_path / "joist_spans.npz")
+    table.save(file_path)
+    loaded = JoistSpanTable.load(file_path)
+    assert loaded.axes == table.axes
+    assert loaded.parameters == table.parameters
+    np.testing.assert_array_equal(loaded.max_spans, table.max_spans)
+    assert loaded.get_max_span("C24", 47, 200, 500, 0.3, 2.0) == table.get_max_span("C24", 47, 200, 500, 0.3, 2.0)
+
+
+def test_loaded_table_is_reloaded_when_the_file_changes(table, tmp_path):
+    file_path = str(tmp_path / "joist_spans.npz")
+    table.save(file_path)
+    loaded = JoistSpanTable.load(file_path)
+    assert JoistSpanTable.load(file_path) is loaded
+
+    changed_table = JoistSpanTable(table.axes, table.max_spans / 2, table.parameters)
+    changed_table.save(file_path)
+    modified_time = os.path.getmtime(file_path)
+    os.utime(file_path, (modified_time + 10, modified_time + 10))
+    reloaded = JoistSpanTable.load(file_path)
+    assert reloaded is not loaded
+    np.testing.assert_array_equal(reloaded.max_spans, table.max_spans / 2)
+    assert JoistSpanTable.load(file_path) is reloaded
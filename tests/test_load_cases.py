@@ -0,0 +1,66 @@
+import pytest
+
+from timber import TimberDesign, TimberMaterial
+
+
+LOAD_CASES = [
+    {"name": "permanent", "load_duration": "permanent", "permanent_udl": 2.0, "imposed_udl": 0.0},
+    {"name": "imposed", "load_duration": "medium_term", "permanent_udl": 2.0, "imposed_udl": 3.0},
+    {"name": "snow", "load_duration": "short_term", "permanent_udl": 2.0, "imposed_udl": 4.5,
+     "variable_load_factor": 1.6, "imposed_combination_factor": 0.5},
+    {"name": "accidental", "load_duration": "instantaneous", "permanent_udl": 2.0, "imposed_udl": 12.0,
+     "permanent_load_factor": 1.0, "variable_load_factor": 1.0, "checks": ["bending_UR", "shear_UR"]},
+    {"name": "serviceability", "load_duration": "long_term", "permanent_udl": 2.0, "imposed_udl": 8.0,
+     "checks": ["deflection_UR"]},
+    ]
+
+
+def scalar_results(design, load_case, include_selfweight, **design_args):
+    find = (design._find_utilisation_results_with_selfweight if include_selfweight
+            else design._find_utilisation_results)
+    return find(
+        load_duration=load_case["load_duration"],
+        permanent_udl=load_case["permanent_udl"],
+        imposed_udl=load_case["imposed_udl"],
+        imposed_combination_factor=load_case.get("imposed_combination_factor", 0.3),
+        permanent_load_factor=load_case.get("permanent_load_factor", 1.35),
+        variable_load_factor=load_case.get("variable_load_factor", 1.5),
+        **design_args)
+
+
+@pytest.mark.parametrize("is_restrained", [True, False])
+@pytest.mark.parametrize("include_selfweight", [True, False])
+def test_each_load_case_matches_the_scalar_results(is_restrained, include_selfweight):
+    design = TimberDesign(4500, 63, 225, TimberMaterial("glulam", "GL24H", 2))
+    design_args = {"is_load_sharing": True, "deflection_limit": 4500 / 250,
+                   "is_restrained": is_restrained, "with_creep": True}
+    results = design.find_load_case_utilisation_results(LOAD_CASES, include_selfweight=include_selfweight,
+                                                        **design_args)
+
+    expected_governing = {}
+    for load_case in LOAD_CASES:
+        expected = scalar_results(design, load_case, include_selfweight, **design_args)
+        checks = load_case.get("checks", TimberDesign.UTILISATION_CHECKS)
+        for check in TimberDesign.UTILISATION_CHECKS:
+            ur = results["load_cases"][load_case["name"]][check]
+            if check not in checks:
+                assert ur is None
+                continue
+            assert ur == expected[check]
+            if ur is not None and ur > expected_governing.get(check, (None, -1))[1]:
+                expected_governing[check] = (load_case["name"], ur)
+
+    for check in TimberDesign.UTILISATION_CHECKS:
+        load_case, ur = expected_governing.get(check, (None, None))
+        assert results["governing"][check] == {"load_case": load_case, "UR": ur}
+    assert results["governing"]["bending_UR"]["load_case"] == "accidental"
+    assert results["governing"]["deflection_UR"]["load_case"] == "serviceability"
+    assert (results["governing"]["LTB_UR"]["load_case"] is None) == is_restrained
+
+
+def test_duplicate_names_and_invalid_checks_are_rejected():
+    design = TimberDesign(4000, 47, 200, TimberMaterial("softwood", "C24", 1))
+    with pytest.raises(ValueError, match="not unique"):
+        design.find_load_case_utilisation_results(LOAD_CASES[:1] * 2, False, 16)
+    with pytest.raises(ValueError, match="is invalid"):
+        design.find_load_case_utilisation_results([dict(LOAD_CASES[0], checks=["torsion_UR"])], False, 16)
@@ -0,0 +1,60 @@
+import pytest
+
+from timber import LoadDuration, TimberMaterial
+
+
+GRADES = {"softwood": "C24", "hardwood": "D30", "glulam": "GL28H", "lvl": "LVL_S44", "green_oak": "TH1"}
+
+# EC5 partial factors as dict lookups by name
+K_MODS = {
+    1: {"permanent": 0.6, "long_term": 0.7, "medium_term": 0.8, "short_term": 0.9, "instantaneous": 1.1},
+    2: {"permanent": 0.6, "long_term": 0.7, "medium_term": 0.8, "short_term": 0.9, "instantaneous": 1.1},
+    3: {"permanent": 0.5, "long_term": 0.55, "medium_term": 0.65, "short_term": 0.7, "instantaneous": 0.9},
+    }
+K_DEFS = {
+    "softwood": {1: 0.6, 2: 0.8, 3: 2},
+    "hardwood": {1: 0.6, 2: 0.8, 3: 2},
+    "glulam": {1: 0.6, 2: 0.8, 3: 2},
+    "lvl": {1: 0.6, 2: 0.8, 3: 2},
+    "green_oak": {1: 1.6, 2: 1.8, 3: 2},
+    }
+GAMMA_MS = {"softwood": 1.3, "hardwood": 1.3, "glulam": 1.25, "lvl": 1.2, "green_oak": 1.3}
+K_NS = {"softwood": 5.0, "hardwood": 5.0, "glulam": 6.5, "lvl": 4.5, "green_oak": 5.0}
+K_CRS = {"softwood": 0.67, "hardwood": 0.67, "glulam": 0.67, "lvl": 1.0, "green_oak": 0.67}
+
+MATERIALS = [(material_type, service_class) for material_type in GRADES for service_class in K_MODS]
+
+
+@pytest.mark.parametrize("material_type, service_class", MATERIALS)
+def test_dense_factor_tables_equal_the_dict_lookups(material_type, service_class):
+    material = TimberMaterial(material_type, GRADES[material_type], service_class)
+    for load_duration, k_mod in K_MODS[service_class].items():
+        code = LoadDuration[load_duration.upper()]
+        assert material.get_k_mod(load_duration) == k_mod
+        assert material.get_k_mod(f" {load_duration.upper()} ") == k_mod
+        assert material.get_k_mod(code) == k_mod
+        assert material.get_k_mod(int(code)) == k_mod
+        assert material.k_mod_table[code] == k_mod
+    assert material.get_k_def() == K_DEFS[material_type][service_class]
+    assert material.get_gamma_factor() == GAMMA_MS[material_type]
+    assert material.get_k_n() == K_NS[material_type]
+    assert material.get_k_cr() == K_CRS[material_type]
+
+
+def test_factor_tables_follow_a_service_class_change():
+    material = TimberMaterial("green_oak", "TH1", 1)
+    material.service_class = 3
+    assert material.get_k_mod("medium_term") == K_MODS[3]["medium_term"]
+    assert material.get_k_def() == K_DEFS["green_oak"][3]
+
+
+def test_load_duration_codes_follow_the_names():
+    for index, load_duration in enumerate(TimberMaterial.LOAD_DURATIONS):
+        assert TimberMaterial.get_load_duration_index(load_duration) is LoadDuration(index)
+        assert TimberMaterial.get_load_duration_index(index) is LoadDuration(index)
+
+
+@pytest.mark.parametrize("load_duration", ["forever", "", 5, -1])
+def test_invalid_load_durations_are_rejected(load_duration):
+    with pytest.raises(ValueError, match="is invalid"):
+        TimberMaterial("softwood", "C24", 1).get_k_mod(load_duration)
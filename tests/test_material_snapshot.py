@@ -0,0 +1,51 @@
+import pytest
+
+from timber import TimberMaterial, material, reload_material_data
+from timber.material_snapshot import MATERIAL_TYPES, MaterialSnapshot, build_material_snapshot
+
+
+@pytest.fixture(autouse=True)
+def fresh_material_data(monkeypatch):
+    monkeypatch.delenv("TIMBER_MATERIAL_SNAPSHOT", raising=False)
+    reload_material_data()
+    yield
+    monkeypatch.undo()
+    reload_material_data()
+
+
+def get_all_material_properties() -> dict:
+    return {(material_type, grade, service_class): TimberMaterial(material_type, grade,
+                                                                  service_class).material_properties
+            for material_type in MATERIAL_TYPES
+            for grade in material.load_material_data(material_type)
+            for service_class in TimberMaterial.VALID_SERVICE_CLASSES}
+
+
+def test_snapshot_round_trip_matches_the_json_data(tmp_path, monkeypatch):
+    json_properties = get_all_material_properties()
+    file_path = str(tmp_path / "materials.snapshot")
+    grade_count = build_material_snapshot(file_path)
+    assert grade_count == len(MaterialSnapshot(file_path))
+
+    monkeypatch.setenv("TIMBER_MATERIAL_SNAPSHOT", file_path)
+    reload_material_data()
+    assert material.get_material_snapshot().file_path == file_path
+    snapshot_properties = get_all_material_properties()
+    assert snapshot_properties == json_properties
+    assert len({key[:2] for key in snapshot_properties}) == grade_count
+    assert TimberMaterial("softwood", "C24", 1).grade_id is not None
+
+
+def test_environment_variable_is_read_on_use(tmp_path, monkeypatch):
+    assert TimberMaterial("softwood", "C24", 1).grade_id is None
+    file_path = str(tmp_path / "materials.snapshot")
+    build_material_snapshot(file_path, [{"softwood": {"C99": {"f_m_y_k": 99.0}}}])
+    monkeypatch.setenv("TIMBER_MATERIAL_SNAPSHOT", file_path)
+    reload_material_data()
+    assert TimberMaterial("softwood", "C99", 1).material_properties["f_m_y_k"] == 99.0
+
+    monkeypatch.delenv("TIMBER_MATERIAL_SNAPSHOT")
+    reload_material_data()
+    assert material.get_material_snapshot() is None
+    with pytest.raises(ValueError, match="C99"):
+        TimberMaterial("softwood", "C99", 1)
@@ -0,0 +1,60 @@
+import itertools
+
+import pytest
+
+from timber.schedule import design_schedule, design_schedule_row, iter_member_designs
+
+
+def member_rows(count):
+    for index in range(count):
+        yield {"id": f"B{index}", "length": 2000 + 37 * index, "permanent_udl": 1.5, "imposed_udl": 2.0,
+               "deflection_limit_ratio": 250, "is_restrained": index % 2 == 0,
+               "strength_grade": "C99" if index % 11 == 5 else "C24"}
+
+
+class CountingRows():
+    '''Iterable of member rows which counts the rows taken from it.'''
+    def __init__(self, count):
+        self._rows = member_rows(count)
+        self.taken = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self._rows)
+        self.taken += 1
+        return row
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 256), (2, 1), (2, 7), (3, 64)])
+def test_results_are_in_input_order(workers, chunk_size):
+    expected = [design_schedule_row(row) for row in member_rows(60)]
+    assert list(iter_member_designs(member_rows(60), workers, chunk_size)) == expected
+    assert design_schedule(list(member_rows(60)), workers, chunk_size) == expected
+
+
+def test_rows_are_consumed_lazily_in_process():
+    rows = CountingRows(1000)
+    results = iter_member_designs(rows, workers=1)
+    assert rows.taken == 0
+    assert [result["id"] for result in itertools.islice(results, 3)] == ["B0", "B1", "B2"]
+    assert rows.taken == 3
+
+
+def test_in_flight_work_is_bounded():
+    rows = CountingRows(1000)
+    results = iter_member_designs(rows, workers=2, chunk_size=5, max_chunks_in_flight=3)
+    assert rows.taken == 0
+    first_results = list(itertools.islice(results, 12))
+    assert [result["id"] for result in first_results] == [f"B{index}" for index in range(12)]
+    # three chunks in flight, each chunk taken off the front is replaced by one more
+    assert rows.taken == 5 * (3 + 2)
+    results.close()
+    assert rows.taken < 1000
+
+
+@pytest.mark.parametrize("keyword, value", [("chunk_size", 0), ("max_chunks_in_flight", -1)])
+def test_invalid_chunking_is_rejected(keyword, value):
+    with pytest.raises(ValueError, match="at least 1"):
+        next(iter_member_designs(member_rows(10), workers=2, **{keyword: value}))
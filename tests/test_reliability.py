@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from timber import TimberDesign, TimberMaterial
+from timber.reliability import (count_failures, find_reliability_estimates, get_reliability_model,
+                                iter_reliability_estimates)
+
+
+SAMPLE_COUNT = 20000
+
+CHUNK_SIZE = 3000
+
+
+def new_model(is_restrained=False):
+    # an undersized unrestrained beam, so every limit state has some failures
+    design = TimberDesign(5000, 47, 150, TimberMaterial("softwood", "C24", 1))
+    return get_reliability_model(design, "medium_term", False,
+                                 {"distribution": "normal", "mean": 1.5, "cov": 0.1},
+                                 {"distribution": "gumbel", "mean": 1.5, "cov": 0.35},
+                                 0.3, design.length / 250, is_restrained)
+
+
+def test_fixed_seed_is_reproducible_serially_and_in_parallel():
+    model = new_model()
+    serial = list(iter_reliability_estimates(model, SAMPLE_COUNT, CHUNK_SIZE, workers=1, seed=3))
+    assert list(iter_reliability_estimates(model, SAMPLE_COUNT, CHUNK_SIZE, workers=1, seed=3)) == serial
+    for workers, max_chunks_in_flight in [(2, None), (3, 1)]:
+        parallel = list(iter_reliability_estimates(model, SAMPLE_COUNT, CHUNK_SIZE, workers=workers, seed=3,
+                                                   max_chunks_in_flight=max_chunks_in_flight))
+        assert parallel == serial
+    assert [estimates["samples"] for estimates in serial] == [3000, 6000, 9000, 12000, 15000, 18000, 20000]
+    assert all(count > 0 for count in serial[-1]["failures"].values())
+    assert 0 < serial[-1]["failures"]["shear"] < SAMPLE_COUNT
+    assert find_reliability_estimates(model, SAMPLE_COUNT, CHUNK_SIZE, workers=2, seed=3) == serial[-1]
+
+
+def test_estimates_are_the_sum_of_the_chunk_failures():
+    model = new_model()
+    seed_sequence = np.random.SeedSequence(5)
+    failures = {}
+    for start in range(0, SAMPLE_COUNT, CHUNK_SIZE):
+        chunk_sample_count = min(CHUNK_SIZE, SAMPLE_COUNT - start)
+        chunk_failures = count_failures(model, np.random.default_rng(seed_sequence.spawn(1)[0]),
+                                        chunk_sample_count)
+        for limit_state, count in chunk_failures.items():
+            failures[limit_state] = failures.get(limit_state, 0) + count
+    assert find_reliability_estimates(model, SAMPLE_COUNT, CHUNK_SIZE, workers=1, seed=5)["failures"] == failures
+
+
+def test_different_seeds_differ():
+    model = new_model()
+    estimates = [find_reliability_estimates(model, SAMPLE_COUNT, CHUNK_SIZE, workers=1, seed=seed)
+                 for seed in (1, 2)]
+    assert estimates[0]["failures"] != estimates[1]["failures"]
+
+
+def test_restrained_beam_has_no_ltb_estimates():
+    estimates = find_reliability_estimates(new_model(is_restrained=True), 1000, 300, workers=2, seed=1)
+    assert estimates["failures"]["LTB"] is None
+    assert estimates["reliability_index"]["LTB"] is None
+    assert estimates["failures"]["ULS"] >= estimates["failures"]["bending"]
+
+
+@pytest.mark.parametrize("kwargs", [{"sample_count": 0}, {"chunk_size": 0}, {"max_chunks_in_flight": -1}])
+def test_invalid_arguments(kwargs):
+    kwargs = {"sample_count": 10, "chunk_size": 5, "workers": 2, **kwargs}
+    with pytest.raises(ValueError):
+        next(iter_reliability_estimates(new_model(), **kwargs))
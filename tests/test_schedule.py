@@ -0,0 +1,112 @@
+import csv
+import json
+
+import pytest
+
+from timber import TimberDesign, TimberMaterial
+from timber.schedule import (RESULT_FIELDS, design_schedule, design_schedule_row, main, parse_member,
+                             read_member_schedule, write_results)
+
+
+def member_row(**fields):
+    row = {"id": "B1", "length": "4000", "permanent_udl": "1.5", "imposed_udl": "2",
+           "deflection_limit_ratio": "250"}
+    row.update(fields)
+    return row
+
+
+def test_csv_values_are_converted_and_defaults_filled_in():
+    member = parse_member(member_row(is_load_sharing="Yes", is_restrained=" 0 ", service_class="2",
+                                     strength_grade=" C16 ", material_type="", with_creep=""))
+    assert member["length"] == 4000.0 and member["imposed_udl"] == 2.0
+    assert member["is_load_sharing"] is True and member["is_restrained"] is False
+    assert member["service_class"] == 2 and member["strength_grade"] == "C16"
+    assert member["material_type"] == "softwood" and member["with_creep"] is True
+    assert member["deflection_limit"] == 4000 / 250
+    assert member["load_duration"] == "medium_term" and member["design_method"] == "list"
+    assert parse_member(member_row(deflection_limit="12"))["deflection_limit"] == 12.0
+
+
+@pytest.mark.parametrize("fields, message", [
+    ({"length": ""}, "'length' is required"),
+    ({"permanent_udl": None}, "'permanent_udl' is required"),
+    ({"length": "-4000"}, "'length', -4000.0, must be positive"),
+    ({"deflection_limit_ratio": "0"}, "'deflection_limit_ratio', 0.0, must be positive"),
+    ({"effective_length_factor": "0"}, "'effective_length_factor', 0.0, must be positive"),
+    ({"deflection_limit_ratio": ""}, "requires a deflection_limit or deflection_limit_ratio"),
+    ({"load_duration": "forever"}, "forever"),
+    ({"design_method": "depth"}, "Design method 'depth' is invalid"),
+    ({"design_method": "height"}, "Designing the height requires a breadth"),
+    ({"design_method": "breadth"}, "Designing the breadth requires a height"),
+    ({"is_restrained": "maybe"}, "Boolean value 'maybe' is invalid"),
+    ({"length": "four metres"}, "could not convert"),
+    ])
+def test_invalid_members_are_rejected(fields, message):
+    with pytest.raises(ValueError, match=message):
+        parse_member(member_row(**fields))
+
+
+def test_errors_are_reported_in_the_result_row():
+    result = design_schedule_row(member_row(id="B7", strength_grade="C99"))
+    assert list(result) == RESULT_FIELDS
+    assert result["id"] == "B7"
+    assert "C99" in result["error"]
+    assert result["breadth"] == result["passes"] == ""
+
+
+@pytest.mark.parametrize("design_method, fields", [
+    ("list", {}),
+    ("height", {"breadth": "63"}),
+    ("breadth", {"height": "225", "is_restrained": "no"}),
+    ])
+def test_members_are_designed_as_the_design_methods_do(design_method, fields):
+    result = design_schedule_row(member_row(design_method=design_method, **fields))
+    design = TimberDesign(4000, float(fields.get("breadth", 100)), float(fields.get("height", 100)),
+                          TimberMaterial("softwood", "C24", 1))
+    design_args = ("medium_term", False, 1.5, 2.0, 0.3, 16, fields.get("is_restrained") != "no")
+    expected = getattr(design, f"get_auto_designed_timber_size_{design_method}")(*design_args)
+    for field, value in expected.items():
+        assert result[field] == value
+    assert result["error"] == ""
+    assert result["passes"] == all(ur is None or ur <= 1 for field, ur in expected.items()
+                                   if field.endswith("_UR"))
+
+
+@pytest.mark.parametrize("extension", ["csv", "json", "jsonl"])
+def test_schedule_files_are_read_and_results_written_in_order(tmp_path, extension):
+    rows = [member_row(id=f"B{index}", length=str(2000 + 500 * index)) for index in range(6)]
+    rows[3]["strength_grade"] = "C99"
+    schedule_path = tmp_path / f"members.{extension}"
+    with open(schedule_path, "w", encoding="utf-8", newline="") as f:
+        if extension == "csv":
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) + ["strength_grade"])
+            writer.writeheader()
+            writer.writerows(rows)
+        elif extension == "json":
+            json.dump(rows, f)
+        else:
+            f.write("".join(json.dumps(row) + "\n\n" for row in rows))
+    read_rows = read_member_schedule(str(schedule_path))
+    assert [row["id"] for row in read_rows] == [row["id"] for row in rows]
+
+    results_path = tmp_path / f"results.{extension}"
+    assert write_results(design_schedule(read_rows, workers=1), str(results_path)) == len(rows)
+    written = read_member_schedule(str(results_path))
+    assert [result["id"] for result in written] == [row["id"] for row in rows]
+    assert [bool(result["error"]) for result in written] == [index == 3 for index in range(6)]
+
+
+def test_non_list_json_schedules_are_rejected(tmp_path):
+    schedule_path = tmp_path / "members.json"
+    schedule_path.write_text(json.dumps(member_row()))
+    with pytest.raises(ValueError, match="must be a list"):
+        read_member_schedule(str(schedule_path))
+
+
+def test_command_line_designs_a_schedule(tmp_path, capsys):
+    schedule_path = tmp_path / "members.jsonl"
+    schedule_path.write_text("".join(json.dumps(member_row(id=f"B{index}")) + "\n" for index in range(3)))
+    results_path = tmp_path / "results.csv"
+    main([str(schedule_path), str(results_path), "--workers", "1"])
+    assert "Designed 3 members, 0 failing or in error." in capsys.readouterr().out
+    assert len(read_member_schedule(str(results_path))) == 3
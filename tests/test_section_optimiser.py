@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+import pytest
+
+from timber import TimberDesign, TimberMaterial
+from timber.section_optimiser import find_design_space_results
+
+
+DESIGN_CASES = [
+    (TimberMaterial("softwood", "C24", 1), 4000,
+     {"load_duration": "medium_term", "is_load_sharing": False, "permanent_udl": 1.5, "imposed_udl": 2.0,
+      "imposed_combination_factor": 0.3, "deflection_limit": 4000 / 250, "is_restrained": True}),
+    (TimberMaterial("glulam", "GL28H", 2), 7500,
+     {"load_duration": "long_term", "is_load_sharing": True, "permanent_udl": 3.0, "imposed_udl": 4.0,
+      "imposed_combination_factor": 0.5, "deflection_limit": 7500 / 300, "is_restrained": False}),
+    ]
+
+SMALL_BREADTHS = np.arange(40, 301, 20)
+SMALL_HEIGHTS = np.arange(100, 601, 25)
+
+
+def get_scalar_max_ur(material, length, design_args, breadth, height):
+    ur_results = TimberDesign(length, breadth, height, material)._find_utilisation_results_with_selfweight(
+        **design_args)
+    return max(ur for ur in ur_results.values() if ur is not None)
+
+
+def get_non_dominated(points: np.ndarray) -> np.ndarray:
+    '''Returns a mask of the rows of points not dominated by another row, all objectives minimised.'''
+    no_worse = np.all(points[:, np.newaxis, :] <= points[np.newaxis, :, :], axis=2)
+    better = np.any(points[:, np.newaxis, :] < points[np.newaxis, :, :], axis=2)
+    return ~np.any(no_worse & better, axis=0)
+
+
+@pytest.mark.parametrize("material, length, design_args", DESIGN_CASES)
+def test_pareto_front_is_the_non_dominated_passing_sections_of_the_full_grid(material, length, design_args):
+    design = TimberDesign(length, 47, 200, material)
+    front = design.get_pareto_optimal_sizes(**design_args)
+
+    full_design_args = (design_args["load_duration"], design_args["is_load_sharing"],
+                        design_args["permanent_udl"], design_args["imposed_udl"],
+                        design_args["imposed_combination_factor"], design_args["deflection_limit"],
+                        design_args["is_restrained"], 1.35, 1.5, True)
+    breadth, height, _, max_ur = find_design_space_results(design, full_design_args, None, None)
+    passes = max_ur.ravel() <= 1
+    points = np.column_stack([(breadth * height).ravel(), height.ravel(), max_ur.ravel()])[passes]
+    non_dominated = points[get_non_dominated(points)]
+    expected = sorted(zip(non_dominated[:, 0] / non_dominated[:, 1], non_dominated[:, 1]))
+
+    assert sorted(zip(front["breadth"], front["height"])) == expected
+    assert 1 < len(expected) < passes.sum()
+    assert np.all(np.diff(front["volume"]) >= 0)
+
+
+@pytest.mark.parametrize("material, length, design_args", DESIGN_CASES)
+def test_pareto_front_matches_scalar_checks(material, length, design_args):
+    design = TimberDesign(length, 47, 200, material)
+    front = design.get_pareto_optimal_sizes(**design_args, breadths=SMALL_BREADTHS, heights=SMALL_HEIGHTS)
+
+    sections = [(breadth, height) for breadth in SMALL_BREADTHS for height in SMALL_HEIGHTS]
+    max_urs = [get_scalar_max_ur(material, length, design_args, *section) for section in sections]
+    points = np.array([(breadth * height, height, max_ur)
+                       for (breadth, height), max_ur in zip(sections, max_urs) if max_ur <= 1])
+    non_dominated = points[get_non_dominated(points)]
+    expected = sorted(zip(non_dominated[:, 0] / non_dominated[:, 1], non_dominated[:, 1]))
+    assert sorted(zip(front["breadth"], front["height"])) == expected
+    for breadth, height, max_ur in zip(front["breadth"], front["height"], front["max_UR"]):
+        assert max_ur == pytest.approx(get_scalar_max_ur(material, length, design_args, breadth, height),
+                                       rel=1e-12)
+
+
+def height_penalised_cost(length, breadth, height, ur_results):
+    return length * breadth * height * (1 + (height / 300)**2)
+
+
+@pytest.mark.parametrize("cost_function", [None, height_penalised_cost])
+@pytest.mark.parametrize("material, length, design_args", DESIGN_CASES)
+def test_min_cost_is_the_cheapest_passing_section(material, length, design_args, cost_function):
+    design = TimberDesign(length, 47, 200, material)
+    results = design.get_auto_designed_timber_size_min_cost(
+        **design_args, cost_function=cost_function, breadths=SMALL_BREADTHS, heights=SMALL_HEIGHTS)
+
+    def cost(breadth, height):
+        if cost_function is None:
+            return length * breadth * height
+        return cost_function(length, breadth, height, None)
+
+    passing = [(cost(breadth, height), height, breadth)
+               for breadth in SMALL_BREADTHS for height in SMALL_HEIGHTS
+               if get_scalar_max_ur(material, length, design_args, breadth, height) <= 1]
+    expected_cost, expected_height, expected_breadth = min(passing)
+    assert (results["breadth"], results["height"]) == (expected_breadth, expected_height)
+    assert results["cost"] == pytest.approx(expected_cost, rel=1e-12)
+    assert (design.breadth, design.height) == (expected_breadth, expected_height)
+    assert max(ur for check, ur in results.items()
+               if check.endswith("_UR") and ur is not None) <= 1
+
+
+def test_min_cost_returns_the_least_utilised_section_when_none_pass():
+    material, length, design_args = DESIGN_CASES[1]
+    breadths, heights = [40, 60], [100, 150]
+    results = TimberDesign(length, 47, 200, material).get_auto_designed_timber_size_min_cost(
+        **design_args, breadths=breadths, heights=heights)
+    max_urs = {(breadth, height): get_scalar_max_ur(material, length, design_args, breadth, height)
+               for breadth in breadths for height in heights}
+    assert min(max_urs.values()) > 1
+    assert (results["breadth"], results["height"]) == min(max_urs, key=max_urs.get)
+    assert not math.isnan(results["cost"])
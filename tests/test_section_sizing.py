@@ -0,0 +1,145 @@
+import random
+import warnings
+
+import pytest
+
+from timber import TimberDesign, TimberMaterial
+
+
+SEARCH_METHODS = ["direct", "bisection", "linear"]
+
+GRADES = {"softwood": "C24", "hardwood": "D30", "glulam": "GL28H", "lvl": "LVL_S44", "green_oak": "TH1"}
+
+
+def auto_design(length, breadth, height, material, sizer, search_method, design_args, **kwargs):
+    '''Returns the sized results and whether the LTB getting worse warning was raised.'''
+    design = TimberDesign(length, breadth, height, material)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        results = getattr(design, f"get_auto_designed_timber_size_{sizer}")(
+            **design_args, search_method=search_method, **kwargs)
+    assert (design.breadth, design.height) == (results["breadth"], results["height"])
+    ltb_getting_worse = any(issubclass(warning.category, RuntimeWarning) for warning in caught)
+    return results, ltb_getting_worse
+
+
+def random_cases(count, seed):
+    generator = random.Random(seed)
+    for _ in range(count):
+        material_type = generator.choice(list(GRADES))
+        length = generator.uniform(1000, 12000)
+        design_args = {
+            "load_duration": generator.choice(TimberMaterial.LOAD_DURATIONS),
+            "is_load_sharing": generator.random() < 0.5,
+            "permanent_udl": generator.choice([0, generator.uniform(0, 8)]),
+            "imposed_udl": generator.choice([0, generator.uniform(0, 8)]),
+            "imposed_combination_factor": 0.3,
+            "deflection_limit": length / 250,
+            "is_restrained": generator.random() < 0.5,
+            "with_creep": generator.random() < 0.8,
+            }
+        material = TimberMaterial(material_type, GRADES[material_type], generator.choice([1, 2, 3]))
+        breadth = generator.choice([38, 47, 63, 75, 100, 150, 200])
+        height = generator.choice([100, 200, 300])
+        if generator.random() < 0.5:
+            max_height = 1200 if material_type in ["glulam", "lvl"] else 600
+            kwargs = {"height_iteration": generator.choice([1, 2.5, 5, 10]), "max_height": max_height}
+            yield length, breadth, height, material, "height", design_args, kwargs
+        else:
+            kwargs = {"breadth_iteration": generator.choice([1, 2.5, 5, 10])}
+            yield length, breadth, height, material, "breadth", design_args, kwargs
+
+
+@pytest.mark.parametrize("sizer", ["height", "breadth"])
+@pytest.mark.parametrize("search_method", SEARCH_METHODS)
+def test_restrained_beam_failing_at_the_starting_size(sizer, search_method):
+    # LTB_UR is None for restrained beams, which crashed the linear height search
+    # once the starting size failed and ran the breadth search to max_breadth
+    material = TimberMaterial("softwood", "C24", 1)
+    design_args = {
+        "load_duration": "medium_term",
+        "is_load_sharing": False,
+        "permanent_udl": 1.5,
+        "imposed_udl": 2.0,
+        "imposed_combination_factor": 0.3,
+        "deflection_limit": 4000 / 250,
+        "is_restrained": True,
+        }
+    breadth, height = (47, 100) if sizer == "height" else (47, 225)
+    results, _ = auto_design(4000, breadth, height, material, sizer, search_method, design_args)
+    expected, _ = auto_design(4000, breadth, height, material, sizer, "linear", design_args)
+    assert results == expected
+    assert results["LTB_UR"] is None
+    if sizer == "height":
+        assert 100 < results["height"] < 600
+    else:
+        assert 40 < results["breadth"] < 300
+    assert max(results["bending_UR"], results["shear_UR"], results["deflection_UR"]) <= 1
+
+
+def test_direct_and_bisection_agree():
+    for length, breadth, height, material, sizer, design_args, kwargs in random_cases(400, seed=5):
+        direct, _ = auto_design(length, breadth, height, material, sizer, "direct", design_args, **kwargs)
+        bisection, _ = auto_design(length, breadth, height, material, sizer, "bisection", design_args,
+                                   **kwargs)
+        assert direct == bisection, (sizer, design_args, kwargs)
+
+
+def test_direct_and_linear_agree():
+    # the linear search stops where LTB starts getting worse with height, the
+    # other methods search on, so those designs are not compared
+    compared = 0
+    for length, breadth, height, material, sizer, design_args, kwargs in random_cases(200, seed=7):
+        linear, ltb_getting_worse = auto_design(length, breadth, height, material, sizer, "linear",
+                                                design_args, **kwargs)
+        if ltb_getting_worse:
+            continue
+        direct, _ = auto_design(length, breadth, height, material, sizer, "direct", design_args, **kwargs)
+        assert direct == linear, (sizer, design_args, kwargs)
+        compared += 1
+    assert compared > 150
+
+
+@pytest.mark.parametrize("sizer", ["height", "breadth"])
+def test_direct_is_the_default_search_method(sizer):
+    material = TimberMaterial("glulam", "GL28H", 2)
+    design_args = {
+        "load_duration": "long_term",
+        "is_load_sharing": True,
+        "permanent_udl": 3.0,
+        "imposed_udl": 4.0,
+        "imposed_combination_factor": 0.3,
+        "deflection_limit": 6000 / 300,
+        "is_restrained": False,
+        }
+    design = TimberDesign(6000, 90, 200, material)
+    results = getattr(design, f"get_auto_designed_timber_size_{sizer}")(**design_args)
+    expected, _ = auto_design(6000, 90, 200, material, sizer, "direct", design_args)
+    assert results == expected
+
+
+@pytest.mark.parametrize("search_method", SEARCH_METHODS)
+def test_section_with_least_ltb_utilisation_when_ltb_gets_worse(search_method):
+    # a long unrestrained beam under selfweight only, LTB fails at every height
+    material = TimberMaterial("softwood", "C24", 1)
+    design_args = {
+        "load_duration": "medium_term",
+        "is_load_sharing": False,
+        "permanent_udl": 0,
+        "imposed_udl": 0,
+        "imposed_combination_factor": 0.3,
+        "deflection_limit": 12500 / 250,
+        "is_restrained": False,
+        }
+    with pytest.warns(RuntimeWarning, match="lateral torsional buckling worse"):
+        results = TimberDesign(12500, 47, 200, material).get_auto_designed_timber_size_height(
+            **design_args, search_method=search_method)
+    assert results["LTB_UR"] > 1
+    assert max(results["bending_UR"], results["shear_UR"], results["deflection_UR"]) <= 1
+
+    def ltb_ur(height):
+        design = TimberDesign(12500, 47, height, material)
+        return design._find_utilisation_results_with_selfweight(**design_args)["LTB_UR"]
+
+    assert ltb_ur(results["height"] - 5) >= results["LTB_UR"]
+    assert ltb_ur(results["height"] + 5) > results["LTB_UR"]
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from timber import TimberDesign, TimberMaterial
+
+
+GRADES = {"softwood": "C24", "hardwood": "D30", "glulam": "GL28H", "lvl": "LVL_S44", "green_oak": "TH1"}
+
+DIMENSIONS = ["breadth", "height", "length"]
+
+
+def find_ur_results(design, design_args, include_selfweight):
+    if include_selfweight:
+        return design._find_utilisation_results_with_selfweight(**design_args)
+    return design._find_utilisation_results(**design_args)
+
+
+def central_differences(design, design_args, include_selfweight, dimension, step):
+    '''Returns the central difference, and the forward and backward differences, of each check.'''
+    value = getattr(design, dimension)
+    results = {}
+    for offset in (step, -step):
+        setattr(design, dimension, value + offset)
+        results[offset] = find_ur_results(design, design_args, include_selfweight)
+    setattr(design, dimension, value)
+    current = find_ur_results(design, design_args, include_selfweight)
+    differences = {}
+    for check, ur in current.items():
+        if ur is None:
+            continue
+        differences[check] = ((results[step][check] - results[-step][check]) / (2 * step),
+                              (results[step][check] - ur) / step,
+                              (ur - results[-step][check]) / step)
+    return differences
+
+
+def random_cases(count, seed):
+    generator = random.Random(seed)
+    for _ in range(count):
+        material_type = generator.choice(list(GRADES))
+        length = generator.uniform(1500, 9000)
+        material = TimberMaterial(material_type, GRADES[material_type], generator.choice([1, 2, 3]))
+        design = TimberDesign(length, generator.uniform(35, 150), generator.uniform(60, 700), material,
+                              generator.choice([0.8, 1.0, 1.5]))
+        design_args = {
+            "load_duration": generator.choice(TimberMaterial.LOAD_DURATIONS),
+            "is_load_sharing": generator.random() < 0.5,
+            "permanent_udl": generator.uniform(0.5, 6),
+            "imposed_udl": generator.uniform(0, 6),
+            "imposed_combination_factor": 0.3,
+            "deflection_limit": length / 250,
+            "is_restrained": generator.random() < 0.3,
+            "with_creep": generator.random() < 0.8,
+            }
+        yield design, design_args, generator.random() < 0.7
+
+
+def test_analytic_derivatives_match_central_differences():
+    compared = 0
+    k_crit_branches = set()
+    for design, design_args, include_selfweight in random_cases(300, seed=11):
+        sensitivities = design.get_utilisation_sensitivities(**design_args, include_selfweight=include_selfweight)
+        for dimension in DIMENSIONS:
+            step = 1e-4 * getattr(design, dimension)
+            differences = central_differences(design, design_args, include_selfweight, dimension, step)
+            for check, (central, forward, backward) in differences.items():
+                # a k_h or k_crit kink within the step, the analytic derivative is of one branch
+                if abs(forward - backward) > 1e-3 * max(abs(forward), abs(backward), 1e-12):
+                    continue
+                assert sensitivities[check][f"d_{dimension}"] == pytest.approx(central, rel=1e-5, abs=1e-12), \
+                    (check, dimension, design.breadth, design.height, design.length, design_args)
+                compared += 1
+        if not design_args["is_restrained"] and design.breadth < design.height:
+            relative_slenderness = design.get_relative_slenderness()
+            k_crit_branches.add(0 if relative_slenderness <= 0.75 else 1 if relative_slenderness <= 1.4 else 2)
+    assert compared > 2500
+    assert k_crit_branches == {0, 1, 2}
+
+
+def test_not_applicable_ltb_has_no_derivatives():
+    design = TimberDesign(4000, 47, 200, TimberMaterial("softwood", "C24", 1))
+    sensitivities = design.get_utilisation_sensitivities("medium_term", False, 1.5, 2.0, 0.3, 16, True)
+    assert sensitivities["LTB_UR"] == {"UR": None, "d_breadth": None, "d_height": None, "d_length": None}
+    assert sensitivities["bending_UR"]["d_height"] < 0 < sensitivities["bending_UR"]["d_length"]
+
+
+def test_height_increase_estimate_is_first_order():
+    design = TimberDesign(4000, 47, 200, TimberMaterial("softwood", "C24", 1))
+    design_args = ("medium_term", False, 1.5, 2.0, 0.3, 16, False)
+    effects = design.get_height_increase_effect(*design_args, height_increase=1)
+    sensitivities = design.get_utilisation_sensitivities(*design_args)
+    assert design.height == 200
+    design.height = 201
+    new_ur_results = design._find_utilisation_results_with_selfweight(*design_args)
+    for check, effect in effects.items():
+        assert effect["UR"] == sensitivities[check]["UR"]
+        assert effect["estimated_UR"] == pytest.approx(effect["UR"] + sensitivities[check]["d_height"])
+        assert effect["new_UR"] == new_ur_results[check]
+        assert effect["new_UR"] == pytest.approx(effect["estimated_UR"], rel=1e-3)
@@ -0,0 +1,47 @@
+'''Eurocode 5 design of timber beams, joists and member schedules.
+
+The main classes are available from the package and are imported on first
+access, so importing timber reads no files and imports nothing heavy:
+
+    from timber import TimberMaterial, TimberDesign
+
+Material and section size data bundled in timber/data is read on first use.
+'''
+from importlib import import_module
+
+
+# public name: submodule it is defined in
+_EXPORTS = {
+    "TimberMaterial": "material",
+    "LoadDuration": "material",
+    "get_shared_material": "material",
+    "load_material_data": "material",
+    "reload_material_data": "material",
+    "use_material_snapshot": "material",
+    "TimberSection": "section",
+    "TimberBeam": "beam",
+    "TimberDesign": "design",
+    "BeamAnalysis": "beam_analysis",
+    "TimberJoist": "joist",
+    "TimberSectionCatalogue": "section_catalogue",
+    "FrozenTimberBeam": "frozen_beam",
+    "JoistSpanTable": "joist_span_table",
+    "DesignCache": "design_cache",
+    "DesignBatcher": "design_server",
+    "MaterialSnapshot": "material_snapshot",
+    }
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
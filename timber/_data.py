@@ -0,0 +1,11 @@
+'''Access to the data files bundled in timber/data.'''
+
+
+def open_data_file(file_name: str, mode: str = "r"):
+    '''Opens a bundled data file, wherever the package is installed.'''
+    # importlib.resources is slow to import so it is left until data is first read
+    from importlib import resources
+    data_file = resources.files(__package__).joinpath("data").joinpath(file_name)
+    if "b" in mode:
+        return data_file.open(mode)
+    return data_file.open(mode, encoding='utf-8')
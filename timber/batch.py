@@ -0,0 +1,348 @@
+'''Vectorised NumPy kernels for checking many timber members in one pass.
+
+The kernels mirror the scalar TimberBeam/TimberDesign/TimberJoist formulas one to one,
+so every array element matches what the scalar methods return for the same
+member. Checks which are not applicable (e.g. LTB of a restrained beam)
+are returned as NaN where the scalar path returns None.
+'''
+import numpy as np
+from .material import TimberMaterial
+
+
+def get_material_property_arrays(snapshot, grade_ids) -> dict:
+    '''Returns arrays of every material property, and the material index,
+    for an array of grade ids of a timber.material_snapshot.MaterialSnapshot.
+    Missing properties are NaN.'''
+    grade_ids = np.asarray(grade_ids, dtype=np.intp)
+    arrays = {name: np.asarray(snapshot.get_column(name))[grade_ids] for name in snapshot.columns}
+    arrays["material_index"] = np.asarray(snapshot.material_indices)[grade_ids]
+    return arrays
+
+
+def get_k_h_array(material: TimberMaterial, height) -> np.ndarray:
+    '''Returns the size factor k_h for an array of heights in [mm].'''
+    height = np.asarray(height, dtype=float)
+    if material.material_type in ["softwood", "hardwood", "green_oak"]:
+        k_h = np.where(height <= 150, np.minimum((150 / height)**0.2, 1.3), 1.0)
+    elif material.material_type == "glulam":
+        k_h = np.where(height <= 600, np.minimum((600 / height)**0.1, 1.1), 1.0)
+    elif material.material_type == "lvl":
+        size_factor = material.material_properties.get("size_factor", 0.12)
+        if size_factor is None:
+            size_factor = 0.12
+        k_h = np.minimum((300 / height)**size_factor, 1.2)
+    return k_h
+
+
+def get_k_crit_array(relative_slenderness) -> np.ndarray:
+    '''Returns k_crit for an array of relative slenderness values.'''
+    relative_slenderness = np.asarray(relative_slenderness, dtype=float)
+    return np.where(relative_slenderness <= 0.75,
+                    1.0,
+                    np.where(relative_slenderness <= 1.4,
+                             1.56 - 0.75 * relative_slenderness,
+                             1 / relative_slenderness**2))
+
+
+def get_torsion_coefficient_beta_array(breadth, height) -> np.ndarray:
+    '''Returns the torsion aspect ratio coefficient for arrays of sections.'''
+    long_side = np.maximum(height, breadth)
+    short_side = np.minimum(height, breadth)
+    return (1/3) - 0.21 * (short_side / long_side) * (1 - (short_side**4) / (12 * long_side**4))
+
+
+def get_g_005_array(material: TimberMaterial, breadth, height) -> np.ndarray:
+    '''Returns the 5th percentile shear modulus for arrays of sections.'''
+    breadth, height = np.broadcast_arrays(np.asarray(breadth, dtype=float),
+                                          np.asarray(height, dtype=float))
+    g_005 = material.material_properties["G_005"]
+    if g_005 is not None:
+        return np.full(breadth.shape, float(g_005))
+    e_005 = material.material_properties["E_005"]
+    if material.material_type in ["softwood"]:
+        alpha = (48 + (2 / 3)) * get_torsion_coefficient_beta_array(breadth, height)
+        return e_005 / alpha
+    if material.material_type in ["hardwood", "green_oak"]:
+        return np.full(breadth.shape, e_005 / 16)
+    raise KeyError("G_005 value is not given and logic to define it is not supported.")
+
+
+def get_beam_selfweight_per_m_array(material: TimberMaterial, breadth, height) -> np.ndarray:
+    '''Returns beam selfweights in [kN/m] for arrays of sections.'''
+    density_mean = material.material_properties["density_mean"]
+    return (density_mean
+            * (np.asarray(breadth, dtype=float) / 1000)
+            * (np.asarray(height, dtype=float) / 1000)
+            * (9.81 / 1000))
+
+
+def find_utilisation_results_batch(
+        material: TimberMaterial,
+        length,
+        breadth,
+        height,
+        load_duration: str,
+        is_load_sharing,
+        permanent_udl,
+        imposed_udl,
+        imposed_combination_factor,
+        deflection_limit,
+        is_restrained=True,
+        permanent_load_factor=1.35,
+        variable_load_factor=1.5,
+        with_creep=True,
+        effective_length_factor=1.0,
+        include_selfweight: bool = False
+        ) -> dict:
+    '''Batched equivalent of TimberDesign._find_utilisation_results.
+
+    All geometry, load and factor inputs, and is_load_sharing, may be
+    scalars or arrays and are broadcast against each other. Lengths and
+    section sizes are in [mm], udls in [kN/m] and the deflection limit in [mm].
+    If include_selfweight is True the beam selfweight is added to the
+    permanent udl, as the auto-design methods do.
+
+    load_duration is a name, or an array of LoadDuration codes to check
+    members with different load durations in the same pass, and with_creep
+    may be an array too.
+
+    Returns a dict with the same keys as the scalar method holding arrays.
+    '''
+    (length, breadth, height, permanent_udl, imposed_udl,
+     imposed_combination_factor, deflection_limit, is_restrained,
+     permanent_load_factor, variable_load_factor,
+     effective_length_factor) = np.broadcast_arrays(
+         *(np.asarray(value, dtype=float) for value in (
+             length, breadth, height, permanent_udl, imposed_udl,
+             imposed_combination_factor, deflection_limit, is_restrained,
+             permanent_load_factor, variable_load_factor,
+             effective_length_factor)))
+    properties = material.material_properties
+
+    if include_selfweight:
+        permanent_udl = permanent_udl + get_beam_selfweight_per_m_array(material, breadth, height)
+
+    area = breadth * height
+    elastic_section_modulus_major = breadth * height**2 / 6
+    inertia_major = breadth * height**3 / 12
+    inertia_minor = height * breadth**3 / 12
+
+    gamma_m = material.get_gamma_factor()
+    k_sys = np.where(is_load_sharing, 1.1, 1.0)
+    if isinstance(load_duration, str):
+        k_mod = material.get_k_mod(load_duration)
+    else:
+        k_mod = np.asarray(material.k_mod_table)[np.asarray(load_duration)]
+    k_h = get_k_h_array(material, height)
+
+    # bending
+    factored_udl = permanent_load_factor * permanent_udl + variable_load_factor * imposed_udl
+    design_moment = factored_udl * (length / 1000)**2 / 8
+    bending_stress = design_moment * 10**6 / elastic_section_modulus_major
+    bending_strength = k_h * k_mod * k_sys * properties["f_m_y_k"] / gamma_m
+    bending_ur = bending_stress / bending_strength
+
+    # shear
+    design_shear = factored_udl * (length / 1000) / 2
+    shear_stress = (3 * design_shear * 10**3) / (2 * area * material.get_k_cr())
+    shear_strength = k_mod * k_sys * properties["f_v_k"] / gamma_m
+    shear_ur = shear_stress / shear_strength
+
+    # lateral torsional buckling
+    beta = get_torsion_coefficient_beta_array(breadth, height)
+    inertia_torsional = beta * np.maximum(height, breadth) * np.minimum(height, breadth)**3
+    g_005 = get_g_005_array(material, breadth, height)
+    effective_length = length * effective_length_factor
+    critical_bending_stress = ((np.pi / (effective_length * elastic_section_modulus_major))
+                               * np.sqrt(properties["E_005"] * inertia_minor * g_005 * inertia_torsional))
+    relative_slenderness = np.sqrt(properties["f_m_y_k"] / critical_bending_stress)
+    buckling_strength = get_k_crit_array(relative_slenderness) * bending_strength
+    is_ltb_applicable = (is_restrained == 0) & (breadth < height)
+    ltb_ur = np.where(is_ltb_applicable, bending_stress / buckling_strength, np.nan)
+
+    # deflection
+    k_def = np.where(with_creep, material.get_k_def(), 0.0)
+    k_form = material.get_k_form()
+    e_0_mean = properties["E_0_mean"]
+    g_mean = properties["G_mean"]
+    permanent_creep = 1 + 1 * k_def
+    imposed_creep = 1 + imposed_combination_factor * k_def
+    delta_flex_g = ((5 * permanent_udl * length**4) / (384 * e_0_mean * inertia_major)) * permanent_creep
+    delta_flex_q = ((5 * imposed_udl * length**4) / (384 * e_0_mean * inertia_major)) * imposed_creep
+    delta_v_g = ((k_form * permanent_udl * length**2) / (8 * g_mean * area)) * permanent_creep
+    delta_v_q = ((k_form * imposed_udl * length**2) / (8 * g_mean * area)) * imposed_creep
+    final_deflection = delta_flex_g + delta_flex_q + delta_v_g + delta_v_q
+    deflection_ur = final_deflection / deflection_limit
+
+    results = {
+        "bending_UR": bending_ur,
+        "shear_UR": shear_ur,
+        "LTB_UR": ltb_ur,
+        "deflection_UR": deflection_ur
+        }
+    return results
+
+
+def get_max_utilisation_array(ur_results: dict) -> np.ndarray:
+    '''Returns the governing utilisation of each member, ignoring NaN checks.'''
+    return np.fmax.reduce([np.asarray(value, dtype=float) for value in ur_results.values()])
+
+
+def get_passes_checks_array(ur_results: dict) -> np.ndarray:
+    '''Returns a boolean array which is True where all applicable checks are <= 1.'''
+    return get_max_utilisation_array(ur_results) <= 1
+
+
+def find_utilisation_results_batch_for_beams(
+        beams,
+        load_duration: str,
+        is_load_sharing,
+        permanent_udl,
+        imposed_udl,
+        imposed_combination_factor,
+        deflection_limit,
+        is_restrained=True,
+        permanent_load_factor=1.35,
+        variable_load_factor=1.5,
+        with_creep=True,
+        include_selfweight: bool = False
+        ) -> dict:
+    '''Batched utilisation results for a sequence of FrozenTimberBeam or
+    TimberBeam (e.g. TimberDesign) instances.
+
+    Beams are grouped by material and each group is evaluated in one pass.
+    Load and factor inputs, is_load_sharing and with_creep may be scalars or
+    arrays aligned with beams, and load_duration a name or an array of
+    LoadDuration codes aligned with beams.
+    Returns a dict of arrays in the order of beams.
+    '''
+    beams = list(beams)
+    count = len(beams)
+    inputs = [np.broadcast_to(np.asarray(value, dtype=float), (count,))
+              for value in (permanent_udl, imposed_udl, imposed_combination_factor,
+                            deflection_limit, is_restrained, permanent_load_factor,
+                            variable_load_factor)]
+    is_load_sharing = np.broadcast_to(np.asarray(is_load_sharing, dtype=bool), (count,))
+    with_creep = np.broadcast_to(np.asarray(with_creep, dtype=bool), (count,))
+    if not isinstance(load_duration, str):
+        load_duration = np.broadcast_to(np.asarray(load_duration, dtype=np.intp), (count,))
+    groups = {}
+    materials = {}
+    for index, beam in enumerate(beams):
+        material = beam.material
+        # materials of the same grade loaded before and after reload_material_data
+        # have different properties
+        key = (material.material_type, material.strength_grade, material.service_class,
+               id(material.material_properties))
+        materials.setdefault(key, material)
+        groups.setdefault(key, []).append(index)
+
+    results = {check: np.full(count, np.nan)
+               for check in ["bending_UR", "shear_UR", "LTB_UR", "deflection_UR"]}
+    for key, indices in groups.items():
+        group = [beams[index] for index in indices]
+        group_results = find_utilisation_results_batch(
+            materials[key],
+            [beam.length for beam in group],
+            [beam.breadth for beam in group],
+            [beam.height for beam in group],
+            load_duration if isinstance(load_duration, str) else load_duration[indices],
+            is_load_sharing[indices],
+            *(value[indices] for value in inputs[:4]),
+            inputs[4][indices],
+            inputs[5][indices],
+            inputs[6][indices],
+            with_creep[indices],
+            [beam.effective_length_factor for beam in group],
+            include_selfweight)
+        for check, values in group_results.items():
+            results[check][indices] = values
+    return results
+
+
+def get_deflection_limit_for_1kn_point_load_array(length) -> np.ndarray:
+    '''Returns the 1kN point load deflection limits, a, in [mm] for an array of spans in [mm].'''
+    length = np.asarray(length, dtype=float)
+    return np.where(length <= 4000, 1.8, 16500 / length**1.1)
+
+
+def get_constant_for_unit_impulse_velocity_array(a_limit) -> np.ndarray:
+    '''Returns the unit impulse velocity constants, b, for an array of a limits.'''
+    a_limit = np.asarray(a_limit, dtype=float)
+    return np.where(a_limit <= 1, 180 - 60 * a_limit, 160 - 40 * a_limit)
+
+
+def find_floor_vibration_results_batch(
+        length,
+        floor_width,
+        joist_stiffness_per_metre,
+        floor_stiffness_per_metre,
+        mass_of_floor_per_unit_area,
+        modal_damping_ratio=0.02,
+        joist_spacing=None,
+        is_strutted=False,
+        joist_type_index: int = 0,
+        min_fundamental_frequency: float = 8,
+        ) -> dict:
+    '''Batched EC5 7.3 floor vibration checks of TimberJoist.
+
+    Input:
+        joist lengths (floor spans) and floor widths in [mm].
+        joist and floor stiffnesses per metre in units [Nmm^2/m].
+        mass of floor per unit area in units [kg/m^2].
+
+    All inputs may be scalars or arrays and are broadcast against each other.
+    Returns a dict of arrays of the fundamental frequency in [Hz], n_40,
+    the impulse velocity response and its limit, the point load deflection
+    limit a in [mm], the limiting constant b and pass flags, the frequency
+    passing if it is at least min_fundamental_frequency. n_40 is 0 where
+    the fundamental frequency is 40 Hz or more.
+
+    If joist spacings in [mm] are given the instantaneous deflection under
+    a 1kN point load and its pass flag are included, with k_dist and k_amp
+    found as TimberJoist.get_floor_utilisation_results does.
+    '''
+    (length, floor_width, joist_stiffness_per_metre, floor_stiffness_per_metre,
+     mass_of_floor_per_unit_area, modal_damping_ratio) = np.broadcast_arrays(
+         *(np.asarray(value, dtype=float) for value in (
+             length, floor_width, joist_stiffness_per_metre, floor_stiffness_per_metre,
+             mass_of_floor_per_unit_area, modal_damping_ratio)))
+    floor_span = length / 10**3
+    floor_width_m = floor_width / 10**3
+    joist_stiffness_m = joist_stiffness_per_metre / 10**6
+    floor_stiffness_m = floor_stiffness_per_metre / 10**6
+
+    fundamental_frequency = ((np.pi / (2 * floor_span**2))
+                             * np.sqrt(joist_stiffness_m / mass_of_floor_per_unit_area))
+    is_below_40_hz = fundamental_frequency < 40
+    modes_term = np.where(is_below_40_hz, (40 / fundamental_frequency)**2 - 1, 0.0)
+    n_40 = (modes_term
+            * (floor_width_m / floor_span)**4
+            * (joist_stiffness_m / floor_stiffness_m))**0.25
+    impulse_velocity = (4 * (0.4 + 0.6 * n_40)) / (mass_of_floor_per_unit_area * floor_width_m * floor_span + 200)
+
+    a_limit = get_deflection_limit_for_1kn_point_load_array(length)
+    b_limit = get_constant_for_unit_impulse_velocity_array(a_limit)
+    impulse_velocity_limit = b_limit**(fundamental_frequency * modal_damping_ratio - 1)
+
+    results = {
+        "fundamental_frequency": fundamental_frequency,
+        "n_40": n_40,
+        "impulse_velocity": impulse_velocity,
+        "impulse_velocity_limit": impulse_velocity_limit,
+        "point_load_deflection_limit": a_limit,
+        "impulse_velocity_constant": b_limit,
+        "frequency_passes": fundamental_frequency >= min_fundamental_frequency,
+        "impulse_velocity_passes": impulse_velocity <= impulse_velocity_limit,
+        }
+    if joist_spacing is not None:
+        joist_spacing = np.asarray(joist_spacing, dtype=float)
+        k_strut = np.where(np.asarray(is_strutted, dtype=bool), 0.97, 1.0)
+        k_dist = np.maximum(0.3, k_strut * (0.38 - 0.08 * np.log((14 * floor_stiffness_per_metre)
+                                                                   / joist_spacing**4)))
+        k_amp = np.asarray((1.05, 1.2, 1.3))[joist_type_index]
+        joist_stiffness = joist_stiffness_per_metre * joist_spacing / 1000
+        point_load_deflection = (1000 * k_dist * length**3 * k_amp) / (48 * joist_stiffness)
+        results["point_load_deflection"] = point_load_deflection
+        results["point_load_deflection_passes"] = point_load_deflection <= a_limit
+    return results
@@ -1,6 +1,6 @@
 from math import sqrt, pi
-from timber_section import TimberSection
-from timber_material import TimberMaterial
+from .section import TimberSection, cached_derived_value
+from .material import TimberMaterial
 
 
 class TimberBeam(TimberSection):
@@ -30,6 +30,7 @@ class TimberBeam(TimberSection):
             raise ValueError(f"Length, {new_length}mm, must be positive.")
         self._length = new_length
         self._set_effective_length()
+        self._invalidate_derived_values("effective_length")
 
     @property
     def effective_length_factor(self) -> float:
@@ -42,15 +43,17 @@ class TimberBeam(TimberSection):
                              " must be positive.")
         self._effective_length_factor = new_effective_length_factor
         self._set_effective_length()
+        self._invalidate_derived_values("effective_length")
 
     @property
     def effective_length(self) -> float:
         '''Returns effective length in [mm].'''
-        return self._effective_length_factor
+        return self._effective_length
 
     def _set_effective_length(self) -> None:
-        self._effective_length_factor = self.length * self.effective_length_factor
+        self._effective_length = self.length * self.effective_length_factor
 
+    @cached_derived_value("breadth", "height")
     def get_beam_selfweight_per_m(self) -> float:
         '''Returns beam selfweight in [kN/m].'''
         density_mean = self.material.material_properties["density_mean"]
@@ -73,6 +76,7 @@ class TimberBeam(TimberSection):
         elastic_section_modulus_major = self.get_elastic_section_modulus(True)
         return design_moment * 10**6 / elastic_section_modulus_major
 
+    @cached_derived_value("breadth", "height", "effective_length")
     def get_critical_bending_stress(self) -> float:
         '''Ref: EC5 Eq 6.31'''
         e_005 = self.material.material_properties["E_005"]
@@ -83,16 +87,22 @@ class TimberBeam(TimberSection):
         return ((pi / (self.effective_length * elastic_section_modulus_major))
                 * (sqrt(e_005 * inertia_minor * g_005 * inertia_torsional)))
 
+    @cached_derived_value("breadth", "height", "effective_length")
     def get_relative_slenderness(self) -> float:
         sigma_m_crit = self.get_critical_bending_stress()
         f_m_y_k = self.material.material_properties["f_m_y_k"]
         return sqrt(f_m_y_k / sigma_m_crit)
 
+    @cached_derived_value("height")
+    def get_k_h(self) -> float:
+        '''Returns the size factor for the beam height.'''
+        return self.material.get_k_h(self.height)
+
     def get_bending_strength(self, is_load_sharing: bool, load_duration: str) -> float:
         gamma_m = self.material.get_gamma_factor()
         k_sys = self.material.get_k_sys(is_load_sharing)
         k_mod = self.material.get_k_mod(load_duration)
-        k_h = self.material.get_k_h(self.height)
+        k_h = self.get_k_h()
         f_m_y_k = self.material.material_properties["f_m_y_k"]
         return k_h * k_mod * k_sys * f_m_y_k / gamma_m
 
@@ -163,6 +173,14 @@ class TimberBeam(TimberSection):
         g_mean = self.material.material_properties["G_mean"]
         return ((k_form * udl * self.length**2) / (8 * g_mean * self.area)) * (1 + psi_2 * k_def)
 
+    def get_flexural_rigidity(self) -> float:
+        '''Returns the mean major axis flexural rigidity EI in [Nmm^2].'''
+        return self.material.material_properties["E_0_mean"] * self.get_second_moment_of_area(True)
+
+    def get_shear_rigidity(self) -> float:
+        '''Returns the mean shear rigidity G*A/k_form in [N].'''
+        return self.material.material_properties["G_mean"] * self.area / self.material.get_k_form()
+
     def get_design_bending_moment(self,
                                   permanent_udl: float,
                                   imposed_udl: float,
@@ -0,0 +1,295 @@
+'''Linear elastic analysis of simply supported, cantilever and continuous beams.
+
+A BeamAnalysis holds the stiffness, flexibility and reaction influence
+matrices of one geometry, built once, so any number of load sets can be
+analysed by matrix products. Loads are dicts:
+    {"type": "point", "position": x, "magnitude": P}
+    {"type": "udl", "start": x1, "end": x2, "magnitude": w}
+with positions in [mm] from the left end, P in [kN] and w in [kN/m]. A udl
+without start and end covers the whole member. Positive loads act downwards.
+
+Moments in [kNm] are positive sagging, shears in [kN] are positive upwards on
+the left of a section and deflections in [mm] are positive downwards.
+Internal forces are evaluated on both sides of the supports, so each interior
+support appears as two stations, the last of one span and the first of the next.
+'''
+from functools import lru_cache
+import numpy as np
+
+
+SUPPORT_CONDITIONS = ["simply_supported", "cantilever", "continuous"]
+LOAD_TYPES = ["point", "udl"]
+
+
+class BeamAnalysis():
+    '''Analysis of a prismatic member over one or more spans.
+
+    Input the span lengths in [mm], the support condition and the number of
+    stations per span at which results are given, including both ends.
+        simply_supported, one span pinned at both ends
+        cantilever, one span fixed at the left end and free at the right
+        continuous, any number of spans pinned at every support
+    The member is split into Euler-Bernoulli elements between stations with
+    consistent nodal loads, so deflections at the stations are exact, and
+    internal forces follow from statics with the solved reactions.
+    '''
+    def __init__(self, spans, support_condition: str = "simply_supported", stations_per_span: int = 21):
+        spans = tuple(float(span) for span in spans)
+        if not spans:
+            raise ValueError("A beam must have at least one span.")
+        for span in spans:
+            if span <= 0:
+                raise ValueError(f"Span, {span}mm, must be positive.")
+        if support_condition not in SUPPORT_CONDITIONS:
+            raise ValueError(f"Support condition '{support_condition}' is invalid. " +
+                             f"Valid support conditions: {SUPPORT_CONDITIONS}.")
+        if support_condition != "continuous" and len(spans) != 1:
+            raise ValueError(f"A {support_condition} beam must have one span, not {len(spans)}.")
+        if stations_per_span < 2:
+            raise ValueError(f"Stations per span, {stations_per_span}, must be at least 2.")
+        self._spans = spans
+        self._support_condition = support_condition
+        self._stations_per_span = stations_per_span
+
+        support_positions = np.concatenate(([0.0], np.cumsum(spans)))
+        span_stations = [np.linspace(support_positions[span_index], support_positions[span_index + 1],
+                                     stations_per_span) for span_index in range(len(spans))]
+        self._positions = np.concatenate(span_stations)
+        # analyses are shared between members, see for_geometry
+        self._positions.flags.writeable = False
+        self._node_positions = np.concatenate([stations[:-1] for stations in span_stations]
+                                              + [support_positions[-1:]])
+        station_in_span = np.tile(np.arange(stations_per_span), len(spans))
+        span_of_station = np.repeat(np.arange(len(spans)), stations_per_span)
+        self._station_nodes = span_of_station * (stations_per_span - 1) + station_in_span
+        # stations other than the last of a span take the forces at their position
+        # as acting on their left, i.e. they give the values just right of a support
+        self._is_right_of_position = station_in_span < stations_per_span - 1
+
+        # unit flexural rigidity stiffness matrix with w and dw/dx at each node
+        node_count = len(self._node_positions)
+        element_lengths = np.diff(self._node_positions)
+        stiffness = np.zeros((2 * node_count, 2 * node_count))
+        for element, length in enumerate(element_lengths):
+            dofs = slice(2 * element, 2 * element + 4)
+            stiffness[dofs, dofs] += np.array([
+                [12, 6 * length, -12, 6 * length],
+                [6 * length, 4 * length**2, -6 * length, 2 * length**2],
+                [-12, -6 * length, 12, -6 * length],
+                [6 * length, 2 * length**2, -6 * length, 4 * length**2],
+                ]) / length**3
+        support_nodes = np.arange(len(spans) + 1) * (stations_per_span - 1)
+        if support_condition == "cantilever":
+            restrained_dofs = np.array([0, 1])
+        else:
+            restrained_dofs = 2 * support_nodes
+        free_dofs = np.setdiff1d(np.arange(2 * node_count), restrained_dofs)
+        self._element_lengths = element_lengths
+        self._free_dofs = free_dofs
+        self._restrained_dofs = restrained_dofs
+        self._flexibility = np.linalg.inv(stiffness[np.ix_(free_dofs, free_dofs)])
+        self._reaction_influence = stiffness[np.ix_(restrained_dofs, free_dofs)] @ self._flexibility
+
+        # moments and shears at the stations from unit reactions, which act downwards
+        # or, for the fixed end rotation, clockwise
+        restrained_positions = self._node_positions[restrained_dofs // 2]
+        is_acting = self._get_is_acting(restrained_positions)
+        lever_arms = self._positions[np.newaxis, :] - restrained_positions[:, np.newaxis]
+        is_rotation = (restrained_dofs % 2 == 1)[:, np.newaxis]
+        self._reaction_moments = np.where(is_rotation, 1.0, -lever_arms) * is_acting
+        self._reaction_shears = np.where(is_rotation, 0.0, -1.0) * is_acting
+
+        # shear deflection is the moment over the shear rigidity less its value
+        # at the supports, interpolated linearly along each span
+        station_count = len(self._positions)
+        shear_deflections = np.eye(station_count)
+        for span_index in range(len(spans)):
+            first = span_index * stations_per_span
+            last = first + stations_per_span - 1
+            stations = slice(first, last + 1)
+            if support_condition == "cantilever":
+                shear_deflections[stations, first] -= 1
+            else:
+                fraction = np.linspace(0, 1, stations_per_span)
+                shear_deflections[stations, first] -= 1 - fraction
+                shear_deflections[stations, last] -= fraction
+        self._shear_deflections = shear_deflections
+
+    @classmethod
+    def for_geometry(cls, spans, support_condition: str = "simply_supported",
+                     stations_per_span: int = 21) -> "BeamAnalysis":
+        '''Returns a shared analysis of the geometry, built on first use.'''
+        return _get_shared_beam_analysis(tuple(float(span) for span in spans),
+                                         support_condition, stations_per_span)
+
+    @property
+    def spans(self) -> tuple:
+        return self._spans
+
+    @property
+    def support_condition(self) -> str:
+        return self._support_condition
+
+    @property
+    def length(self) -> float:
+        '''Returns the total length of the member in [mm].'''
+        return float(self._node_positions[-1])
+
+    @property
+    def positions(self) -> np.ndarray:
+        '''Returns the positions of the stations in [mm].'''
+        return self._positions
+
+    def _get_is_acting(self, load_positions) -> np.ndarray:
+        '''Returns a (loads, stations) array, True where a force at the load
+        position acts on the left of the station.'''
+        load_positions = load_positions[:, np.newaxis]
+        return ((load_positions < self._positions)
+                | ((load_positions == self._positions) & self._is_right_of_position))
+
+    def _get_point_load_effects(self, positions, magnitudes) -> tuple:
+        '''Returns the nodal loads, station moments and station shears of
+        point loads in [N] and [mm], acting alone.'''
+        node_positions = self._node_positions
+        elements = np.clip(np.searchsorted(node_positions, positions, side="right") - 1,
+                           0, len(self._element_lengths) - 1)
+        lengths = self._element_lengths[elements]
+        xi = (positions - node_positions[elements]) / lengths
+        shape_functions = np.stack([1 - 3 * xi**2 + 2 * xi**3,
+                                    lengths * (xi - 2 * xi**2 + xi**3),
+                                    3 * xi**2 - 2 * xi**3,
+                                    lengths * (xi**3 - xi**2)], axis=1)
+        nodal_loads = np.zeros((len(positions), 2 * len(node_positions)))
+        rows = np.arange(len(positions))[:, np.newaxis]
+        nodal_loads[rows, 2 * elements[:, np.newaxis] + np.arange(4)] = magnitudes[:, np.newaxis] * shape_functions
+        is_acting = self._get_is_acting(positions)
+        moments = -magnitudes[:, np.newaxis] * (self._positions - positions[:, np.newaxis]) * is_acting
+        shears = -magnitudes[:, np.newaxis] * is_acting
+        return nodal_loads, moments, shears
+
+    def _get_udl_effects(self, starts, ends, magnitudes) -> tuple:
+        '''Returns the nodal loads, station moments and station shears of
+        partial udls in [N/mm] and [mm], acting alone.'''
+        node_positions = self._node_positions
+        lengths = self._element_lengths
+        xi_start = np.clip((starts[:, np.newaxis] - node_positions[:-1]) / lengths, 0, 1)
+        xi_end = np.clip((ends[:, np.newaxis] - node_positions[:-1]) / lengths, 0, 1)
+
+        def integrate(xi: np.ndarray) -> np.ndarray:
+            # integrals of the shape functions along the element from its start to xi
+            return np.stack([lengths * (xi - xi**3 + xi**4 / 2),
+                             lengths**2 * (xi**2 / 2 - 2 * xi**3 / 3 + xi**4 / 4),
+                             lengths * (xi**3 - xi**4 / 2),
+                             lengths**2 * (xi**4 / 4 - xi**3 / 3)], axis=2)
+
+        element_loads = magnitudes[:, np.newaxis, np.newaxis] * (integrate(xi_end) - integrate(xi_start))
+        nodal_loads = np.zeros((len(starts), 2 * len(node_positions)))
+        for local_dof in range(4):
+            nodal_loads[:, local_dof:local_dof + 2 * len(lengths):2] += element_loads[:, :, local_dof]
+        loaded_ends = np.clip(self._positions, starts[:, np.newaxis], ends[:, np.newaxis])
+        loads_on_left = magnitudes[:, np.newaxis] * (loaded_ends - starts[:, np.newaxis])
+        moments = -loads_on_left * (self._positions - (starts[:, np.newaxis] + loaded_ends) / 2)
+        return nodal_loads, moments, -loads_on_left
+
+    def find_load_effects(self, loads, flexural_rigidity: float = None, shear_rigidity: float = None) -> dict:
+        '''Returns the effects of each load acting alone at the stations.
+
+        Returns {"moment", "shear", "reaction"} arrays with one row per load,
+        and "deflection" if the flexural rigidity EI in [Nmm^2] is given, which
+        includes shear deflection if the shear rigidity G*A/k_form in [N] is given.
+        Reactions in [kN] are positive upwards and the fixed end moment of a
+        cantilever in [kNm] is positive anticlockwise.
+        The effects of a load set are the sums of the rows.
+        '''
+        point_loads = []
+        udls = []
+        for load in loads:
+            load_type = load.get("type", "udl")
+            if load_type not in LOAD_TYPES:
+                raise ValueError(f"Load type '{load_type}' is invalid. Valid load types: {LOAD_TYPES}.")
+            if load_type == "point":
+                position = load["position"]
+                if not 0 <= position <= self.length:
+                    raise ValueError(f"Point load position, {position}mm, is not on the member.")
+                point_loads.append((len(point_loads) + len(udls), position, load["magnitude"] * 1000))
+            else:
+                start = load.get("start", 0)
+                end = load.get("end", self.length)
+                if not 0 <= start <= end <= self.length:
+                    raise ValueError(f"Udl from {start}mm to {end}mm is not on the member.")
+                udls.append((len(point_loads) + len(udls), start, end, load["magnitude"]))
+
+        load_count = len(point_loads) + len(udls)
+        nodal_loads = np.zeros((load_count, 2 * len(self._node_positions)))
+        moments = np.zeros((load_count, len(self._positions)))
+        shears = np.zeros((load_count, len(self._positions)))
+        if point_loads:
+            rows, positions, magnitudes = (np.array(values) for values in zip(*point_loads))
+            nodal_loads[rows], moments[rows], shears[rows] = self._get_point_load_effects(
+                positions.astype(float), magnitudes.astype(float))
+        if udls:
+            rows, starts, ends, magnitudes = (np.array(values) for values in zip(*udls))
+            nodal_loads[rows], moments[rows], shears[rows] = self._get_udl_effects(
+                starts.astype(float), ends.astype(float), magnitudes.astype(float))
+
+        free_loads = nodal_loads[:, self._free_dofs]
+        reactions = free_loads @ self._reaction_influence.T - nodal_loads[:, self._restrained_dofs]
+        moments += reactions @ self._reaction_moments
+        shears += reactions @ self._reaction_shears
+        results = {
+            "moment": moments / 10**6,
+            "shear": shears / 1000,
+            "reaction": -reactions / np.where(self._restrained_dofs % 2 == 1, 10**6, 1000),
+            }
+        if flexural_rigidity is not None:
+            displacements = np.zeros_like(nodal_loads)
+            displacements[:, self._free_dofs] = free_loads @ self._flexibility
+            deflections = displacements[:, 2 * self._station_nodes] / flexural_rigidity
+            if shear_rigidity is not None:
+                deflections += moments @ self._shear_deflections.T / shear_rigidity
+            results["deflection"] = deflections
+        return results
+
+    def find_envelopes(self,
+                       permanent_loads,
+                       imposed_loads,
+                       permanent_load_factor: float = 1.35,
+                       variable_load_factor: float = 1.5,
+                       flexural_rigidity: float = None,
+                       shear_rigidity: float = None,
+                       permanent_deflection_factor: float = 1.0,
+                       imposed_deflection_factor: float = 1.0
+                       ) -> dict:
+        '''Returns the max and min moment, shear and deflection at each station.
+
+        Permanent loads always act, and every imposed load acts or not in the
+        arrangement which is worst at each station, e.g. give one imposed udl per
+        span for pattern loading of a continuous beam. Moments and shears use the
+        load factors and deflections, if the flexural rigidity is given, the
+        deflection factors, e.g. 1 + k_def and 1 + psi_2 * k_def for final deflections.
+        Returns {"position", "max_moment", "min_moment", "max_shear", "min_shear"}
+        and "max_deflection" and "min_deflection" if they are found.
+        '''
+        permanent_loads = list(permanent_loads)
+        imposed_loads = list(imposed_loads)
+        load_effects = self.find_load_effects(permanent_loads + imposed_loads, flexural_rigidity, shear_rigidity)
+        permanent_count = len(permanent_loads)
+        factors = {
+            "moment": (permanent_load_factor, variable_load_factor),
+            "shear": (permanent_load_factor, variable_load_factor),
+            "deflection": (permanent_deflection_factor, imposed_deflection_factor),
+            }
+        results = {"position": self._positions}
+        for effect, (permanent_factor, imposed_factor) in factors.items():
+            if effect not in load_effects:
+                continue
+            permanent = permanent_factor * load_effects[effect][:permanent_count].sum(axis=0)
+            imposed = imposed_factor * load_effects[effect][permanent_count:]
+            results[f"max_{effect}"] = permanent + np.maximum(imposed, 0).sum(axis=0)
+            results[f"min_{effect}"] = permanent + np.minimum(imposed, 0).sum(axis=0)
+        return results
+
+
+@lru_cache(maxsize=256)
+def _get_shared_beam_analysis(spans: tuple, support_condition: str, stations_per_span: int) -> BeamAnalysis:
+    return BeamAnalysis(spans, support_condition, stations_per_span)
@@ -0,0 +1,1075 @@
+import warnings
+from math import ceil, isinf
+from . import instrumentation
+from .beam import TimberBeam
+from .material import TimberMaterial
+from .section_catalogue import TimberSectionCatalogue
+from .section_solver import REQUIRED_SIZE_CHECKS, find_required_breadths, find_required_heights
+from .sensitivity import find_utilisation_sensitivities
+
+
+class TimberDesign(TimberBeam):
+
+    VALID_SEARCH_METHODS = ["direct", "linear", "bisection"]
+    UTILISATION_CHECKS = ["bending_UR", "shear_UR", "LTB_UR", "deflection_UR"]
+
+    def __init__(self,
+                 length: float,
+                 breadth: float,
+                 height: float,
+                 timber_material_instance: TimberMaterial,
+                 effective_length_factor: float = 1.0,
+                 is_incremental: bool = False
+                 ):
+        super().__init__(length, breadth, height, timber_material_instance, effective_length_factor)
+        self._incremental_results = {}
+        self.is_incremental = is_incremental
+
+    @classmethod
+    def from_frozen_beam(cls, beam, is_incremental: bool = False) -> "TimberDesign":
+        '''Returns a new TimberDesign of a FrozenTimberBeam, sharing its material.'''
+        return cls(beam.length,
+                   beam.breadth,
+                   beam.height,
+                   beam.material,
+                   beam.effective_length_factor,
+                   is_incremental)
+
+    @property
+    def is_incremental(self) -> bool:
+        '''Returns True if utilisation results are recomputed incrementally.
+
+        In incremental mode _find_utilisation_results remembers the inputs each
+        check depends on and only recomputes the checks whose inputs changed
+        since the last call, e.g. only the deflection check when the deflection
+        limit changes or only the LTB check when the effective length changes.
+        Load independent section and LTB terms are cached in either mode.
+        '''
+        return self._is_incremental
+
+    @is_incremental.setter
+    def is_incremental(self, is_incremental: bool) -> None:
+        self._is_incremental = is_incremental
+        self._incremental_results.clear()
+
+    def get_bending_utilisation(self,
+                                permanent_udl,
+                                imposed_udl,
+                                permanent_load_factor,
+                                variable_load_factor,
+                                is_load_sharing,
+                                load_duration
+                                ) -> float:
+        design_moment = self.get_design_bending_moment(permanent_udl,
+                                                       imposed_udl,
+                                                       permanent_load_factor,
+                                                       variable_load_factor)
+        bending_stress = self.get_bending_stress(design_moment)
+        bending_strength = self.get_bending_strength(is_load_sharing, load_duration)
+        return bending_stress / bending_strength
+
+    def get_shear_utilisation(self,
+                              permanent_udl,
+                              imposed_udl,
+                              permanent_load_factor,
+                              variable_load_factor,
+                              is_load_sharing,
+                              load_duration
+                              ) -> float:
+        design_shear = self.get_design_shear_force(permanent_udl,
+                                                   imposed_udl,
+                                                   permanent_load_factor,
+                                                   variable_load_factor)
+        shear_stress = self.get_shear_stress(design_shear)
+        shear_strength = self.get_shear_strength(is_load_sharing, load_duration)
+        return shear_stress / shear_strength
+
+    def get_lateral_torsional_buckling_utilisation(
+            self,
+            permanent_udl,
+            imposed_udl,
+            permanent_load_factor,
+            variable_load_factor,
+            is_load_sharing,
+            load_duration,
+            is_restrained
+            ) -> float:
+        design_moment = self.get_design_bending_moment(permanent_udl,
+                                                       imposed_udl,
+                                                       permanent_load_factor,
+                                                       variable_load_factor)
+        bending_stress = self.get_bending_stress(design_moment)
+        if is_restrained or self.breadth >= self.height:
+            lateral_torsional_buckling_utilisation_ratio = None
+        else:
+            buckling_strength = self.get_buckling_strength(is_load_sharing, load_duration)
+            lateral_torsional_buckling_utilisation_ratio = bending_stress / buckling_strength
+        return lateral_torsional_buckling_utilisation_ratio
+
+    def get_final_deflection_utilisation(
+            self,
+            permanent_udl,
+            imposed_udl,
+            with_creep,
+            imposed_combination_factor,
+            deflection_limit
+            ) -> float:
+        final_deflection = self.get_final_deflection(permanent_udl,
+                                                     imposed_udl,
+                                                     imposed_combination_factor,
+                                                     with_creep
+                                                     )
+        return final_deflection / deflection_limit
+
+    def _find_utilisation_results(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            ) -> dict:
+        # resolve the load duration once so the k_mod lookups take the fast path
+        load_duration = self.material.get_load_duration_index(load_duration)
+        if self._is_incremental:
+            return self._find_incremental_utilisation_results(
+                load_duration,
+                is_load_sharing,
+                permanent_udl,
+                imposed_udl,
+                imposed_combination_factor,
+                deflection_limit,
+                is_restrained,
+                permanent_load_factor,
+                variable_load_factor,
+                with_creep)
+        if instrumentation.ENABLED:
+            return self._find_instrumented_utilisation_results(
+                load_duration,
+                is_load_sharing,
+                permanent_udl,
+                imposed_udl,
+                imposed_combination_factor,
+                deflection_limit,
+                is_restrained,
+                permanent_load_factor,
+                variable_load_factor,
+                with_creep)
+        return self._find_load_utilisation_results(
+            load_duration,
+            is_load_sharing,
+            permanent_udl,
+            imposed_udl,
+            imposed_combination_factor,
+            deflection_limit,
+            is_restrained,
+            permanent_load_factor,
+            variable_load_factor,
+            with_creep)
+
+    def _find_load_utilisation_results(
+            self,
+            load_duration,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool,
+            permanent_load_factor: float,
+            variable_load_factor: float,
+            with_creep: bool,
+            checks: list = UTILISATION_CHECKS
+            ) -> dict:
+        '''Returns the utilisation results of the checks given, the others are None.
+
+        This is the load and k_mod dependent part of the checks. The geometry
+        dependent part, the section properties, k_h, the LTB terms and the
+        selfweight, is cached on the beam (see cached_derived_value), so it is
+        evaluated once and shared by every load case on the same geometry.
+        '''
+        strength_args = (permanent_udl, imposed_udl, permanent_load_factor,
+                         variable_load_factor, is_load_sharing, load_duration)
+        results = dict.fromkeys(self.UTILISATION_CHECKS)
+        if "bending_UR" in checks:
+            results["bending_UR"] = self.get_bending_utilisation(*strength_args)
+        if "shear_UR" in checks:
+            results["shear_UR"] = self.get_shear_utilisation(*strength_args)
+        if "LTB_UR" in checks:
+            results["LTB_UR"] = self.get_lateral_torsional_buckling_utilisation(*strength_args,
+                                                                                is_restrained)
+        if "deflection_UR" in checks:
+            results["deflection_UR"] = self.get_final_deflection_utilisation(
+                permanent_udl,
+                imposed_udl,
+                with_creep,
+                imposed_combination_factor,
+                deflection_limit)
+        return results
+
+    def _find_instrumented_utilisation_results(
+            self,
+            load_duration,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool,
+            permanent_load_factor: float,
+            variable_load_factor: float,
+            with_creep: bool,
+            ) -> dict:
+        '''_find_utilisation_results with every check counted and timed.'''
+        strength_args = (permanent_udl, imposed_udl, permanent_load_factor,
+                         variable_load_factor, is_load_sharing, load_duration)
+        checks = (
+            ("bending_UR", self.get_bending_utilisation, strength_args),
+            ("shear_UR", self.get_shear_utilisation, strength_args),
+            ("LTB_UR", self.get_lateral_torsional_buckling_utilisation, strength_args + (is_restrained,)),
+            ("deflection_UR", self.get_final_deflection_utilisation,
+             (permanent_udl, imposed_udl, with_creep, imposed_combination_factor, deflection_limit)),
+            )
+        results = {}
+        for check, method, args in checks:
+            with instrumentation.timer(f"check/{check}"):
+                results[check] = method(*args)
+        instrumentation.record_count("design/utilisation_evaluations")
+        return results
+
+    def _find_incremental_utilisation_results(
+            self,
+            load_duration,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool,
+            permanent_load_factor: float,
+            variable_load_factor: float,
+            with_creep: bool,
+            ) -> dict:
+        '''_find_utilisation_results recomputing only the checks whose inputs
+        have changed since the previous call, see is_incremental. When
+        instrumented the recomputed checks are timed and the reused ones counted.'''
+        is_instrumented = instrumentation.ENABLED
+        material = self.material
+        member_inputs = (self._breadth, self._height, self._length,
+                         material.material_properties, material.service_class)
+        strength_args = (permanent_udl, imposed_udl, permanent_load_factor,
+                         variable_load_factor, is_load_sharing, load_duration)
+        deflection_args = (permanent_udl, imposed_udl, with_creep,
+                           imposed_combination_factor, deflection_limit)
+        checks = (
+            ("bending_UR", self.get_bending_utilisation, strength_args, ()),
+            ("shear_UR", self.get_shear_utilisation, strength_args, ()),
+            ("LTB_UR", self.get_lateral_torsional_buckling_utilisation, strength_args + (is_restrained,),
+             (self._effective_length,)),
+            ("deflection_UR", self.get_final_deflection_utilisation, deflection_args, ()),
+            )
+        results = {}
+        for check, method, args, extra_inputs in checks:
+            inputs = member_inputs + args + extra_inputs
+            previous = self._incremental_results.get(check)
+            if previous is not None and previous[0] == inputs:
+                results[check] = previous[1]
+                if is_instrumented:
+                    instrumentation.record_count(f"check/{check}/reused")
+                continue
+            if is_instrumented:
+                with instrumentation.timer(f"check/{check}"):
+                    results[check] = method(*args)
+            else:
+                results[check] = method(*args)
+            self._incremental_results[check] = (inputs, results[check])
+        if is_instrumented:
+            instrumentation.record_count("design/utilisation_evaluations")
+        return results
+
+    def _record_auto_design(self, method: str, results: dict) -> None:
+        '''Records the outcome of an auto-design run when instrumentation is enabled.'''
+        ur_results = {check: results[check] for check in self.UTILISATION_CHECKS
+                      if results[check] is not None}
+        governing_check = max(ur_results, key=ur_results.get)
+        instrumentation.record_count(f"auto_design/{method}")
+        instrumentation.record_count(f"auto_design/governing/{governing_check}")
+        instrumentation.emit("auto_design", method=method,
+                             governing_check=governing_check, results=results)
+
+    def _warn_ltb_getting_worse(self) -> None:
+        message = "Increasing height is making lateral torsional buckling worse."
+        if instrumentation.ENABLED:
+            instrumentation.emit("ltb_getting_worse", breadth=self.breadth, height=self.height)
+        warnings.warn(message, RuntimeWarning, stacklevel=3)
+
+    def find_load_case_utilisation_results(
+            self,
+            load_cases: list,
+            is_load_sharing: bool,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            with_creep: bool = True,
+            include_selfweight: bool = False
+            ) -> dict:
+        '''Returns the utilisation results of several load cases together
+        with the governing load case of each check.
+
+        Each load case is a dict with the keys:
+            "name", unique name of the load case
+            "load_duration"
+            "permanent_udl" and "imposed_udl" in [kN/m]
+            "permanent_load_factor", optional, defaults to 1.35
+            "variable_load_factor", optional, defaults to 1.5
+            "imposed_combination_factor", optional, defaults to 0.3
+            "checks", optional list of the checks the load case applies to,
+                any of "bending_UR", "shear_UR", "LTB_UR" and "deflection_UR",
+                defaults to all of them. Other checks are None for the case.
+        If include_selfweight is True the beam selfweight is added to the
+        permanent udl of every load case.
+
+        The geometry dependent values are evaluated once and shared by all
+        load cases, see _find_load_utilisation_results, which also gives
+        _find_utilisation_results, so each case has the same results as
+        _find_utilisation_results with the case's inputs.
+        Returns {"load_cases": {name: ur_results}, "governing": {check: {"load_case": name, "UR": ur}}}.
+        '''
+        selfweight = self.get_beam_selfweight_per_m() if include_selfweight else 0
+        load_case_results = {}
+        governing = {check: {"load_case": None, "UR": None} for check in self.UTILISATION_CHECKS}
+        for load_case in load_cases:
+            name = load_case["name"]
+            if name in load_case_results:
+                raise ValueError(f"Load case name '{name}' is not unique.")
+            checks = load_case.get("checks", self.UTILISATION_CHECKS)
+            for check in checks:
+                if check not in self.UTILISATION_CHECKS:
+                    raise ValueError(f"Check '{check}' is invalid. " +
+                                     f"Valid checks: {self.UTILISATION_CHECKS}.")
+            ur_results = self._find_load_utilisation_results(
+                self.material.get_load_duration_index(load_case["load_duration"]),
+                is_load_sharing,
+                load_case["permanent_udl"] + selfweight,
+                load_case["imposed_udl"],
+                load_case.get("imposed_combination_factor", 0.3),
+                deflection_limit,
+                is_restrained,
+                load_case.get("permanent_load_factor", 1.35),
+                load_case.get("variable_load_factor", 1.5),
+                with_creep,
+                checks)
+
+            for check, ur in ur_results.items():
+                if ur is not None and (governing[check]["UR"] is None or ur > governing[check]["UR"]):
+                    governing[check] = {"load_case": name, "UR": ur}
+            load_case_results[name] = ur_results
+
+        results = {
+            "load_cases": load_case_results,
+            "governing": governing
+            }
+        return results
+
+    def find_beam_analysis_utilisation_results(
+            self,
+            beam_analysis,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_loads: list,
+            imposed_loads: list,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            include_selfweight: bool = False
+            ) -> dict:
+        '''Returns the utilisation results of a member analysed by a
+        timber.beam_analysis.BeamAnalysis under any loads.
+
+        The loads are lists of load dicts, see timber.beam_analysis, and every
+        imposed load is patterned for the worst effects. The largest moment and
+        shear of the envelopes feed the stress and strength getters, and the
+        largest final deflection, including shear deflection and creep, is
+        compared with the deflection limit. LTB uses the effective length of
+        the beam. If include_selfweight is True the beam selfweight is added as
+        a permanent udl over the whole member.
+        For a single span simply supported udl the results match
+        _find_utilisation_results.
+        '''
+        permanent_loads = list(permanent_loads)
+        if include_selfweight:
+            permanent_loads.append({"type": "udl", "magnitude": self.get_beam_selfweight_per_m()})
+        k_def = self.material.get_k_def() if with_creep else 0
+        envelopes = beam_analysis.find_envelopes(
+            permanent_loads,
+            imposed_loads,
+            permanent_load_factor,
+            variable_load_factor,
+            self.get_flexural_rigidity(),
+            self.get_shear_rigidity(),
+            1 + k_def,
+            1 + imposed_combination_factor * k_def)
+        design_moment = max(envelopes["max_moment"].max(), -envelopes["min_moment"].min())
+        design_shear = max(envelopes["max_shear"].max(), -envelopes["min_shear"].min())
+        final_deflection = max(envelopes["max_deflection"].max(), -envelopes["min_deflection"].min())
+
+        bending_stress = self.get_bending_stress(design_moment)
+        shear_stress = self.get_shear_stress(design_shear)
+        if is_restrained or self.breadth >= self.height:
+            ltb_ur = None
+        else:
+            ltb_ur = bending_stress / self.get_buckling_strength(is_load_sharing, load_duration)
+        results = {
+            "bending_UR": bending_stress / self.get_bending_strength(is_load_sharing, load_duration),
+            "shear_UR": shear_stress / self.get_shear_strength(is_load_sharing, load_duration),
+            "LTB_UR": ltb_ur,
+            "deflection_UR": final_deflection / deflection_limit
+            }
+        return {check: None if ur is None else float(ur) for check, ur in results.items()}
+
+    def get_utilisation_sensitivities(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            include_selfweight: bool = True
+            ) -> dict:
+        '''Returns each utilisation ratio with its analytic partial derivatives
+        with respect to breadth, height and length in [1/mm].
+
+        Input permanent udl in [kN/m] excluding selfweight. If include_selfweight
+        is True the selfweight and its dependence on the section are included,
+        as in the auto-designers. The derivatives follow the k_h and k_crit
+        branch of the current section and, at a kink, are those of the branch
+        evaluated. LTB is None where it is not applicable.
+        Returns {check: {"UR", "d_breadth", "d_height", "d_length"}}.
+        '''
+        design_args = (load_duration, is_load_sharing, permanent_udl, imposed_udl,
+                       imposed_combination_factor, deflection_limit, is_restrained,
+                       permanent_load_factor, variable_load_factor, with_creep)
+        return find_utilisation_sensitivities(self, design_args, include_selfweight)
+
+    def get_height_increase_effect(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            include_selfweight: bool = True,
+            height_increase: float = 25
+            ) -> dict:
+        '''Returns the effect of increasing the height by height_increase in [mm]
+        on each utilisation ratio.
+
+        Returns {check: {"UR", "estimated_UR", "new_UR"}} where estimated_UR is
+        the first order estimate from get_utilisation_sensitivities and new_UR
+        is the utilisation ratio of the deeper section. The height is unchanged.
+        '''
+        design_args = (load_duration, is_load_sharing, permanent_udl, imposed_udl,
+                       imposed_combination_factor, deflection_limit, is_restrained,
+                       permanent_load_factor, variable_load_factor, with_creep)
+        sensitivities = find_utilisation_sensitivities(self, design_args, include_selfweight)
+        height = self.height
+        self.height = height + height_increase
+        try:
+            if include_selfweight:
+                new_ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+            else:
+                new_ur_results = self._find_utilisation_results(*design_args)
+        finally:
+            self.height = height
+
+        results = {}
+        for check, sensitivity in sensitivities.items():
+            if sensitivity["UR"] is None:
+                estimated_ur = None
+            else:
+                estimated_ur = sensitivity["UR"] + sensitivity["d_height"] * height_increase
+            results[check] = {
+                "UR": sensitivity["UR"],
+                "estimated_UR": estimated_ur,
+                "new_UR": new_ur_results[check],
+                }
+        return results
+
+    def get_auto_designed_timber_size_list(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            section_catalogue: TimberSectionCatalogue = None
+            ):
+        '''Auto designs timber beam size to smallest depth 
+        through a list of standard breadths & depths.
+
+        Input permanent udl in [kN/m] excluding selfweight.
+        A custom section catalogue can be given, otherwise the standard
+        sizes for the material type are used. Sections which cannot pass
+        bending, shear or deflection even without selfweight are skipped.
+        '''
+        if section_catalogue is None:
+            section_catalogue = TimberSectionCatalogue.for_material(self.material.material_type)
+
+        min_properties = self._get_minimum_section_properties(
+            load_duration,
+            is_load_sharing,
+            permanent_udl,
+            imposed_udl,
+            imposed_combination_factor,
+            deflection_limit,
+            permanent_load_factor,
+            variable_load_factor,
+            with_creep,
+            section_catalogue.min_height
+            )
+        design_args = (load_duration, is_load_sharing, permanent_udl, imposed_udl,
+                       imposed_combination_factor, deflection_limit, is_restrained,
+                       permanent_load_factor, variable_load_factor, with_creep)
+
+        for index in section_catalogue.get_feasible_indices(**min_properties):
+            self.breadth, self.height = section_catalogue[index]
+            ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+            if self._passes_checks(ur_results):
+                results = {
+                    "breadth": self.breadth,
+                    "height": self.height,
+                    }
+                results.update(ur_results)
+                if instrumentation.ENABLED:
+                    self._record_auto_design("list", results)
+                return results
+        # catalogue exhausted returning results from largest section
+        self.breadth, self.height = section_catalogue[len(section_catalogue) - 1]
+        ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+        results = {
+            "breadth": self.breadth,
+            "height": self.height,
+            }
+        results.update(ur_results)
+        if instrumentation.ENABLED:
+            self._record_auto_design("list", results)
+        return results
+
+    def _get_minimum_section_properties(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            permanent_load_factor: float,
+            variable_load_factor: float,
+            with_creep: bool,
+            min_height: float
+            ) -> dict:
+        '''Returns lower bounds on the major axis elastic section modulus,
+        second moment of area and area of any section which passes bending,
+        shear and deflection.
+
+        The bounds ignore selfweight and shear deflection, which can only
+        increase the demand, and use the k_h of the smallest height considered.
+        No bounds are given for negative loads or load factors.
+        '''
+        loads = (permanent_udl, imposed_udl, permanent_load_factor,
+                 variable_load_factor, imposed_combination_factor)
+        if min(loads) < 0:
+            return {}
+        # relative tolerance so that rounding never prunes a section at UR = 1
+        tolerance = 1 - 1e-9
+        gamma_m = self.material.get_gamma_factor()
+        k_sys = self.material.get_k_sys(is_load_sharing)
+        k_mod = self.material.get_k_mod(load_duration)
+        k_h_max = self.material.get_k_h(min_height)
+        k_cr = self.material.get_k_cr()
+        k_def = self.material.get_k_def() if with_creep else 0
+        f_m_y_k = self.material.material_properties["f_m_y_k"]
+        f_v_k = self.material.material_properties["f_v_k"]
+        e_0_mean = self.material.material_properties["E_0_mean"]
+
+        design_moment = self.get_design_bending_moment(permanent_udl,
+                                                       imposed_udl,
+                                                       permanent_load_factor,
+                                                       variable_load_factor)
+        design_shear = self.get_design_shear_force(permanent_udl,
+                                                   imposed_udl,
+                                                   permanent_load_factor,
+                                                   variable_load_factor)
+        bending_strength = k_h_max * k_mod * k_sys * f_m_y_k / gamma_m
+        shear_strength = k_mod * k_sys * f_v_k / gamma_m
+        creep_udl = (permanent_udl * (1 + k_def)
+                     + imposed_udl * (1 + imposed_combination_factor * k_def))
+        return {
+            "min_elastic_section_modulus": tolerance * design_moment * 10**6 / bending_strength,
+            "min_second_moment_of_area": (tolerance * 5 * creep_udl * self.length**4
+                                          / (384 * e_0_mean * deflection_limit)),
+            "min_area": tolerance * (3 * design_shear * 10**3) / (2 * k_cr * shear_strength),
+            }
+
+    def get_required_height(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True
+            ) -> dict:
+        '''Returns the smallest heights in [mm] of the current breadth which
+        pass bending, shear and deflection, including selfweight.
+
+        Input permanent udl in [kN/m] excluding selfweight.
+        Shear is solved in closed form, bending iterates on k_h and deflection
+        takes a few Newton steps. A height is inf if no height passes the check.
+        Returns {"bending_UR", "shear_UR", "deflection_UR", "height"} where
+        height is the largest of them, or None for negative loads or factors.
+        '''
+        design_args = (load_duration, is_load_sharing, permanent_udl, imposed_udl,
+                       imposed_combination_factor, deflection_limit, True,
+                       permanent_load_factor, variable_load_factor, with_creep)
+        results = find_required_heights(self, design_args)
+        if results is not None:
+            results["height"] = max(results.values())
+        return results
+
+    def get_required_breadth(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True
+            ) -> dict:
+        '''Returns the smallest breadths in [mm] of the current height which
+        pass bending, shear and deflection, including selfweight.
+
+        Every check is linear in breadth and solved in closed form, see
+        get_required_height. Returns {"bending_UR", "shear_UR", "deflection_UR",
+        "breadth"}, or None for negative loads or factors.
+        '''
+        design_args = (load_duration, is_load_sharing, permanent_udl, imposed_udl,
+                       imposed_combination_factor, deflection_limit, True,
+                       permanent_load_factor, variable_load_factor, with_creep)
+        results = find_required_breadths(self, design_args)
+        if results is not None:
+            results["breadth"] = max(results.values())
+        return results
+
+    def get_auto_designed_timber_size_height(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            height_iteration = 5,
+            starting_height = 100,
+            max_height = 600,
+            search_method: str = "direct"
+            ) -> dict:
+        '''Auto designs timber beam size to smallest height for a given breadth.
+
+        Heights are taken from starting_height in steps of height_iteration.
+        search_method can be "direct", "linear" or "bisection":
+            direct jumps to the height from get_required_height and verifies it
+            linear steps up one height_iteration at a time
+            bisection brackets and bisects to the same height in O(log n) checks
+        Where LTB fails at the height passing the other checks direct continues
+        as bisection. Negative loads always fall back from direct to bisection.
+        If lateral torsional buckling governs and gets worse with height
+        the section with the least LTB utilisation is returned.
+        '''
+        self._check_search_method(search_method)
+        design_args = (load_duration, is_load_sharing, permanent_udl, imposed_udl,
+                       imposed_combination_factor, deflection_limit, is_restrained,
+                       permanent_load_factor, variable_load_factor, with_creep)
+
+        if search_method == "direct":
+            required_height = self._get_required_size(find_required_heights, design_args)
+            ur_results = self._bisect_height(design_args, height_iteration, starting_height, max_height,
+                                             required_height)
+        elif search_method == "bisection":
+            ur_results = self._bisect_height(design_args, height_iteration, starting_height, max_height)
+        else:
+            self.height = starting_height
+            ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+            while not self._passes_checks(ur_results):
+                previous_height, previous_ur_results = self.height, ur_results
+                self.height += height_iteration
+                if self.height > max_height:
+                    self.height = max_height
+                    ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+                    break
+                ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+                if self._is_ltb_getting_worse(previous_ur_results, ur_results):
+                    self._warn_ltb_getting_worse()
+                    self.height = previous_height
+                    ur_results = previous_ur_results
+                    break
+
+        results = {
+            "breadth": self.breadth,
+            "height": self.height,
+            }
+        results.update(ur_results)
+        if instrumentation.ENABLED:
+            self._record_auto_design("height", results)
+        return results
+
+    def get_auto_designed_timber_size_breadth(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            breadth_iteration = 5,
+            starting_breadth = 40,
+            max_breadth = 300,
+            search_method: str = "direct"
+            ) -> dict:
+        '''Auto designs timber beam size to smallest breadth for a given height.
+
+        Breadths are taken from starting_breadth in steps of breadth_iteration.
+        search_method can be "direct", "linear" or "bisection", see
+        get_auto_designed_timber_size_height.
+        '''
+        self._check_search_method(search_method)
+        design_args = (load_duration, is_load_sharing, permanent_udl, imposed_udl,
+                       imposed_combination_factor, deflection_limit, is_restrained,
+                       permanent_load_factor, variable_load_factor, with_creep)
+
+        if search_method == "direct":
+            required_breadth = self._get_required_size(find_required_breadths, design_args)
+            ur_results = self._bisect_breadth(design_args, breadth_iteration, starting_breadth, max_breadth,
+                                              required_breadth)
+        elif search_method == "bisection":
+            ur_results = self._bisect_breadth(design_args, breadth_iteration, starting_breadth, max_breadth)
+        else:
+            self.breadth = starting_breadth
+            ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+            while not self._passes_checks(ur_results):
+                self.breadth += breadth_iteration
+                if self.breadth > max_breadth:
+                    self.breadth = max_breadth
+                    ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+                    break
+                ur_results = self._find_utilisation_results_with_selfweight(*design_args)
+
+        results = {
+            "breadth": self.breadth,
+            "height": self.height,
+            }
+        results.update(ur_results)
+        if instrumentation.ENABLED:
+            self._record_auto_design("breadth", results)
+        return results
+
+    def get_pareto_optimal_sizes(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            breadths = None,
+            heights = None
+            ) -> dict:
+        '''Returns the passing sections of the breadth x height design space
+        which are Pareto optimal in volume, height and max utilisation,
+        i.e. no other passing section is as good in all three and better in one.
+
+        breadths and heights in [mm] default to 40 to 300 and 100 to 600 in steps
+        of 5mm, the ranges of the breadth and height sizers.
+        Input permanent udl in [kN/m] excluding selfweight.
+        The whole design space is checked in one vectorised pass.
+        Returns a dict of arrays, sorted by volume, of the breadth, height,
+        volume in [m^3], max_UR and utilisation ratios (NaN if not applicable).
+        '''
+        # numpy is only imported once the optimisers are used
+        from .section_optimiser import get_pareto_optimal_sizes
+        return get_pareto_optimal_sizes(
+            self,
+            (load_duration, is_load_sharing, permanent_udl, imposed_udl, imposed_combination_factor,
+             deflection_limit, is_restrained, permanent_load_factor, variable_load_factor, with_creep),
+            breadths,
+            heights)
+
+    def get_auto_designed_timber_size_min_cost(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            cost_function = None,
+            breadths = None,
+            heights = None
+            ) -> dict:
+        '''Auto designs timber beam size to the passing section of least cost
+        over the breadth x height design space.
+
+        cost_function(length, breadth, height, ur_results) is called once with
+        arrays of the design space and the batched utilisation results and must
+        return an array of costs. It defaults to the volume. Ties are broken by
+        the smaller height. See get_pareto_optimal_sizes for the design space.
+        If no section passes the section with the least max utilisation is returned.
+        '''
+        # numpy is only imported once the optimisers are used
+        from .section_optimiser import get_min_cost_section
+        design_args = (load_duration, is_load_sharing, permanent_udl, imposed_udl,
+                       imposed_combination_factor, deflection_limit, is_restrained,
+                       permanent_load_factor, variable_load_factor, with_creep)
+        self.breadth, self.height, cost = get_min_cost_section(self, design_args, cost_function,
+                                                                breadths, heights)
+
+        results = {
+            "breadth": self.breadth,
+            "height": self.height,
+            }
+        results.update(self._find_utilisation_results_with_selfweight(*design_args))
+        results["cost"] = cost
+        if instrumentation.ENABLED:
+            self._record_auto_design("min_cost", results)
+        return results
+
+    def _find_utilisation_results_with_selfweight(
+            self,
+            load_duration: str,
+            is_load_sharing: bool,
+            permanent_udl: float,
+            imposed_udl: float,
+            imposed_combination_factor: float,
+            deflection_limit: float,
+            is_restrained: bool = True,
+            permanent_load_factor: float = 1.35,
+            variable_load_factor: float = 1.5,
+            with_creep: bool = True,
+            ) -> dict:
+        '''Returns the utilisation results with the beam selfweight
+        added to the permanent udl.'''
+        if instrumentation.ENABLED:
+            instrumentation.record_count("auto_design/candidates")
+        selfweight = self.get_beam_selfweight_per_m()
+        permanent_udl_plus_swt = permanent_udl + selfweight
+        return self._find_utilisation_results(
+            load_duration,
+            is_load_sharing,
+            permanent_udl_plus_swt,
+            imposed_udl,
+            imposed_combination_factor,
+            deflection_limit,
+            is_restrained,
+            permanent_load_factor,
+            variable_load_factor,
+            with_creep
+            )
+
+    @staticmethod
+    def _passes_checks(ur_results: dict, excluded_checks: tuple = ()) -> bool:
+        '''Returns True if all applicable utilisation ratios are <= 1.
+        Checks which are not applicable are None and are ignored.'''
+        return all(result is None or result <= 1
+                   for check, result in ur_results.items()
+                   if check not in excluded_checks)
+
+    @classmethod
+    def _is_ltb_getting_worse(cls, previous_ur_results: dict, ur_results: dict) -> bool:
+        '''Returns True if LTB was the only failing check of the previous
+        section and its utilisation has increased.'''
+        previous_ltb_ur = previous_ur_results["LTB_UR"]
+        ltb_ur = ur_results["LTB_UR"]
+        if previous_ltb_ur is None or ltb_ur is None:
+            return False
+        return (cls._passes_checks(previous_ur_results, ("LTB_UR",))
+                and ltb_ur > previous_ltb_ur)
+
+    @classmethod
+    def _check_search_method(cls, search_method: str) -> None:
+        if search_method not in cls.VALID_SEARCH_METHODS:
+            raise ValueError(f"Search method '{search_method}' is invalid. " +
+                             f"Valid search methods: {cls.VALID_SEARCH_METHODS}.")
+
+    def _get_required_size(self, find_required_sizes, design_args: tuple) -> float:
+        '''Returns the size passing bending, shear and deflection from
+        find_required_sizes, or None if it gives no solution.'''
+        required_sizes = find_required_sizes(self, design_args)
+        if required_sizes is None:
+            return None
+        return max(required_sizes[check] for check in REQUIRED_SIZE_CHECKS)
+
+    @staticmethod
+    def _get_grid_index(size: float, starting_size: float, size_iteration: float, last_index: int) -> int:
+        '''Returns the index of the smallest size on the grid which is at
+        least size, or last_index + 1 if it is beyond the grid.'''
+        if isinf(size) or size > starting_size + last_index * size_iteration:
+            return last_index + 1
+        # relative tolerance so that rounding never skips a size at UR = 1
+        return max(0, ceil((size - starting_size) / size_iteration - 1e-9))
+
+    @staticmethod
+    def _bisect_first_index(low: int, high: int, predicate) -> int:
+        '''Returns the smallest index in [low, high] for which the monotone
+        predicate is True, or high + 1 if it is True for none of them.'''
+        while low <= high:
+            middle = (low + high) // 2
+            if predicate(middle):
+                high = middle - 1
+            else:
+                low = middle + 1
+        return low
+
+    def _bisect_height(self,
+                       design_args: tuple,
+                       height_iteration: float,
+                       starting_height: float,
+                       max_height: float,
+                       required_height: float = None
+                       ) -> dict:
+        '''Sets the smallest passing height on the height_iteration grid
+        and returns its utilisation results.
+
+        Bending, shear and deflection utilisations fall with height so they
+        are bisected directly, or if required_height is given the grid height
+        above it is verified and only stepped up if it fails. LTB can get worse with height, so if it fails at
+        the smallest height passing the other checks and also fails at the
+        largest height, a local LTB minimum is located by bisecting on the sign
+        of its change between neighbouring heights. LTB utilisation can have
+        more than one local minimum, in which case the failing section returned
+        may differ from the one the linear search stops at.
+        '''
+        evaluated = {}
+
+        def evaluate(index: int) -> dict:
+            if index not in evaluated:
+                self.height = starting_height + index * height_iteration
+                evaluated[index] = self._find_utilisation_results_with_selfweight(*design_args)
+            return evaluated[index]
+
+        def ltb_ur(index: int) -> float:
+            return evaluate(index)["LTB_UR"]
+
+        last_index = int((max_height - starting_height) // height_iteration)
+        if required_height is None:
+            first_index = self._bisect_first_index(
+                0, last_index, lambda index: self._passes_checks(evaluate(index), ("LTB_UR",)))
+        else:
+            first_index = self._get_grid_index(required_height, starting_height, height_iteration, last_index)
+            while first_index <= last_index and not self._passes_checks(evaluate(first_index), ("LTB_UR",)):
+                first_index += 1
+        if first_index <= last_index and not self._passes_checks(evaluate(first_index)):
+            if ltb_ur(last_index) <= 1:
+                ltb_min_index = last_index
+            else:
+                ltb_min_index = self._bisect_first_index(
+                    first_index, last_index - 1, lambda index: ltb_ur(index + 1) > ltb_ur(index))
+            if ltb_ur(ltb_min_index) <= 1:
+                first_index = self._bisect_first_index(
+                    first_index, ltb_min_index, lambda index: ltb_ur(index) <= 1)
+            elif ltb_min_index < last_index:
+                self._warn_ltb_getting_worse()
+                first_index = ltb_min_index
+            else:
+                first_index = last_index + 1
+
+        if first_index > last_index:
+            self.height = max_height
+            return self._find_utilisation_results_with_selfweight(*design_args)
+        ur_results = evaluate(first_index)
+        self.height = starting_height + first_index * height_iteration
+        return ur_results
+
+    def _bisect_breadth(self,
+                        design_args: tuple,
+                        breadth_iteration: float,
+                        starting_breadth: float,
+                        max_breadth: float,
+                        required_breadth: float = None
+                        ) -> dict:
+        '''Sets the smallest passing breadth on the breadth_iteration grid
+        and returns its utilisation results.
+
+        All checks improve with breadth so the grid is bisected directly.
+        If required_breadth is given the grid breadth above it is verified and
+        only LTB, which it does not cover, is bisected if it fails.
+        '''
+        evaluated = {}
+
+        def evaluate(index: int) -> dict:
+            if index not in evaluated:
+                self.breadth = starting_breadth + index * breadth_iteration
+                evaluated[index] = self._find_utilisation_results_with_selfweight(*design_args)
+            return evaluated[index]
+
+        last_index = int((max_breadth - starting_breadth) // breadth_iteration)
+        if required_breadth is None:
+            first_index = self._bisect_first_index(
+                0, last_index, lambda index: self._passes_checks(evaluate(index)))
+        else:
+            first_index = self._get_grid_index(required_breadth, starting_breadth, breadth_iteration, last_index)
+            while first_index <= last_index and not self._passes_checks(evaluate(first_index), ("LTB_UR",)):
+                first_index += 1
+            if first_index <= last_index and not self._passes_checks(evaluate(first_index)):
+                first_index = self._bisect_first_index(
+                    first_index + 1, last_index, lambda index: self._passes_checks(evaluate(index)))
+
+        if first_index > last_index:
+            self.breadth = max_breadth
+            return self._find_utilisation_results_with_selfweight(*design_args)
+        ur_results = evaluate(first_index)
+        self.breadth = starting_breadth + first_index * breadth_iteration
+        return ur_results
@@ -0,0 +1,274 @@
+'''Persistent, content addressed cache of auto-design results.
+
+Results are keyed on a SHA-256 hash of the canonical JSON of every design
+input: the design class, geometry, material, auto-design method and its
+arguments. An in-memory LRU tier sits in front of an optional SQLite file.
+
+Keys also include a digest of the material data, so edited or reloaded
+material data never hits old results. The SQLite file records a digest of
+the package source and section sizes and is emptied when the code changes.
+
+Usage:
+    cache = DesignCache("design_cache.sqlite")
+    results = cache.auto_design(design, "get_auto_designed_timber_size_list",
+                                "medium_term", True, 1.5, 2.0, 0.3, 16)
+'''
+import hashlib
+import inspect
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from threading import RLock
+from ._data import open_data_file
+from .material import load_material_data
+
+
+CACHE_FORMAT_VERSION = 1
+
+# data files whose contents the cached results depend on, as well as every module
+_DATA_FILES = ["section_size_data.json"]
+
+# section dimensions each auto-design method sets, whatever they were before
+_DESIGNED_DIMENSIONS = {
+    "get_auto_designed_timber_size_list": ("breadth", "height"),
+    "get_auto_designed_timber_size_height": ("height",),
+    "get_auto_designed_timber_size_breadth": ("breadth",),
+    "get_auto_designed_timber_size_min_cost": ("breadth", "height"),
+    "get_auto_designed_joist_size": ("breadth", "height"),
+    }
+
+_DIGEST_LOCK = RLock()
+_CODE_DIGEST = None
+_MATERIAL_DATA_DIGESTS = {}
+
+
+def get_code_digest() -> str:
+    '''Returns a digest of the source of every module in the package and the section size data.'''
+    global _CODE_DIGEST
+    if _CODE_DIGEST is None:
+        with _DIGEST_LOCK:
+            if _CODE_DIGEST is None:
+                from importlib import resources
+                digest = hashlib.sha256(str(CACHE_FORMAT_VERSION).encode())
+                modules = [path for path in resources.files(__package__).iterdir()
+                           if path.name.endswith(".py")]
+                for module in sorted(modules, key=lambda path: path.name):
+                    digest.update(module.name.encode())
+                    digest.update(module.read_bytes())
+                for file_name in _DATA_FILES:
+                    with open_data_file(file_name, "rb") as f:
+                        digest.update(file_name.encode())
+                        digest.update(f.read())
+                _CODE_DIGEST = digest.hexdigest()
+    return _CODE_DIGEST
+
+
+def get_material_data_digest(material_type: str) -> str:
+    '''Returns a digest of the loaded data of a material type.
+
+    The digest is recomputed only when the data is reloaded.'''
+    material_data = load_material_data(material_type)
+    cached = _MATERIAL_DATA_DIGESTS.get(material_type)
+    if cached is not None and cached[0] is material_data:
+        return cached[1]
+    data = {grade: dict(properties) for grade, properties in material_data.items()}
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    _MATERIAL_DATA_DIGESTS[material_type] = (material_data, digest)
+    return digest
+
+
+def _canonicalise(value):
+    '''Returns value as plain JSON types, with all numbers as floats so
+    that e.g. 4000 and 4000.0 give the same key.'''
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(key): _canonicalise(item) for key, item in value.items()}
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return _canonicalise(value.tolist())
+    if callable(value):
+        raise ValueError(f"Cannot cache a design with a callable argument: {value!r}.")
+    if hasattr(value, "__iter__"):  # lists, tuples and section catalogues
+        return [_canonicalise(item) for item in value]
+    raise ValueError(f"Cannot cache a design with argument of type {type(value).__name__}.")
+
+
+@lru_cache(maxsize=None)
+def _get_signature(design_class: type, method: str) -> inspect.Signature:
+    return inspect.signature(getattr(design_class, method))
+
+
+def get_design_key(design, method: str, args: tuple = (), kwargs: dict = None) -> str:
+    '''Returns the content address of an auto-design query.
+
+    The arguments are bound to the method's signature with its defaults, so
+    positional and keyword calls of the same query give the same key. The
+    breadth and height the method sets are left out, so a design which has
+    already been sized gives the same key again.
+    '''
+    material = design.material
+    bound_arguments = _get_signature(type(design), method).bind(design, *args, **(kwargs or {}))
+    bound_arguments.apply_defaults()
+    arguments = dict(bound_arguments.arguments)
+    del arguments["self"]
+    inputs = {
+        "class": type(design).__name__,
+        "method": method,
+        "length": design.length,
+        "breadth": design.breadth,
+        "height": design.height,
+        "effective_length": design.effective_length,
+        "floor_width": getattr(design, "floor_width", None),
+        "material_type": material.material_type,
+        "strength_grade": material.strength_grade,
+        "service_class": material.service_class,
+        "material_data": get_material_data_digest(material.material_type),
+        "arguments": arguments,
+        }
+    for dimension in _DESIGNED_DIMENSIONS.get(method, ()):
+        del inputs[dimension]
+    canonical = json.dumps(_canonicalise(inputs), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class DesignCache():
+    '''Two tier cache of auto-design results.
+
+    Input the SQLite file path, or None for an in-memory only cache, and the
+    maximum number of entries held in memory and on disk. The least recently
+    used entries are evicted from each tier when it is full.
+    '''
+    def __init__(self,
+                 file_path: str = None,
+                 max_memory_entries: int = 1024,
+                 max_disk_entries: int = 100000
+                 ):
+        if max_memory_entries < 0 or max_disk_entries < 0:
+            raise ValueError("Cache sizes must not be negative.")
+        self._lock = RLock()
+        self._memory = OrderedDict()
+        self._max_memory_entries = max_memory_entries
+        self._max_disk_entries = max_disk_entries
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._connection = None
+        if file_path is not None:
+            self._connection = sqlite3.connect(file_path, check_same_thread=False)
+            self._open_store()
+
+    def _open_store(self) -> None:
+        code_digest = get_code_digest()
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            row = self._connection.execute(
+                "SELECT value FROM metadata WHERE name = 'code_digest'").fetchone()
+            if row is None or row[0] != code_digest:
+                self._connection.execute("DELETE FROM results")
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES ('code_digest', ?)", (code_digest,))
+
+    def get(self, key: str):
+        '''Returns a copy of the cached results of key or None.'''
+        with self._lock:
+            results = self._memory.get(key)
+            if results is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return dict(results)
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    with self._connection:
+                        self._connection.execute(
+                            "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+                    results = json.loads(row[0])
+                    self._put_memory(key, results)
+                    self._stats["disk_hits"] += 1
+                    return dict(results)
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, results: dict) -> None:
+        '''Caches a copy of results, which must be JSON serialisable.'''
+        results = dict(results)
+        with self._lock:
+            self._put_memory(key, results)
+            if self._connection is not None and self._max_disk_entries:
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                        (key, json.dumps(results), time.time()))
+                    count = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+                    if count > self._max_disk_entries:
+                        self._connection.execute(
+                            "DELETE FROM results WHERE key IN "
+                            "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                            (count - self._max_disk_entries,))
+
+    def _put_memory(self, key: str, results: dict) -> None:
+        if not self._max_memory_entries:
+            return
+        self._memory[key] = results
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def auto_design(self, design, method: str, *args, **kwargs) -> dict:
+        '''Returns design.<method>(*args, **kwargs), from the cache if the same
+        query has been run before.
+
+        method must be one of the get_auto_designed_* methods of the design.
+        As on a cache miss, the design's breadth and height are set to the
+        designed size.
+        '''
+        if not method.startswith("get_auto_designed_") or not hasattr(design, method):
+            raise ValueError(f"Method, {method}, is not an auto-design method of "
+                             f"{type(design).__name__}.")
+        key = get_design_key(design, method, args, kwargs)
+        results = self.get(key)
+        if results is None:
+            results = getattr(design, method)(*args, **kwargs)
+            self.put(key, results)
+        else:
+            design.breadth = results["breadth"]
+            design.height = results["height"]
+        return results
+
+    def clear(self) -> None:
+        '''Removes every entry from both tiers.'''
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("DELETE FROM results")
+
+    def get_stats(self) -> dict:
+        '''Returns the hit and miss counts and the number of entries in each tier.'''
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            if self._connection is not None:
+                stats["disk_entries"] = self._connection.execute(
+                    "SELECT COUNT(*) FROM results").fetchone()[0]
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __enter__(self) -> "DesignCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,264 @@
+'''Asyncio design server which coalesces concurrent requests into batches.
+
+Requests are member schedule rows, see timber.schedule. Rows arriving within
+batch_window seconds of each other are collected into one batch, identical
+members in a batch are designed once, and the batch is designed in a worker
+pool off the event loop. Each caller's future is then resolved with its own
+result row.
+
+The server speaks JSON lines over TCP: send one member row object per line
+and receive one result row per line, in completion order. Give each row an
+id to match results to requests.
+
+Usage:
+    python -m timber.design_server --port 8765 --workers 4
+    printf '{"id": "B1", "length": 4000, "permanent_udl": 1.5, "imposed_udl": 2, '\\
+           '"deflection_limit_ratio": 250}\\n' | nc localhost 8765
+'''
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .schedule import RESULT_FIELDS, design_schedule_rows
+
+
+class DesignBatcher():
+    '''Coalesces concurrent design requests into batches for a worker pool.
+
+    Input the number of worker processes (default the number of CPUs, 1 runs
+    batches in a single background thread), the seconds to wait for more
+    requests after the first of a batch, the max batch size, the max number
+    of batches being designed at once and the max number of requests waiting
+    for a batch (default 4 batches). Once that many requests are waiting new
+    requests wait for room, so a burst is held back at its callers instead of
+    piling up in memory.
+    Use as an async context manager, or call close() when finished.
+    '''
+    def __init__(self,
+                 workers: int = None,
+                 batch_window: float = 0.002,
+                 max_batch_size: int = 256,
+                 max_batches_in_flight: int = None,
+                 max_pending_requests: int = None
+                 ):
+        if batch_window < 0:
+            raise ValueError(f"Batch window, {batch_window}s, must not be negative.")
+        if max_batch_size < 1:
+            raise ValueError(f"Max batch size, {max_batch_size}, must be at least 1.")
+        max_pending_requests = max_pending_requests or 4 * max_batch_size
+        if max_pending_requests < 1:
+            raise ValueError(f"Max pending requests, {max_pending_requests}, must be at least 1.")
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            # forked workers would inherit, and hold open, the client sockets
+            start_method = ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                            else "spawn")
+            self._executor = ProcessPoolExecutor(max_workers=workers,
+                                                 mp_context=multiprocessing.get_context(start_method))
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._batch_slots = asyncio.Semaphore(max_batches_in_flight or 2 * workers)
+        self._pending = asyncio.Queue(maxsize=max_pending_requests)
+        self._collector_task = None
+        self._is_closed = False
+        self._batch_tasks = set()
+        self._stats = {"requests": 0, "batches": 0, "designed_members": 0}
+
+    async def submit(self, row: dict) -> asyncio.Future:
+        '''Queues a member row, waiting while the queue is full, and returns
+        the future of its result row.'''
+        if self._is_closed:
+            raise RuntimeError("The design batcher is closed.")
+        if self._collector_task is None:
+            self._collector_task = asyncio.get_running_loop().create_task(self._collect_batches())
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((row, future))
+        self._stats["requests"] += 1
+        return future
+
+    async def design(self, row: dict) -> dict:
+        '''Returns the result row of a member row, see timber.schedule.design_schedule_row.'''
+        return await (await self.submit(row))
+
+    async def _collect_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        is_closing = False
+        while not is_closing:
+            request = await self._pending.get()
+            if request is None:  # queued by close()
+                break
+            batch = [request]
+            deadline = loop.time() + self._batch_window
+            while len(batch) < self._max_batch_size:
+                if self._pending.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(self._pending.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    request = self._pending.get_nowait()
+                if request is None:
+                    is_closing = True
+                    break
+                batch.append(request)
+            # requests wait in the queue, not in batches, while every slot is busy
+            await self._batch_slots.acquire()
+            task = loop.create_task(self._design_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _design_batch(self, batch: list) -> None:
+        # identical members, apart from their id, are designed once
+        unique_rows = {}
+        keys = []
+        for row, _ in batch:
+            try:
+                key = json.dumps({field: value for field, value in row.items() if field != "id"},
+                                 sort_keys=True)
+            except (TypeError, AttributeError):
+                key = object()  # not a JSON object, designed on its own to report the error
+            keys.append(key)
+            unique_rows.setdefault(key, row)
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, design_schedule_rows, list(unique_rows.values()))
+            except Exception:
+                # rerun each member on its own so only the failing callers see the error
+                results = []
+                for row in unique_rows.values():
+                    try:
+                        results.extend(await loop.run_in_executor(
+                            self._executor, design_schedule_rows, [row]))
+                    except Exception as error:
+                        results.append(error)
+        finally:
+            self._batch_slots.release()
+        self._stats["batches"] += 1
+        self._stats["designed_members"] += sum(not isinstance(result, Exception) for result in results)
+        results = dict(zip(unique_rows, results))
+        for key, (row, future) in zip(keys, batch):
+            if future.done():  # the caller was cancelled
+                continue
+            if isinstance(results[key], Exception):
+                future.set_exception(results[key])
+                continue
+            result = dict(results[key])
+            if isinstance(row, dict):
+                result["id"] = row.get("id", "")
+            future.set_result(result)
+
+    def get_stats(self) -> dict:
+        '''Returns the number of requests, batches and members actually designed.'''
+        return dict(self._stats)
+
+    async def close(self) -> None:
+        '''Designs any pending requests and shuts down the worker pool.'''
+        if not self._is_closed and self._collector_task is not None:
+            self._is_closed = True
+            await self._pending.put(None)
+            await self._collector_task
+            # requests which were waiting for room when the batcher closed
+            while not self._pending.empty():
+                _, future = self._pending.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("The design batcher is closed."))
+        self._is_closed = True
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "DesignBatcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+async def _handle_connection(batcher: DesignBatcher, reader, writer) -> None:
+    write_lock = asyncio.Lock()
+    request_tasks = set()
+
+    async def respond(row: dict, result_future) -> None:
+        if result_future is None:
+            result = row
+        else:
+            try:
+                result = await result_future
+            except Exception as error:  # reported to this caller only
+                result = dict.fromkeys(RESULT_FIELDS, "")
+                result["id"] = row.get("id", "")
+                result["error"] = f"Design failed: {error}"
+        async with write_lock:
+            writer.write(json.dumps(result).encode() + b"\n")
+            await writer.drain()
+
+    try:
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("Requests must be JSON objects.")
+            except ValueError as error:
+                row = dict.fromkeys(RESULT_FIELDS, "")
+                row["error"] = f"Invalid request: {error}"
+                result_future = None
+            else:
+                # waits while the batcher is full, which stops reading from the client
+                result_future = await batcher.submit(row)
+            task = asyncio.create_task(respond(row, result_future))
+            request_tasks.add(task)
+            task.add_done_callback(request_tasks.discard)
+        if request_tasks:
+            await asyncio.gather(*request_tasks)
+    except ConnectionError:
+        pass
+    finally:
+        for task in request_tasks:
+            task.cancel()
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1",
+                port: int = 8765,
+                workers: int = None,
+                batch_window: float = 0.002,
+                max_batch_size: int = 256
+                ) -> None:
+    '''Runs the JSON lines design server until cancelled.'''
+    async with DesignBatcher(workers, batch_window, max_batch_size) as batcher:
+        server = await asyncio.start_server(
+            lambda reader, writer: _handle_connection(batcher, reader, writer), host, port)
+        async with server:
+            print(f"Serving timber designs on {host}:{port}")
+            await server.serve_forever()
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve timber member designs over JSON lines.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes, defaults to the number of CPUs")
+    parser.add_argument("--batch-window", type=float, default=0.002,
+                        help="seconds to wait for more requests before designing a batch")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.batch_window, args.max_batch_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
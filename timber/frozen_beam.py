@@ -0,0 +1,165 @@
+from functools import lru_cache
+from .material import TimberMaterial, get_material_data_generation, get_shared_material
+from .design import TimberDesign
+
+
+class FrozenTimberBeam():
+    '''Immutable, hashable description of a timber beam.
+
+    Holds the geometry, a reference to a shared material by type, grade and
+    service class, and the effective length factor. There is no per-instance
+    __dict__ and no validating property setters, so instances are cheap to
+    create, pickle and use as dictionary or cache keys.
+    '''
+    __slots__ = ("length", "breadth", "height", "material_type",
+                 "strength_grade", "service_class", "effective_length_factor")
+
+    def __init__(self,
+                 length: float,
+                 breadth: float,
+                 height: float,
+                 material_type: str = "softwood",
+                 strength_grade: str = "C24",
+                 service_class: int = 1,
+                 effective_length_factor: float = 1.0
+                 ):
+        if length <= 0 or breadth <= 0 or height <= 0:
+            raise ValueError(f"Beam dimensions, {length}x{breadth}x{height}mm, must be positive.")
+        if effective_length_factor <= 0:
+            raise ValueError(f"Effective length factor, {effective_length_factor}, "+
+                             " must be positive.")
+        material_type = material_type.strip().lower()
+        if not TimberMaterial.is_valid_material_type(material_type):
+            raise ValueError(f"Material type, {material_type}, not valid. "+
+                             f"Valid material types: {TimberMaterial.VALID_MATERIALS}.")
+        if not TimberMaterial.is_valid_service_class(service_class):
+            raise ValueError(f"Service class, {service_class}, is not valid. " +
+                             f"Valid service classes: {TimberMaterial.VALID_SERVICE_CLASSES}.")
+        set_attribute = object.__setattr__
+        set_attribute(self, "length", length)
+        set_attribute(self, "breadth", breadth)
+        set_attribute(self, "height", height)
+        set_attribute(self, "material_type", material_type)
+        set_attribute(self, "strength_grade", strength_grade)
+        set_attribute(self, "service_class", service_class)
+        set_attribute(self, "effective_length_factor", effective_length_factor)
+
+    @classmethod
+    def from_timber_beam(cls, beam) -> "FrozenTimberBeam":
+        '''Returns the frozen equivalent of a TimberBeam (or subclass) instance.'''
+        return cls(beam.length,
+                   beam.breadth,
+                   beam.height,
+                   beam.material.material_type,
+                   beam.material.strength_grade,
+                   beam.material.service_class,
+                   beam.effective_length / beam.length)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable, use replace() instead.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def _key(self) -> tuple:
+        return (self.length, self.breadth, self.height, self.material_type,
+                self.strength_grade, self.service_class, self.effective_length_factor)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __reduce__(self):
+        return (type(self), self._key())
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(length={self.length}, breadth={self.breadth}, "
+                f"height={self.height}, material_type='{self.material_type}', "
+                f"strength_grade='{self.strength_grade}', service_class={self.service_class}, "
+                f"effective_length_factor={self.effective_length_factor})")
+
+    def replace(self, **changes) -> "FrozenTimberBeam":
+        '''Returns a copy with the given attributes changed.'''
+        values = dict(zip(self.__slots__, self._key()))
+        values.update(changes)
+        return type(self)(**values)
+
+    @property
+    def material(self) -> TimberMaterial:
+        '''Returns the shared, read-only material of the beam.'''
+        return get_shared_material(self.material_type, self.strength_grade, self.service_class)
+
+    @property
+    def effective_length(self) -> float:
+        '''Returns effective length in [mm].'''
+        return self.length * self.effective_length_factor
+
+    @property
+    def area(self) -> float:
+        return self.breadth * self.height
+
+    def to_timber_design(self) -> TimberDesign:
+        '''Returns a new, mutable TimberDesign of this beam.'''
+        return TimberDesign.from_frozen_beam(self)
+
+
+@lru_cache(maxsize=1024)
+def _get_design(beam: FrozenTimberBeam, material_data_generation: int) -> TimberDesign:
+    '''Returns the TimberDesign of a frozen beam, reused so its load
+    independent derived values are only evaluated once per beam.'''
+    return TimberDesign.from_frozen_beam(beam)
+
+
+@lru_cache(maxsize=4096)
+def _find_utilisation_results_cached(beam: FrozenTimberBeam, material_data_generation: int, *args) -> dict:
+    return _get_design(beam, material_data_generation)._find_utilisation_results(*args)
+
+
+def find_utilisation_results(
+        beam,
+        load_duration: str,
+        is_load_sharing: bool,
+        permanent_udl: float,
+        imposed_udl: float,
+        imposed_combination_factor: float,
+        deflection_limit: float,
+        is_restrained: bool = True,
+        permanent_load_factor: float = 1.35,
+        variable_load_factor: float = 1.5,
+        with_creep: bool = True,
+        ) -> dict:
+    '''Returns TimberDesign._find_utilisation_results for a FrozenTimberBeam
+    or a TimberDesign.
+
+    Frozen beams are evaluated by a TimberDesign of the beam and the results
+    are memoized on the beam, the design inputs and the material data
+    generation, so reload_material_data invalidates them. A new dict is
+    returned on every call so callers may modify it. TimberDesign instances
+    are mutable and are evaluated directly.
+    '''
+    args = (load_duration,
+            is_load_sharing,
+            permanent_udl,
+            imposed_udl,
+            imposed_combination_factor,
+            deflection_limit,
+            is_restrained,
+            permanent_load_factor,
+            variable_load_factor,
+            with_creep)
+    if isinstance(beam, TimberDesign):
+        return beam._find_utilisation_results(*args)
+    return dict(_find_utilisation_results_cached(
+        beam,
+        get_material_data_generation(),
+        *args))
+
+
+def clear_utilisation_results_cache() -> None:
+    '''Clears the memoized results and designs.'''
+    _find_utilisation_results_cached.cache_clear()
+    _get_design.cache_clear()
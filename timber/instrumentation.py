@@ -0,0 +1,132 @@
+'''Opt-in instrumentation of design checks, auto-design runs and material lookups.
+
+Instrumentation is off unless a collector or observer is active, in which
+case ENABLED is True. Instrumented code only checks ENABLED, so the cost
+when disabled is a single attribute lookup.
+
+Collectors only see the work done in the context they were entered in, so
+designs run concurrently in other threads do not mix into their summary.
+Observers see every event.
+
+Usage:
+    from timber import instrumentation
+
+    with instrumentation.collect() as summary:
+        design.get_auto_designed_timber_size_height(...)
+    print(summary)
+
+    instrumentation.add_observer(lambda event, data: log.info(event, data))
+'''
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import RLock
+from time import perf_counter
+
+
+ENABLED = False
+
+_LOCK = RLock()
+# summaries collecting in the current context, innermost last
+_COLLECTORS = ContextVar("timber_instrumentation_collectors", default=())
+_ACTIVE_COLLECTOR_COUNT = 0
+_OBSERVERS = []
+
+
+class InstrumentationSummary():
+    '''Counters and timers collected over a block of work.'''
+    def __init__(self):
+        self.counters = Counter()
+        self.timers = {}
+
+    def _add_time(self, name: str, seconds: float) -> None:
+        count, total = self.timers.get(name, (0, 0.0))
+        self.timers[name] = (count + 1, total + seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "timers": {name: {"count": count, "total_s": total}
+                       for name, (count, total) in self.timers.items()},
+            }
+
+    def __str__(self) -> str:
+        lines = ["Counters:"]
+        lines += [f"    {name}: {count}" for name, count in sorted(self.counters.items())]
+        lines.append("Timers:")
+        lines += [f"    {name}: {count} calls, {total * 1000:.3f} ms total"
+                  for name, (count, total) in sorted(self.timers.items())]
+        return "\n".join(lines)
+
+
+def _update_enabled() -> None:
+    global ENABLED
+    ENABLED = bool(_ACTIVE_COLLECTOR_COUNT or _OBSERVERS)
+
+
+def add_observer(callback) -> None:
+    '''Registers callback(event: str, data: dict) to be called for every event.'''
+    with _LOCK:
+        _OBSERVERS.append(callback)
+        _update_enabled()
+
+
+def remove_observer(callback) -> None:
+    with _LOCK:
+        _OBSERVERS.remove(callback)
+        _update_enabled()
+
+
+@contextmanager
+def collect():
+    '''Enables instrumentation for the block and yields the summary collecting it.
+    Collectors can be nested, each one collects everything in its block which
+    runs in the current thread or asyncio task.'''
+    global _ACTIVE_COLLECTOR_COUNT
+    summary = InstrumentationSummary()
+    token = _COLLECTORS.set(_COLLECTORS.get() + (summary,))
+    with _LOCK:
+        _ACTIVE_COLLECTOR_COUNT += 1
+        _update_enabled()
+    try:
+        yield summary
+    finally:
+        _COLLECTORS.reset(token)
+        with _LOCK:
+            _ACTIVE_COLLECTOR_COUNT -= 1
+            _update_enabled()
+
+
+def record_count(name: str, count: int = 1) -> None:
+    summaries = _COLLECTORS.get()
+    if summaries:
+        with _LOCK:
+            for summary in summaries:
+                summary.counters[name] += count
+
+
+def record_time(name: str, seconds: float) -> None:
+    summaries = _COLLECTORS.get()
+    if summaries:
+        with _LOCK:
+            for summary in summaries:
+                summary._add_time(name, seconds)
+
+
+@contextmanager
+def timer(name: str):
+    '''Records the time taken by the block under name.'''
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record_time(name, perf_counter() - start)
+
+
+def emit(event: str, **data) -> None:
+    '''Counts the event and passes it to the observers.'''
+    record_count(f"event/{event}")
+    with _LOCK:
+        observers = list(_OBSERVERS)
+    for callback in observers:
+        callback(event, data)
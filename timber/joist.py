@@ -0,0 +1,451 @@
+from math import sqrt, pi, log
+from . import instrumentation
+from .material import get_shared_material
+from .design import TimberDesign
+from .section_catalogue import TimberSectionCatalogue
+
+
+class TimberJoist(TimberDesign):
+
+    ALLOWABLE_SOFTWOOD_GRADES = ["C16", "C24"]
+    MIN_FUNDAMENTAL_FREQUENCY = 8
+
+    def __init__(self,
+                 joist_length: float,
+                 floor_width: float,
+                 breadth: float,
+                 height: float,
+                 softwood_grade: str = "C24",
+                 ):
+        if softwood_grade not in self.ALLOWABLE_SOFTWOOD_GRADES:
+            raise ValueError(f"Softwood grade not supported: '{softwood_grade}'. "+
+                             f"Allowable softwood grades: {self.ALLOWABLE_SOFTWOOD_GRADES}")
+        super().__init__(
+            joist_length,
+            breadth,
+            height,
+            get_shared_material("softwood", softwood_grade, 1)
+            )
+        self._floor_width = None
+        self.floor_width = floor_width
+
+    @property
+    def floor_width(self) -> float:
+        '''Returns the floor width in [mm].'''
+        return self._floor_width
+
+    @floor_width.setter
+    def floor_width(self, new_floor_width: float) -> None:
+        '''Input floor width in [mm]'''
+        if new_floor_width <= 0:
+            raise ValueError(f"Floor width, {new_floor_width}mm, must be positive.")
+        self._floor_width = new_floor_width
+
+    def get_constant_for_unit_impulse_velocity(self) -> float:
+        '''Returns the limiting value of 'b' used to check
+        the unit impulse velocity response criterion.
+        
+        Ref: EC5 Eq (7.4) and Table NA.6
+        '''
+        a_limit = self.get_deflection_limit_for_1kn_point_load()
+        return 180 - 60*a_limit if a_limit <= 1 else 160 - 40*a_limit
+
+    def get_deflection_limit_for_1kn_point_load(self) -> float:
+        '''Returns the limiting value of 'a' used to check
+        the instanteous vertical deflection criterion.
+        
+        'a' is the deflection limit in [mm] for the joist under a 1kN point load.
+        'a' is also used to find limiting value of 'b'.
+        Ref: EC5 EC5 Eq (7.3) and Table NA.6
+        '''
+        return 1.8 if self.length <= 4000 else 16500 / self.length**1.1
+
+    def get_fundamental_frequency(self,
+                                  joist_stiffness_per_metre: float,
+                                  mass_of_floor_per_unit_area: float
+                                  ) -> float:
+        '''Returns the fundamental frequency in units of [Hz].
+
+        Input:
+            mass of floor per unit area in units [kg/m^2].
+            joist stiffness per metre in units [Nmm^2/m].
+        
+        The mass should include the selfweight of the joist, floor board and plasterboard.
+        The stiffness should be the flexural stiffness of the joist only (EI) / joist spacing.
+        '''
+        joist_length = self.length / 10**3
+        joist_stiffness_per_metre = joist_stiffness_per_metre / 10**6
+        return (pi / (2 * joist_length**2)) * sqrt(joist_stiffness_per_metre / mass_of_floor_per_unit_area)
+
+    def get_impulse_velocity_limit(self,
+                                   fundamental_frequency: float,
+                                   modal_damping_ratio: float
+                                   ) -> float:
+        '''Returns the limit for the unit impulse velocity criterion.'''
+        b_limit = self.get_constant_for_unit_impulse_velocity()
+        return b_limit**(fundamental_frequency*modal_damping_ratio - 1)
+
+    def get_impulse_velocity_response(self,
+                                      n_40: float,
+                                      mass_of_floor_per_unit_area: float,
+                                      ) -> float:
+        '''Returns the impulse velocity reponse, Nu, in units [m/Ns^2].
+        
+        i.e. the maximum initial value of the vertical floor vibration velocity (in m/s)
+        caused by an ideal unit impulse (1 Ns) applied at the point of the
+        floor giving maximum response. Components above 40 Hz may be disregarded.
+
+        Input:
+            mass of floor per unit area in units [kg/m^2].
+            The mass should include the selfweight of the joist, floor board and plasterboard.
+        '''
+        floor_width = self.floor_width / 10**3
+        floor_span = self.length / 10**3
+        return (4 * (0.4 + 0.6 * n_40)) / (mass_of_floor_per_unit_area * floor_width * floor_span + 200)
+
+    def get_instanteous_deflection_under_point_load(self,
+                                                    k_dist: float,
+                                                    k_amp: float,
+                                                    equivalent_length: float,
+                                                    joist_stiffness: float
+                                                    ) -> float:
+        return (1000 * k_dist * equivalent_length**3 * k_amp) / (48 * joist_stiffness)
+    
+    def get_number_of_first_order_modes(self,
+                                        mass_of_floor_per_unit_area: float,
+                                        floor_stiffness_per_metre: float,
+                                        joist_stiffness_per_metre: float
+                                        ) -> float:
+        '''Returns the number of first order modes, n_40, upto 40 Hz.
+        
+        Input:
+            mass of floor per unit area in units [kg/m^2].
+            joist stiffness per metre in units [Nmm^2/m].
+            floor stiffness per metre in units [Nmm^2/m].
+
+        The floor stiffness is the floor plate stiffness in an axis perpendicular to
+        the axis of the joist. It should include the decking and may the plasterboard.
+        For open-webbed joists with transverse stiffnesses these may be included.
+
+        Ref: EC5 Eq (7.7) and NA.2.7.2
+        '''
+        floor_width = self.floor_width / 10**3
+        floor_span = self.length / 10**3
+        fundamental_frequency = self.get_fundamental_frequency(joist_stiffness_per_metre, mass_of_floor_per_unit_area)
+        floor_stiffness_per_metre = floor_stiffness_per_metre / 10**6
+        joist_stiffness_per_metre = joist_stiffness_per_metre / 10**6
+        return (((40 / fundamental_frequency)**2 - 1)
+                * (floor_width / floor_span)**4
+                * (joist_stiffness_per_metre / floor_stiffness_per_metre))**0.25
+
+    def get_k_dist(self,
+                   floor_stiffness_per_metre: float,
+                   joist_spacing: float = 400,
+                   is_strutted: bool = True
+                   ) -> float:
+        '''Returns k_dist used for finding the instantaneous deflection under variable load.
+        
+        Input:
+            joist spacing in [mm].
+            floor stiffness per metre in units [Nmm^2/m].
+
+        The floor stiffness is the floor plate stiffness in an axis perpendicular to
+        the axis of the joist. It should include the decking and may the plasterboard.
+        For open-webbed joists with transverse stiffnesses these may be included.
+
+        Ref: EC5 NA.2.7.2
+        '''
+        k_strut = self.material.get_k_strut(is_strutted)
+        return max(0.3,
+                   k_strut * (0.38 - 0.08 * log((14 * floor_stiffness_per_metre) / joist_spacing**4))
+                   )
+
+    @staticmethod
+    def get_k_amp(joist_type_index: int = 0):
+        '''Returns k_amp.
+        
+        k_amp is an amplification factor to account for shear deflections
+        in the case of solid timber and glued thin-webbed joists or joint
+        slip in the case of mechanically-jointed floor trusses.
+
+        Input joist_type_index:
+            0, for solid timber joists
+            1, for glued thin-webbed joists
+            2, for mechanically jointed floor trusses
+        '''
+        if joist_type_index == 0:
+            k_amp = 1.05
+        elif joist_type_index == 1:
+            k_amp = 1.2
+        elif joist_type_index == 2:
+            k_amp = 1.3
+        else:
+            raise ValueError(f"Incorrect joist type index :'{joist_type_index}'. "+
+                             "Supported joist type indices: 0, for solid timber joists, "+
+                             "1, for glued thin-webbed joists, "+
+                             "2, for mechanically jointed floor trusses.")
+        return k_amp
+
+    def get_max_trimmer_span(self,
+                             span_of_joists_on_to_trimmer: float,
+                             ) -> float:
+        '''Returns the max span of the doubled up trimmer joist.
+        
+        The breadth is for the single trimmer so the total breadth
+        is twice this value as they must be doubled up.
+        '''
+        coefficient_for_grade = 1.075 if self.material.strength_grade == "C24" else 1
+        return (0.165
+                * (-0.308 * span_of_joists_on_to_trimmer / 1000 + 3.38)
+                * (0.0214 * self.breadth + 1.12)
+                * (0.0149 * self.height - 0.073)
+                * 1000
+                * coefficient_for_grade
+                )
+
+    def get_max_trimming_joist_span(self,
+                                    span_of_trimmed_joists_onto_trimmer: float,
+                                    span_of_supported_trimmer_beam: float,
+                                    ) -> float:
+        '''Returns the max span of the doubled up trimming joist which supports a trimmer.
+        
+        The breadth is for the single trimming joist so the total breadth
+        is twice this value as they must be doubled up.
+        '''
+        coefficient_for_grade = 1.075 if self.material.strength_grade == "C24" else 1
+        return (0.032
+                * (-0.31 * span_of_supported_trimmer_beam / 1000 + 3.8)
+                * (-1.52 * span_of_trimmed_joists_onto_trimmer / self.length + 3.93)
+                * (0.022 * self.breadth + 1.79)
+                * (0.0196 * self.height - 0.16)
+                * 1000
+                * coefficient_for_grade
+                )
+
+    def get_floor_utilisation_results(self,
+                                      joist_spacing: float,
+                                      dead_load: float,
+                                      imposed_load: float,
+                                      floor_stiffness_per_metre: float,
+                                      modal_damping_ratio: float = 0.02,
+                                      is_strutted: bool = False,
+                                      joist_type_index: int = 0,
+                                      imposed_combination_factor: float = 0.3,
+                                      deflection_limit: float = None,
+                                      load_duration: str = "medium_term"
+                                      ) -> dict:
+        '''Returns the utilisation ratios of a floor joist, including the
+        EC5 7.3 floor vibration criteria.
+
+        Input:
+            joist spacing in [mm].
+            dead and imposed floor loads in [kN/m^2] excluding joist selfweight.
+            floor stiffness per metre in units [Nmm^2/m].
+            deflection limit in [mm], defaults to the lesser of 0.003 x span and 14mm.
+
+        Joists are load sharing and restrained by the floor. The floor mass is
+        taken from the dead load plus joist selfweight. The fundamental frequency
+        utilisation is the minimum frequency of 8 Hz over the actual frequency.
+        '''
+        if deflection_limit is None:
+            deflection_limit = min(0.003 * self.length, 14)
+        spacing = joist_spacing / 1000
+        ur_results = self._find_utilisation_results_with_selfweight(
+            load_duration,
+            True,
+            dead_load * spacing,
+            imposed_load * spacing,
+            imposed_combination_factor,
+            deflection_limit,
+            True
+            )
+
+        joist_stiffness = self.material.material_properties["E_0_mean"] * self.get_second_moment_of_area(True)
+        joist_stiffness_per_metre = joist_stiffness / spacing
+        mass_of_floor_per_unit_area = (dead_load + self.get_beam_selfweight_per_m() / spacing) * 1000 / 9.81
+
+        k_dist = self.get_k_dist(floor_stiffness_per_metre, joist_spacing, is_strutted)
+        k_amp = self.get_k_amp(joist_type_index)
+        point_load_deflection = self.get_instanteous_deflection_under_point_load(
+            k_dist, k_amp, self.length, joist_stiffness)
+
+        fundamental_frequency = self.get_fundamental_frequency(joist_stiffness_per_metre,
+                                                               mass_of_floor_per_unit_area)
+        if fundamental_frequency < 40:
+            n_40 = self.get_number_of_first_order_modes(mass_of_floor_per_unit_area,
+                                                        floor_stiffness_per_metre,
+                                                        joist_stiffness_per_metre)
+        else:  # no first order modes below 40 Hz
+            n_40 = 0
+        impulse_velocity = self.get_impulse_velocity_response(n_40, mass_of_floor_per_unit_area)
+        impulse_velocity_limit = self.get_impulse_velocity_limit(fundamental_frequency, modal_damping_ratio)
+
+        ur_results["point_load_deflection_UR"] = (point_load_deflection
+                                                  / self.get_deflection_limit_for_1kn_point_load())
+        ur_results["frequency_UR"] = self.MIN_FUNDAMENTAL_FREQUENCY / fundamental_frequency
+        ur_results["impulse_velocity_UR"] = impulse_velocity / impulse_velocity_limit
+        return ur_results
+
+    def get_max_span(self,
+                     joist_spacing: float,
+                     dead_load: float,
+                     imposed_load: float,
+                     floor_stiffness_per_metre: float,
+                     modal_damping_ratio: float = 0.02,
+                     is_strutted: bool = False,
+                     span_iteration: float = 10,
+                     min_span: float = 1000,
+                     max_span: float = 8000
+                     ) -> float:
+        '''Returns the max span in [mm], on the span_iteration grid, for which
+        all floor utilisation ratios pass, or 0 if even min_span fails.
+
+        Utilisations increase with span so the span grid is bisected, and the
+        span found is checked to pass, stepping down the grid if it does not.
+        The joist length is left unchanged.
+        See get_floor_utilisation_results for the inputs.
+        '''
+        length = self.length
+
+        def fails(index: int) -> bool:
+            self.length = min_span + index * span_iteration
+            ur_results = self.get_floor_utilisation_results(joist_spacing,
+                                                            dead_load,
+                                                            imposed_load,
+                                                            floor_stiffness_per_metre,
+                                                            modal_damping_ratio,
+                                                            is_strutted)
+            return not self._passes_checks(ur_results)
+
+        try:
+            last_index = int((max_span - min_span) // span_iteration)
+            span_index = self._bisect_first_index(0, last_index, fails) - 1
+            # guards against a check which is not monotone in span
+            while span_index >= 0 and fails(span_index):
+                span_index -= 1
+        finally:
+            self.length = length
+        if span_index < 0:
+            return 0
+        return min_span + span_index * span_iteration
+
+    def get_auto_designed_joist_size(self,
+                                     joist_spacing,
+                                     dead_load: float,
+                                     imposed_load: float,
+                                     floor_stiffness_per_metre: float,
+                                     modal_damping_ratio: float = 0.02,
+                                     is_strutted: bool = False,
+                                     joist_type_index: int = 0,
+                                     imposed_combination_factor: float = 0.3,
+                                     deflection_limit: float = None,
+                                     load_duration: str = "medium_term",
+                                     section_catalogue: TimberSectionCatalogue = None
+                                     ) -> dict:
+        '''Auto designs the joist to the first section in the catalogue which
+        passes all of get_floor_utilisation_results, i.e. strength, deflection,
+        the 1kN point load deflection, fundamental frequency and unit impulse
+        velocity.
+
+        joist_spacing in [mm] can be a single spacing or a sequence of spacings,
+        in which case the largest spacing which passes for the smallest section
+        is returned. See get_floor_utilisation_results for the other inputs.
+
+        Sections which cannot pass bending, shear, deflection, the point load
+        deflection or the 8 Hz frequency, even ignoring selfweight, are skipped
+        before the full checks run. If no section passes the largest section
+        at the smallest spacing is returned.
+        '''
+        if section_catalogue is None:
+            section_catalogue = TimberSectionCatalogue.for_material(self.material.material_type)
+        try:
+            joist_spacings = sorted(joist_spacing, reverse=True)
+        except TypeError:
+            joist_spacings = [joist_spacing]
+        if deflection_limit is None:
+            deflection_limit = min(0.003 * self.length, 14)
+        check_args = (dead_load, imposed_load, floor_stiffness_per_metre, modal_damping_ratio,
+                      is_strutted, joist_type_index, imposed_combination_factor, deflection_limit,
+                      load_duration)
+
+        feasible_indices = {
+            spacing: set(section_catalogue.get_feasible_indices(**self._get_minimum_joist_properties(
+                spacing, section_catalogue.min_height, *check_args)))
+            for spacing in joist_spacings
+            }
+        candidate_indices = sorted(set().union(*feasible_indices.values()))
+        for index in candidate_indices:
+            self.breadth, self.height = section_catalogue[index]
+            for spacing in joist_spacings:
+                if index not in feasible_indices[spacing]:
+                    continue
+                ur_results = self.get_floor_utilisation_results(spacing, *check_args)
+                if self._passes_checks(ur_results):
+                    return self._get_joist_design_results(spacing, ur_results)
+        # catalogue exhausted returning results from largest section
+        self.breadth, self.height = section_catalogue[len(section_catalogue) - 1]
+        spacing = joist_spacings[-1]
+        ur_results = self.get_floor_utilisation_results(spacing, *check_args)
+        return self._get_joist_design_results(spacing, ur_results)
+
+    def _get_joist_design_results(self, joist_spacing: float, ur_results: dict) -> dict:
+        results = {
+            "breadth": self.breadth,
+            "height": self.height,
+            "joist_spacing": joist_spacing,
+            }
+        results.update(ur_results)
+        if instrumentation.ENABLED:
+            self._record_auto_design("joist", results)
+        return results
+
+    def _get_minimum_joist_properties(self,
+                                      joist_spacing: float,
+                                      min_height: float,
+                                      dead_load: float,
+                                      imposed_load: float,
+                                      floor_stiffness_per_metre: float,
+                                      modal_damping_ratio: float,
+                                      is_strutted: bool,
+                                      joist_type_index: int,
+                                      imposed_combination_factor: float,
+                                      deflection_limit: float,
+                                      load_duration: str
+                                      ) -> dict:
+        '''Returns lower bounds on the section properties of any joist which
+        passes get_floor_utilisation_results at the given spacing.
+
+        Adds the point load deflection and 8 Hz frequency bounds on the
+        second moment of area to those of _get_minimum_section_properties.
+        The frequency bound takes the floor mass without joist selfweight.
+        '''
+        spacing = joist_spacing / 1000
+        min_properties = self._get_minimum_section_properties(
+            load_duration,
+            True,
+            dead_load * spacing,
+            imposed_load * spacing,
+            imposed_combination_factor,
+            deflection_limit,
+            1.35,
+            1.5,
+            True,
+            min_height
+            )
+        if not min_properties or dead_load < 0:
+            return min_properties
+        # relative tolerance so that rounding never prunes a section at UR = 1
+        tolerance = 1 - 1e-9
+        e_0_mean = self.material.material_properties["E_0_mean"]
+        k_dist = self.get_k_dist(floor_stiffness_per_metre, joist_spacing, is_strutted)
+        k_amp = self.get_k_amp(joist_type_index)
+        min_point_load_inertia = ((1000 * k_dist * self.length**3 * k_amp)
+                                  / (48 * e_0_mean * self.get_deflection_limit_for_1kn_point_load()))
+        min_mass_of_floor_per_unit_area = dead_load * 1000 / 9.81
+        min_frequency_inertia = (min_mass_of_floor_per_unit_area
+                                 * (2 * self.MIN_FUNDAMENTAL_FREQUENCY * (self.length / 1000)**2 / pi)**2
+                                 * 10**6 * spacing / e_0_mean)
+        min_properties["min_second_moment_of_area"] = max(min_properties["min_second_moment_of_area"],
+                                                          tolerance * min_point_load_inertia,
+                                                          tolerance * min_frequency_inertia)
+        return min_properties
@@ -0,0 +1,192 @@
+'''Precomputed maximum span tables for softwood floor joists.
+
+A span table holds the max span of TimberJoist over a grid of
+grade x breadth x height x joist spacing x dead load x imposed load.
+Tables are generated once, saved as a compact .npz file and then loaded
+and queried. Between the tabulated spacings and loads a query returns the
+least span of the bracketing entries rather than interpolating.
+
+Usage:
+    table = JoistSpanTable.generate(["C16", "C24"], [47, 63], [150, 200, 225],
+                                    [300, 400, 600], [0.25, 0.5, 0.75], [1.5, 2.0],
+                                    floor_stiffness_per_metre=2.66e9)
+    table.save("joist_spans.npz")
+    JoistSpanTable.load("joist_spans.npz").get_max_span("C24", 47, 200, 450, 0.4, 1.5)
+'''
+import os
+from bisect import bisect_right
+from itertools import product
+from threading import RLock
+import numpy as np
+from .joist import TimberJoist
+
+
+_SPAN_TABLE_LOCK = RLock()
+_LOADED_SPAN_TABLES = {}
+
+
+class JoistSpanTable():
+    '''Max spans of TimberJoist tabulated over grade x breadth x height x
+    joist spacing x dead load x imposed load.
+
+    Queries must use a tabulated grade, breadth and height, and spacings and
+    loads within the tabulated ranges. Between tabulated spacings and loads
+    the least span of the bracketing entries is returned, which is on the
+    safe side; spans are not interpolated.
+    '''
+
+    AXES = ["grades", "breadths", "heights", "joist_spacings", "dead_loads", "imposed_loads"]
+
+    def __init__(self, axes: dict, max_spans, parameters: dict):
+        '''Input the table axes, an array of max spans in [mm] with one dimension
+        per axis and the joist parameters the spans were generated with.'''
+        self._axes = {axis: tuple(axes[axis]) for axis in self.AXES}
+        self._max_spans = np.asarray(max_spans, dtype=np.float32)
+        expected_shape = tuple(len(self._axes[axis]) for axis in self.AXES)
+        if self._max_spans.shape != expected_shape:
+            raise ValueError(f"Max spans shape, {self._max_spans.shape}, does not match " +
+                             f"the table axes, {expected_shape}.")
+        self._parameters = dict(parameters)
+        self._index = {axis: {value: i for i, value in enumerate(self._axes[axis])}
+                       for axis in ["grades", "breadths", "heights"]}
+        # nested lists are much quicker than numpy to index one element at a time
+        self._max_span_lists = self._max_spans.astype(float).tolist()
+
+    @classmethod
+    def generate(cls,
+                 grades,
+                 breadths,
+                 heights,
+                 joist_spacings,
+                 dead_loads,
+                 imposed_loads,
+                 floor_stiffness_per_metre: float,
+                 floor_width: float = 4000,
+                 modal_damping_ratio: float = 0.02,
+                 is_strutted: bool = False,
+                 span_iteration: float = 10,
+                 min_span: float = 1000,
+                 max_span: float = 8000
+                 ) -> "JoistSpanTable":
+        '''Returns a span table of TimberJoist.get_max_span over every
+        combination of the axes values.
+
+        Input breadths, heights and joist spacings in [mm],
+        dead and imposed loads in [kN/m^2] excluding joist selfweight.
+        Spacings and loads are sorted ascending so they can be bracketed.
+        '''
+        axes = {
+            "grades": list(grades),
+            "breadths": list(breadths),
+            "heights": list(heights),
+            "joist_spacings": sorted(joist_spacings),
+            "dead_loads": sorted(dead_loads),
+            "imposed_loads": sorted(imposed_loads),
+            }
+        parameters = {
+            "floor_stiffness_per_metre": floor_stiffness_per_metre,
+            "floor_width": floor_width,
+            "modal_damping_ratio": modal_damping_ratio,
+            "is_strutted": is_strutted,
+            "span_iteration": span_iteration,
+            "min_span": min_span,
+            "max_span": max_span,
+            }
+        max_spans = np.zeros(tuple(len(axes[axis]) for axis in cls.AXES), dtype=np.float32)
+        for grade_index, grade in enumerate(axes["grades"]):
+            for breadth_index, breadth in enumerate(axes["breadths"]):
+                for height_index, height in enumerate(axes["heights"]):
+                    joist = TimberJoist(min_span, floor_width, breadth, height, grade)
+                    for indices in product(*(range(len(axes[axis])) for axis in cls.AXES[3:])):
+                        spacing_index, dead_load_index, imposed_load_index = indices
+                        max_spans[(grade_index, breadth_index, height_index) + indices] = joist.get_max_span(
+                            axes["joist_spacings"][spacing_index],
+                            axes["dead_loads"][dead_load_index],
+                            axes["imposed_loads"][imposed_load_index],
+                            floor_stiffness_per_metre,
+                            modal_damping_ratio,
+                            is_strutted,
+                            span_iteration,
+                            min_span,
+                            max_span)
+        return cls(axes, max_spans, parameters)
+
+    @property
+    def axes(self) -> dict:
+        return self._axes
+
+    @property
+    def parameters(self) -> dict:
+        return self._parameters
+
+    @property
+    def max_spans(self) -> np.ndarray:
+        '''Returns the tabulated max spans in [mm].'''
+        return self._max_spans
+
+    def save(self, file_path: str) -> None:
+        '''Saves the table to a compressed .npz file.'''
+        np.savez_compressed(
+            file_path,
+            max_spans=self._max_spans,
+            parameter_names=np.array(list(self._parameters)),
+            parameter_values=np.array(list(self._parameters.values()), dtype=float),
+            **{axis: np.array(values) for axis, values in self._axes.items()}
+            )
+
+    @classmethod
+    def load(cls, file_path: str) -> "JoistSpanTable":
+        '''Returns the table saved at file_path. Tables are cached per
+        process and reloaded only if the file has been modified.'''
+        file_path = os.path.abspath(file_path)
+        modified_time = os.path.getmtime(file_path)
+        cached = _LOADED_SPAN_TABLES.get(file_path)
+        if cached is not None and cached[0] == modified_time:
+            return cached[1]
+        with _SPAN_TABLE_LOCK:
+            with np.load(file_path) as data:
+                axes = {axis: data[axis].tolist() for axis in cls.AXES}
+                parameters = dict(zip(data["parameter_names"].tolist(),
+                                      data["parameter_values"].tolist()))
+                parameters["is_strutted"] = bool(parameters["is_strutted"])
+                table = cls(axes, data["max_spans"], parameters)
+            _LOADED_SPAN_TABLES[file_path] = (modified_time, table)
+        return table
+
+    @staticmethod
+    def _get_bracket(values: tuple, value: float, axis: str) -> tuple:
+        '''Returns the indices of the tabulated values bracketing value,
+        only its own index if it is tabulated.'''
+        if not values[0] <= value <= values[-1]:
+            raise ValueError(f"Value, {value}, is outside the {axis} of the table: " +
+                             f"{values[0]} to {values[-1]}.")
+        index = bisect_right(values, value) - 1
+        if values[index] == value:
+            return (index,)
+        return index, index + 1
+
+    def get_max_span(self,
+                     grade: str,
+                     breadth: float,
+                     height: float,
+                     joist_spacing: float,
+                     dead_load: float,
+                     imposed_load: float
+                     ) -> float:
+        '''Returns the max span in [mm] from the table.
+
+        The grade, breadth and height must be in the table. Between the
+        tabulated spacings and loads the least span of the bracketing table
+        entries is returned. Max span is convex in spacing and loads, so linear
+        interpolation would overstate it.
+        '''
+        try:
+            spans = self._max_span_lists[self._index["grades"][grade]]
+            spans = spans[self._index["breadths"][breadth]][self._index["heights"][height]]
+        except KeyError as error:
+            raise ValueError(f"Joist {grade} {breadth}x{height}mm is not in the span table.") from error
+        spacing_indices = self._get_bracket(self._axes["joist_spacings"], joist_spacing, "joist_spacings")
+        dead_load_indices = self._get_bracket(self._axes["dead_loads"], dead_load, "dead_loads")
+        imposed_load_indices = self._get_bracket(self._axes["imposed_loads"], imposed_load, "imposed_loads")
+        return min(spans[i][j][k] for i in spacing_indices
+                   for j in dead_load_indices for k in imposed_load_indices)
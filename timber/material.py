@@ -0,0 +1,474 @@
+import json
+import os
+from enum import IntEnum
+from math import sqrt
+from threading import RLock
+from time import perf_counter
+from types import MappingProxyType
+from . import instrumentation
+from ._data import open_data_file
+from .material_snapshot import PROPERTY_COLUMNS, MaterialSnapshot
+
+
+_MATERIAL_DATA_LOCK = RLock()
+_MATERIAL_DATA = {}
+_SHARED_MATERIALS = {}
+# incremented by reload_material_data so caches of derived results can tell stale entries
+_MATERIAL_DATA_GENERATION = 0
+# compiled material snapshot, opened on first use
+_MATERIAL_SNAPSHOT = None
+# path given to use_material_snapshot, until then TIMBER_MATERIAL_SNAPSHOT is read on use
+_MATERIAL_SNAPSHOT_PATH = None
+_IS_MATERIAL_SNAPSHOT_PATH_SET = False
+
+
+def get_material_snapshot_path() -> str | None:
+    '''Returns the path of the material snapshot to read, given to
+    use_material_snapshot or else the TIMBER_MATERIAL_SNAPSHOT environment
+    variable, or None if the JSON files are read.'''
+    if _IS_MATERIAL_SNAPSHOT_PATH_SET:
+        return _MATERIAL_SNAPSHOT_PATH
+    return os.environ.get("TIMBER_MATERIAL_SNAPSHOT") or None
+
+
+def get_material_snapshot() -> MaterialSnapshot | None:
+    '''Returns the material snapshot in use, or None if the JSON files are read.'''
+    global _MATERIAL_SNAPSHOT
+    file_path = get_material_snapshot_path()
+    if file_path is None:
+        return None
+    snapshot = _MATERIAL_SNAPSHOT
+    if snapshot is None or snapshot.file_path != file_path:
+        with _MATERIAL_DATA_LOCK:
+            snapshot = _MATERIAL_SNAPSHOT
+            if snapshot is None or snapshot.file_path != file_path:
+                snapshot = _MATERIAL_SNAPSHOT = MaterialSnapshot(file_path)
+    return snapshot
+
+
+def use_material_snapshot(file_path: str | None) -> None:
+    '''Reads all material data from a compiled snapshot, see
+    timber.material_snapshot, or from the JSON files again if None,
+    whatever TIMBER_MATERIAL_SNAPSHOT is. The cached material data is reloaded.'''
+    global _MATERIAL_SNAPSHOT, _MATERIAL_SNAPSHOT_PATH, _IS_MATERIAL_SNAPSHOT_PATH_SET
+    with _MATERIAL_DATA_LOCK:
+        _MATERIAL_SNAPSHOT = None if file_path is None else MaterialSnapshot(file_path)
+        _MATERIAL_SNAPSHOT_PATH = file_path
+        _IS_MATERIAL_SNAPSHOT_PATH_SET = True
+        reload_material_data()
+
+
+def get_material_data_generation() -> int:
+    '''Returns a counter which changes whenever the material data is reloaded.'''
+    return _MATERIAL_DATA_GENERATION
+
+
+def load_material_data(material_type: str) -> MappingProxyType:
+    '''Returns the read-only strength grade data for a material type.
+
+    The json file, or the material snapshot if one is in use, is read once
+    per process on first use and the properties are shared by every
+    TimberMaterial of that type. Properties missing from the json file are
+    None, as they are in a snapshot. Call reload_material_data after
+    changing TIMBER_MATERIAL_SNAPSHOT.
+    '''
+    material_data = _MATERIAL_DATA.get(material_type)
+    if material_data is None:
+        with _MATERIAL_DATA_LOCK:
+            material_data = _MATERIAL_DATA.get(material_type)
+            if material_data is None:
+                start = perf_counter()
+                snapshot = get_material_snapshot()
+                if snapshot is not None:
+                    material_data = snapshot.get_material_data(material_type)
+                else:
+                    with open_data_file(material_type + "_data.json") as f:
+                        timber_data_dict = json.load(f)
+                    material_data = MappingProxyType({
+                        strength_grade: MappingProxyType(dict.fromkeys(PROPERTY_COLUMNS) | properties)
+                        for strength_grade, properties in timber_data_dict.items()
+                        })
+                _MATERIAL_DATA[material_type] = material_data
+                if instrumentation.ENABLED:
+                    instrumentation.record_time("material/data_load", perf_counter() - start)
+                    instrumentation.emit("material_data_loaded", material_type=material_type)
+    return material_data
+
+
+def reload_material_data(material_type: str | None = None) -> None:
+    '''Invalidates the cached material data so it is re-read on next use.
+
+    If no material type is given all material types are invalidated.
+    Shared materials of the invalidated types are dropped as well, existing
+    TimberMaterial instances keep the properties they were built with.
+    '''
+    global _MATERIAL_DATA_GENERATION
+    with _MATERIAL_DATA_LOCK:
+        _MATERIAL_DATA_GENERATION += 1
+        if material_type is None:
+            _MATERIAL_DATA.clear()
+            _SHARED_MATERIALS.clear()
+            return
+        material_type = material_type.strip().lower()
+        _MATERIAL_DATA.pop(material_type, None)
+        for key in [key for key in _SHARED_MATERIALS if key[0] == material_type]:
+            del _SHARED_MATERIALS[key]
+
+
+def get_shared_material(material_type: str,
+                        strength_grade: str,
+                        service_class: int
+                        ) -> "TimberMaterial":
+    '''Returns a read-only TimberMaterial shared by all callers
+    with the same material type, strength grade and service class.'''
+    key = (material_type.strip().lower(), strength_grade, service_class)
+    material = _SHARED_MATERIALS.get(key)
+    if material is None:
+        with _MATERIAL_DATA_LOCK:
+            material = _SHARED_MATERIALS.get(key)
+            if material is None:
+                material = TimberMaterial(*key)
+                material._is_shared = True
+                _SHARED_MATERIALS[key] = material
+    return material
+
+
+class LoadDuration(IntEnum):
+    '''Integer codes of the load duration classes, in the order of
+    TimberMaterial.LOAD_DURATIONS, for indexing the factor tables.'''
+    PERMANENT = 0
+    LONG_TERM = 1
+    MEDIUM_TERM = 2
+    SHORT_TERM = 3
+    INSTANTANEOUS = 4
+
+
+class TimberMaterial():
+
+    VALID_MATERIALS = ["softwood", "hardwood", "glulam", "lvl", "green_oak"]
+    VALID_SERVICE_CLASSES = [1, 2, 3]
+    LOAD_DURATIONS = ["permanent", "long_term", "medium_term", "short_term", "instantaneous"]
+
+    # Dense partial factor tables. Materials are indexed in the order of
+    # VALID_MATERIALS, service classes by service_class - 1 and load durations
+    # by LoadDuration.
+    K_MOD_TABLE = (
+        (0.6, 0.7, 0.8, 0.9, 1.1),
+        (0.6, 0.7, 0.8, 0.9, 1.1),
+        (0.5, 0.55, 0.65, 0.7, 0.9),
+        )
+    GAMMA_M_TABLE = (1.3, 1.3, 1.25, 1.2, 1.3)
+    K_N_TABLE = (5.0, 5.0, 6.5, 4.5, 5.0)
+    K_CR_TABLE = (0.67, 0.67, 0.67, 1.0, 0.67)
+    K_DEF_TABLE = (
+        (0.6, 0.8, 2),
+        (0.6, 0.8, 2),
+        (0.6, 0.8, 2),
+        (0.6, 0.8, 2),
+        (1.6, 1.8, 2),
+        )
+    _LOAD_DURATION_INDICES = {load_duration: LoadDuration(index)
+                              for index, load_duration in enumerate(LOAD_DURATIONS)}
+
+    def __init__(self,
+                 material_type: str,
+                 strength_grade: str,
+                 service_class: int
+                 ):
+        self._type = None
+        self._strength_grade = None
+        self._material_properties = None
+        self._service_class = None
+        self._is_shared = False
+        self._grade_id = None
+        self._material_index = None
+        self._k_mod_table = None
+        self._gamma_m = None
+        self._k_n = None
+        self._k_cr = None
+        self._k_def = None
+        self.service_class = service_class
+        self.set_material(material_type, strength_grade)
+
+    def __reduce__(self):
+        constructor = get_shared_material if self._is_shared else TimberMaterial
+        return (constructor, (self.material_type, self.strength_grade, self.service_class))
+
+    @property
+    def material_type(self) -> str:
+        '''Returns the timber material type.'''
+        return self._type
+
+    @property
+    def strength_grade(self) -> int:
+        '''Returns the timber strength grade.'''
+        return self._strength_grade
+
+    @property
+    def material_properties(self) -> MappingProxyType:
+        '''Returns the read-only properties of the strength grade.'''
+        return self._material_properties
+
+    @property
+    def is_shared(self) -> bool:
+        '''Returns True if this is a read-only material from get_shared_material.'''
+        return self._is_shared
+
+    def _check_not_shared(self) -> None:
+        if self._is_shared:
+            raise AttributeError("Shared materials are read-only. " +
+                                 "Create a new TimberMaterial to change it.")
+
+    def set_material(self, material_type: str = "softwood", strength_grade: str = "C24") -> None:
+        self._check_not_shared()
+        if instrumentation.ENABLED:
+            with instrumentation.timer("material/set_material"):
+                return self._set_material(material_type, strength_grade)
+        return self._set_material(material_type, strength_grade)
+
+    def _set_material(self, material_type: str, strength_grade: str) -> None:
+        material_type = material_type.strip().lower()
+        strength_grade.strip().upper()
+        if material_type in self.VALID_MATERIALS:
+            timber_data_dict = load_material_data(material_type)
+        else:
+            raise ValueError(f"Material type, {material_type}, not valid. "+
+                             f"Valid material types: {self.VALID_MATERIALS}.")
+        if strength_grade in timber_data_dict:
+            material_properties = timber_data_dict[strength_grade]
+        else:
+            raise ValueError(f"Strength grade '{strength_grade}', not found. "+
+                             f"Strength grades in database: {timber_data_dict.keys()}.")
+        self._material_properties = material_properties
+        self._strength_grade = strength_grade
+        self._type = material_type
+        snapshot = get_material_snapshot()
+        self._grade_id = None if snapshot is None else snapshot.get_grade_id(material_type, strength_grade)
+        self._set_factor_tables()
+
+    def _set_factor_tables(self) -> None:
+        '''Precomputes the partial factors for the material type and service class.'''
+        if self._type is None:
+            return
+        material_index = self.VALID_MATERIALS.index(self._type)
+        service_class_index = self._service_class - 1
+        self._material_index = material_index
+        self._k_mod_table = self.K_MOD_TABLE[service_class_index]
+        self._gamma_m = self.GAMMA_M_TABLE[material_index]
+        self._k_n = self.K_N_TABLE[material_index]
+        self._k_cr = self.K_CR_TABLE[material_index]
+        self._k_def = self.K_DEF_TABLE[material_index][service_class_index]
+
+    @property
+    def grade_id(self) -> int | None:
+        '''Returns the integer id of the grade in the material snapshot,
+        or None if no snapshot is in use.'''
+        return self._grade_id
+
+    @property
+    def material_index(self) -> int:
+        '''Returns the index of the material type in VALID_MATERIALS.'''
+        return self._material_index
+
+    @property
+    def k_mod_table(self) -> tuple:
+        '''Returns the k_mod values of the service class indexed by LoadDuration.'''
+        return self._k_mod_table
+
+    @property
+    def service_class(self) -> int:
+        return self._service_class
+
+    @service_class.setter
+    def service_class(self, new_service_class: int) -> None:
+        self._check_not_shared()
+        if not self.is_valid_service_class(new_service_class):
+            raise ValueError(f"Service class, {new_service_class}, is not valid. " +
+                             f"Valid service classes: {self.VALID_SERVICE_CLASSES}.")
+        self._service_class = new_service_class
+        self._set_factor_tables()
+
+    @classmethod
+    def is_valid_service_class(cls, service_class: int) -> bool:
+        return service_class in cls.VALID_SERVICE_CLASSES
+
+    @classmethod
+    def is_valid_material_type(cls, material_type: str) -> bool:
+        return material_type in cls.VALID_MATERIALS
+
+    def get_gamma_factor(self) -> float:
+        return self._gamma_m
+
+    def get_k_c_90(self, bearing_support_condition: int = 0) -> float:
+        '''
+        bearing_support_condition can be 0, 1 or 2
+            0 = no bearing enhancement support
+            1 = bearing enhanced: continuous support
+            2 = bearing enhanced: discrete support
+        '''
+        # only softwood or glulam get bearing support enhancement
+        if (bearing_support_condition == 0
+            or self.material_type not in ["softwood", "glulam"]):
+            k_c_90 = 1.0  # i.e. no enhancement
+        elif bearing_support_condition == 1:
+            if self.material_type == "softwood":
+                k_c_90 = 1.25
+            else:  # is glulam
+                k_c_90 = 1.5
+        elif bearing_support_condition == 2:
+            if self.material_type == "softwood":
+                k_c_90 = 1.5
+            else:  # is glulam
+                k_c_90 = 1.75
+        else:
+            raise ValueError(f"Invalid bearing support condition index, {bearing_support_condition}. " +
+                             "Valid integers: 0 = no bearing enhancement support, "+
+                             "1 = bearing enhanced: continuous support, " +
+                             "2 = bearing enhanced: discrete support.")
+        return k_c_90
+
+    @staticmethod
+    def get_k_strut(is_strutted: bool = False) -> float:
+        if is_strutted:
+            return 0.97
+        return 1.0
+
+    def get_k_n(self) -> float:
+        return self._k_n
+
+    def get_k_form(self) -> float:
+        return 1.2
+
+    @classmethod
+    def get_load_duration_index(cls, load_duration) -> LoadDuration:
+        '''Returns the LoadDuration of a load duration name or integer code.'''
+        if isinstance(load_duration, int):
+            if not 0 <= load_duration < len(cls.LOAD_DURATIONS):
+                raise ValueError(f"Load duration index '{load_duration}' is invalid. "+
+                                 f"Valid load duration indices: 0 to {len(cls.LOAD_DURATIONS) - 1}.")
+            return LoadDuration(load_duration)
+        load_duration_index = cls._LOAD_DURATION_INDICES.get(load_duration)
+        if load_duration_index is None:
+            load_duration = load_duration.strip().lower()
+            if load_duration not in cls.LOAD_DURATIONS:
+                raise ValueError(f"Load duration '{load_duration}' is invalid. "+
+                                 f"Valid load durations: {cls.LOAD_DURATIONS}.")
+            load_duration_index = cls._LOAD_DURATION_INDICES[load_duration]
+        return load_duration_index
+
+    def get_k_mod(self, load_duration) -> float:
+        '''Input the load duration name, or its LoadDuration integer code
+        for the fast path used by hot loops.'''
+        if type(load_duration) is LoadDuration:
+            return self._k_mod_table[load_duration]
+        return self._k_mod_table[self.get_load_duration_index(load_duration)]
+
+    def get_k_def(self) -> float:
+        '''Returns the modification factor for deflection.'''
+        return self._k_def
+
+    def get_k_h(self, height: float) -> float:
+        if self.material_type in ["softwood", "hardwood", "green_oak"]:
+            if height <= 150:
+                k_h = min((150 / height)**0.2, 1.3)
+            else:
+                k_h = 1
+        elif self.material_type == "glulam":
+            if height <= 600:
+                k_h = min((600 / height)**0.1, 1.1)
+            else:
+                k_h = 1
+        elif self.material_type == "lvl":
+            # size effect factor for LVL is declared by the manufacturer
+            size_factor = self.material_properties.get("size_factor", 0.12)
+            if size_factor is None:
+                size_factor = 0.12
+            k_h = min((300 / height)**size_factor, 1.2)
+        return k_h
+
+    def get_k_h_derivative(self, height: float) -> float:
+        '''Returns the derivative of get_k_h with respect to height in [1/mm].
+
+        At the kinks where the cap or cut off starts the derivative of the
+        branch get_k_h evaluates is returned.
+        '''
+        if self.material_type in ["softwood", "hardwood", "green_oak"]:
+            reference_height, exponent, k_h_max = 150, 0.2, 1.3
+            if height > reference_height:
+                return 0
+        elif self.material_type == "glulam":
+            reference_height, exponent, k_h_max = 600, 0.1, 1.1
+            if height > reference_height:
+                return 0
+        elif self.material_type == "lvl":
+            reference_height, k_h_max = 300, 1.2
+            exponent = self.material_properties.get("size_factor", 0.12)
+            if exponent is None:
+                exponent = 0.12
+        k_h = (reference_height / height)**exponent
+        if k_h >= k_h_max:
+            return 0
+        return -exponent * k_h / height
+
+    @staticmethod
+    def get_k_sys(is_load_sharing: bool) -> float:
+        return 1.1 if is_load_sharing else 1.0
+
+    def get_k_cr(self) -> float:
+        return self._k_cr
+
+    @staticmethod
+    def get_k_crit(relative_slenderness) -> float:
+        if relative_slenderness <= 0.75:
+            k_crit = 1
+        elif relative_slenderness <= 1.4:
+            k_crit = 1.56 - 0.75 * relative_slenderness
+        else:
+            k_crit = 1 / relative_slenderness**2
+        return k_crit
+
+    @staticmethod
+    def get_k_crit_derivative(relative_slenderness) -> float:
+        '''Returns the derivative of get_k_crit with respect to the relative slenderness.'''
+        if relative_slenderness <= 0.75:
+            return 0
+        if relative_slenderness <= 1.4:
+            return -0.75
+        return -2 / relative_slenderness**3
+
+    def get_k_v(self,
+                height: float,
+                notch_depth: float,
+                bearing_length: float,
+                distance_to_notch_from_edge_of_support: float,
+                is_bottom_notched: bool,
+                length_of_sloping_notch: float = 0
+                ) -> float:
+        '''Returns the notch shear strength reduction factor.'''
+        effective_height = height - notch_depth
+        if is_bottom_notched:
+            distance_to_notch = (bearing_length / 2) + distance_to_notch_from_edge_of_support
+        else:  # top notched
+            distance_to_notch = distance_to_notch_from_edge_of_support
+
+        if is_bottom_notched:
+            k_n = self.get_k_n()
+            alpha = self.get_notch_ratio(height, notch_depth)
+            k_v = min(1,
+                      (k_n * (1 + 1.1*(length_of_sloping_notch / (height - effective_height))**1.5 / sqrt(height)))
+                      / (sqrt(height) * (sqrt(alpha * (1-alpha)) + 0.8 * distance_to_notch * sqrt((1 / alpha) - alpha**2) / height))
+                )
+        else:  # top notched
+            k_v = 1
+            # Possible enhancement strength enhancement possible if using BS 5268-2, Cl 2.10.4
+            # if distance_to_notch > effective_height:
+            #     k_v = 1
+            # else:
+            #     k_v = (height * (effective_height - distance_to_notch)
+            #            + (distance_to_notch * effective_height)) / effective_height**2
+        return k_v
+
+    @staticmethod
+    def get_notch_ratio(height: float, notch_depth: float) -> float:
+        '''Returns the notch depth ratio known as alpha.'''
+        return (height - notch_depth) / height
@@ -0,0 +1,192 @@
+'''Compiled, memory-mapped snapshot of the material databases.
+
+The build step compiles the *_data.json files of every material type, plus
+any user grade catalogues, into one binary file with a fixed column layout:
+
+    header     magic, format version, grade count, column count and the
+               offsets and lengths of the sections below
+    names      utf-8, a tab separated line of column names then one
+               "material_type<tab>strength_grade" line per grade
+    materials  int32 per grade, the material index in VALID_MATERIALS
+    columns    float64 per grade for each column in turn, NaN where missing
+
+Grades are numbered in file order by integer grade ids. A snapshot is
+memory mapped and its columns are read in place, without copying, so
+processes using the same file share its pages and never parse JSON.
+
+Build with:
+    python -m timber.material_snapshot materials.snapshot --catalogue my_grades.json
+and use it in every process with:
+    TIMBER_MATERIAL_SNAPSHOT=materials.snapshot python ...
+or timber.material.use_material_snapshot("materials.snapshot").
+'''
+import json
+import mmap
+import struct
+from math import isnan, nan
+from types import MappingProxyType
+from ._data import open_data_file
+
+
+MAGIC = b"TMBRSNAP"
+FORMAT_VERSION = 1
+MATERIAL_TYPES = ["softwood", "hardwood", "glulam", "lvl", "green_oak"]
+PROPERTY_COLUMNS = ["f_m_y_k", "f_v_k", "f_c_90_k", "E_0_mean", "G_mean", "E_005", "G_005",
+                    "density_characteristic", "density_mean", "size_factor"]
+
+# magic, format version, grade count, column count,
+# names offset, names length, materials offset, columns offset
+_HEADER = struct.Struct("<8sIIIQQQQ")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def build_material_snapshot(file_path: str, catalogues=(), material_types=None) -> int:
+    '''Compiles the material data files and user grade catalogues into a
+    snapshot at file_path and returns the number of grades.
+
+    Catalogues are file paths or dicts of {material_type: {grade: properties}}
+    and are added after the standard data, replacing grades of the same name.
+    Properties not in PROPERTY_COLUMNS are appended as extra columns.
+    '''
+    material_types = MATERIAL_TYPES if material_types is None else list(material_types)
+    grades = {}
+    for material_type in material_types:
+        with open_data_file(material_type + "_data.json") as f:
+            for grade, properties in json.load(f).items():
+                grades[(material_type, grade)] = properties
+    for catalogue in catalogues:
+        if isinstance(catalogue, str):
+            with open(catalogue, encoding='utf-8') as f:
+                catalogue = json.load(f)
+        for material_type, material_grades in catalogue.items():
+            material_type = material_type.strip().lower()
+            if material_type not in MATERIAL_TYPES:
+                raise ValueError(f"Material type, {material_type}, not valid. "+
+                                 f"Valid material types: {MATERIAL_TYPES}.")
+            for grade, properties in material_grades.items():
+                grades[(material_type, grade)] = properties
+
+    columns = list(PROPERTY_COLUMNS)
+    for properties in grades.values():
+        columns += [name for name in properties if name not in columns]
+    for name in columns + [grade for _, grade in grades]:
+        if "\t" in name or "\n" in name:
+            raise ValueError(f"Name, {name!r}, must not contain tabs or new lines.")
+
+    names = "\n".join(["\t".join(columns)]
+                      + [f"{material_type}\t{grade}" for material_type, grade in grades]).encode()
+    grade_count = len(grades)
+    names_offset = _HEADER.size
+    materials_offset = _align(names_offset + len(names))
+    columns_offset = _align(materials_offset + 4 * grade_count)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, grade_count, len(columns),
+                          names_offset, len(names), materials_offset, columns_offset)
+
+    with open(file_path, "wb") as f:
+        f.write(header)
+        f.write(names)
+        f.write(bytes(materials_offset - f.tell()))
+        f.write(struct.pack(f"<{grade_count}i",
+                            *(MATERIAL_TYPES.index(material_type) for material_type, _ in grades)))
+        f.write(bytes(columns_offset - f.tell()))
+        for name in columns:
+            values = [properties.get(name) for properties in grades.values()]
+            f.write(struct.pack(f"<{grade_count}d", *(nan if value is None else value
+                                                      for value in values)))
+    return grade_count
+
+
+class MaterialSnapshot():
+    '''Read-only, memory-mapped view of a compiled material snapshot.'''
+    def __init__(self, file_path: str):
+        with open(file_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.file_path = file_path
+        buffer = memoryview(self._mmap)
+        (magic, version, grade_count, _, names_offset, names_length,
+         materials_offset, columns_offset) = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"File, {file_path}, is not a material snapshot.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Material snapshot format version, {version}, is not supported. " +
+                             f"Rebuild it with format version {FORMAT_VERSION}.")
+        lines = bytes(buffer[names_offset:names_offset + names_length]).decode().split("\n")
+        self._columns = tuple(lines[0].split("\t"))
+        self._grades = tuple(tuple(line.split("\t")) for line in lines[1:])
+        self._grade_ids = {grade: grade_id for grade_id, grade in enumerate(self._grades)}
+        self._material_indices = buffer[materials_offset:materials_offset + 4 * grade_count].cast("i")
+        column_size = 8 * grade_count
+        self._column_views = {
+            name: buffer[columns_offset + i * column_size:columns_offset + (i + 1) * column_size].cast("d")
+            for i, name in enumerate(self._columns)
+            }
+
+    def __len__(self) -> int:
+        return len(self._grades)
+
+    @property
+    def columns(self) -> tuple:
+        '''Returns the property column names in file order.'''
+        return self._columns
+
+    @property
+    def grades(self) -> tuple:
+        '''Returns the (material_type, strength_grade) of each grade id.'''
+        return self._grades
+
+    @property
+    def material_indices(self) -> memoryview:
+        '''Returns the material index in VALID_MATERIALS of each grade id, an int32 view.'''
+        return self._material_indices
+
+    def get_grade_id(self, material_type: str, strength_grade: str) -> int:
+        try:
+            return self._grade_ids[(material_type, strength_grade)]
+        except KeyError as error:
+            raise ValueError(f"Strength grade '{strength_grade}' of {material_type} " +
+                             "not found in the material snapshot.") from error
+
+    def get_column(self, name: str) -> memoryview:
+        '''Returns a float64 view of a property for every grade id, indexed by
+        grade id. Use numpy.asarray(view) for a zero-copy array.'''
+        try:
+            return self._column_views[name]
+        except KeyError as error:
+            raise KeyError(f"Property, {name}, is not in the material snapshot. " +
+                           f"Properties: {self._columns}.") from error
+
+    def get_properties(self, grade_id: int) -> MappingProxyType:
+        '''Returns the properties of a grade id, with missing values as None.'''
+        properties = {}
+        for name, view in self._column_views.items():
+            value = view[grade_id]
+            properties[name] = None if isnan(value) else value
+        return MappingProxyType(properties)
+
+    def get_material_data(self, material_type: str) -> MappingProxyType:
+        '''Returns the grade properties of a material type in the same form
+        as timber.material.load_material_data.'''
+        return MappingProxyType({
+            grade: self.get_properties(grade_id)
+            for grade_id, (grade_material_type, grade) in enumerate(self._grades)
+            if grade_material_type == material_type
+            })
+
+
+def main(argv: list = None) -> None:
+    # imported here as timber.material imports this module on every start
+    import argparse
+    parser = argparse.ArgumentParser(description="Compile the material data into a snapshot.")
+    parser.add_argument("output", help="snapshot file to write")
+    parser.add_argument("--catalogue", action="append", default=[],
+                        help="JSON file of user grades, {material_type: {grade: properties}}")
+    args = parser.parse_args(argv)
+    count = build_material_snapshot(args.output, args.catalogue)
+    print(f"Compiled {count} strength grades into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+'''Monte Carlo reliability analysis of timber beams.
+
+Material strengths and stiffness and the permanent and imposed loads are
+sampled, and the bending, shear, LTB and deflection limit states are evaluated
+without partial factors in vectorised chunks. Chunks are spread across a
+process pool with a bounded number in flight, so memory does not grow with
+the number of samples, and running estimates of the failure probability and
+reliability index are yielded as chunks complete.
+
+    model = get_reliability_model(design, "medium_term", False,
+                                  {"distribution": "normal", "mean": 1.5, "cov": 0.1},
+                                  {"distribution": "gumbel", "mean": 1.2, "cov": 0.35},
+                                  0.3, design.length / 250)
+    for estimates in iter_reliability_estimates(model, 10**7, seed=1):
+        print(estimates["samples"], estimates["reliability_index"])
+'''
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import exp, inf, log, pi, sqrt
+from statistics import NormalDist
+import numpy as np
+from .batch import get_k_crit_array
+
+
+DISTRIBUTIONS = ["deterministic", "normal", "lognormal", "gumbel"]
+LIMIT_STATES = ["bending", "shear", "LTB", "deflection", "ULS"]
+
+# coefficients of variation of the JCSS Probabilistic Model Code for structural timber
+DEFAULT_MATERIAL_COVS = {
+    "f_m_y_k": 0.25,
+    "f_v_k": 0.25,
+    "E_0_mean": 0.13,
+    }
+
+# 5th percentile of the standard normal distribution
+_CHARACTERISTIC_FRACTILE = NormalDist().inv_cdf(0.05)
+_EULER_GAMMA = 0.5772156649015329
+
+
+def get_load_distribution(load) -> dict:
+    '''Returns the validated distribution of a udl in [kN/m].
+
+    Input a number for a deterministic load or a dict with the keys
+    "distribution", one of DISTRIBUTIONS, "mean" and "cov".
+    '''
+    if not isinstance(load, dict):
+        return {"distribution": "deterministic", "mean": float(load), "cov": 0.0}
+    distribution = load.get("distribution", "normal")
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Distribution '{distribution}' is invalid. " +
+                         f"Valid distributions: {DISTRIBUTIONS}.")
+    mean = float(load["mean"])
+    cov = float(load.get("cov", 0.0))
+    if cov < 0:
+        raise ValueError(f"Coefficient of variation, {cov}, must not be negative.")
+    if distribution == "lognormal" and mean <= 0:
+        raise ValueError(f"Mean of a lognormal load, {mean}, must be positive.")
+    return {"distribution": distribution, "mean": mean, "cov": cov}
+
+
+def get_reliability_model(design,
+                          load_duration: str,
+                          is_load_sharing: bool,
+                          permanent_udl,
+                          imposed_udl,
+                          imposed_combination_factor: float,
+                          deflection_limit: float,
+                          is_restrained: bool = True,
+                          with_creep: bool = True,
+                          include_selfweight: bool = True,
+                          material_covs: dict = None,
+                          strength_stiffness_correlation: float = 0.8
+                          ) -> dict:
+    '''Returns the reliability model of a TimberDesign as a dict of plain values.
+
+    permanent_udl and imposed_udl in [kN/m] are numbers or distributions, see
+    get_load_distribution. The mean selfweight is added to the permanent load
+    as a deterministic load if include_selfweight is True.
+    The bending and shear strengths are lognormal with 5th percentiles at the
+    characteristic values of the grade, and the stiffness is lognormal with its
+    mean at E_0_mean, with G_mean scaled with it. material_covs overrides
+    DEFAULT_MATERIAL_COVS, and the bending strength and stiffness are correlated
+    by strength_stiffness_correlation. The stiffness also replaces E_005 and
+    G_005 in the critical bending stress of the LTB limit state.
+    '''
+    covs = dict(DEFAULT_MATERIAL_COVS)
+    covs.update(material_covs or {})
+    for name, cov in covs.items():
+        if name not in DEFAULT_MATERIAL_COVS:
+            raise ValueError(f"Material property '{name}' is invalid. " +
+                             f"Valid material properties: {list(DEFAULT_MATERIAL_COVS)}.")
+        if cov < 0:
+            raise ValueError(f"Coefficient of variation of {name}, {cov}, must not be negative.")
+    if not -1 <= strength_stiffness_correlation <= 1:
+        raise ValueError(f"Correlation, {strength_stiffness_correlation}, must be between -1 and 1.")
+    material = design.material
+    properties = material.material_properties
+    length = design.length
+    breadth = design.breadth
+    height = design.height
+    k_mod = material.get_k_mod(load_duration)
+    k_sys = material.get_k_sys(is_load_sharing)
+    k_def = material.get_k_def() if with_creep else 0
+    log_stds = {name: sqrt(log(1 + cov**2)) for name, cov in covs.items()}
+
+    return {
+        "permanent_udl": get_load_distribution(permanent_udl),
+        "selfweight": design.get_beam_selfweight_per_m() if include_selfweight else 0.0,
+        "imposed_udl": get_load_distribution(imposed_udl),
+        # medians and log standard deviations of the lognormal material properties
+        "bending_strength": (k_mod * k_sys * design.get_k_h() * properties["f_m_y_k"]
+                             * exp(-_CHARACTERISTIC_FRACTILE * log_stds["f_m_y_k"])),
+        "bending_strength_log_std": log_stds["f_m_y_k"],
+        "shear_strength": (k_mod * k_sys * properties["f_v_k"]
+                           * exp(-_CHARACTERISTIC_FRACTILE * log_stds["f_v_k"])),
+        "shear_strength_log_std": log_stds["f_v_k"],
+        "stiffness_factor": exp(-log_stds["E_0_mean"]**2 / 2),
+        "stiffness_factor_log_std": log_stds["E_0_mean"],
+        "strength_stiffness_correlation": strength_stiffness_correlation,
+        # load effects per unit udl and stiffness
+        "bending_stress_per_udl": (length / 1000)**2 / 8 * 10**6 / design.get_elastic_section_modulus(True),
+        "shear_stress_per_udl": (3 * (length / 1000) / 2 * 10**3) / (2 * design.area * material.get_k_cr()),
+        "k_h_k_mod_k_sys": design.get_k_h() * k_mod * k_sys,
+        "is_ltb_applicable": not (is_restrained or breadth >= height),
+        "critical_bending_stress_per_stiffness": (
+            (pi / (design.effective_length * design.get_elastic_section_modulus(True)))
+            * sqrt(properties["E_0_mean"] * design.get_second_moment_of_area(False)
+                   * properties["G_mean"] * design.get_torsional_moment_of_inertia())),
+        "deflection_per_udl": (5 * length**4 / (384 * properties["E_0_mean"]
+                                                * design.get_second_moment_of_area(True))
+                               + material.get_k_form() * length**2 / (8 * properties["G_mean"] * design.area)),
+        "permanent_creep": 1 + k_def,
+        "imposed_creep": 1 + imposed_combination_factor * k_def,
+        "deflection_limit": deflection_limit,
+        }
+
+
+def _sample_load(distribution: dict, rng, sample_count: int):
+    '''Returns samples of a load distribution, a float if it is deterministic.'''
+    mean = distribution["mean"]
+    std = abs(mean) * distribution["cov"]
+    if distribution["distribution"] == "deterministic" or std == 0:
+        return mean
+    if distribution["distribution"] == "normal":
+        return rng.normal(mean, std, sample_count)
+    if distribution["distribution"] == "lognormal":
+        log_std = sqrt(log(1 + distribution["cov"]**2))
+        return rng.lognormal(log(mean) - log_std**2 / 2, log_std, sample_count)
+    scale = std * sqrt(6) / pi
+    return rng.gumbel(mean - _EULER_GAMMA * scale, scale, sample_count)
+
+
+def count_failures(model: dict, rng, sample_count: int) -> dict:
+    '''Returns the number of samples failing each limit state, None where
+    it is not applicable, for sample_count samples drawn from rng.'''
+    permanent_udl = _sample_load(model["permanent_udl"], rng, sample_count) + model["selfweight"]
+    imposed_udl = _sample_load(model["imposed_udl"], rng, sample_count)
+    strength_normal = rng.standard_normal(sample_count)
+    correlation = model["strength_stiffness_correlation"]
+    stiffness_normal = (correlation * strength_normal
+                        + sqrt(1 - correlation**2) * rng.standard_normal(sample_count))
+    bending_strength = model["bending_strength"] * np.exp(model["bending_strength_log_std"] * strength_normal)
+    shear_strength = model["shear_strength"] * np.exp(
+        model["shear_strength_log_std"] * rng.standard_normal(sample_count))
+    stiffness_factor = model["stiffness_factor"] * np.exp(model["stiffness_factor_log_std"] * stiffness_normal)
+
+    udl = np.broadcast_to(permanent_udl + imposed_udl, (sample_count,))
+    bending_stress = udl * model["bending_stress_per_udl"]
+    is_bending_failure = bending_stress > bending_strength
+    is_shear_failure = udl * model["shear_stress_per_udl"] > shear_strength
+    is_uls_failure = is_bending_failure | is_shear_failure
+    failures = {
+        "bending": np.count_nonzero(is_bending_failure),
+        "shear": np.count_nonzero(is_shear_failure),
+        "LTB": None,
+        }
+    if model["is_ltb_applicable"]:
+        # bending_strength includes k_h, k_mod and k_sys, the slenderness uses f_m alone
+        critical_bending_stress = model["critical_bending_stress_per_stiffness"] * stiffness_factor
+        relative_slenderness = np.sqrt(bending_strength / model["k_h_k_mod_k_sys"] / critical_bending_stress)
+        is_ltb_failure = bending_stress > get_k_crit_array(relative_slenderness) * bending_strength
+        failures["LTB"] = np.count_nonzero(is_ltb_failure)
+        is_uls_failure |= is_ltb_failure
+    creep_udl = np.broadcast_to(permanent_udl * model["permanent_creep"]
+                                + imposed_udl * model["imposed_creep"], (sample_count,))
+    final_deflection = creep_udl * model["deflection_per_udl"] / stiffness_factor
+    failures["deflection"] = np.count_nonzero(final_deflection > model["deflection_limit"])
+    failures["ULS"] = np.count_nonzero(is_uls_failure)
+    return {limit_state: None if count is None else int(count) for limit_state, count in failures.items()}
+
+
+def _count_chunk_failures(model: dict, seed_sequence, sample_count: int) -> dict:
+    return count_failures(model, np.random.default_rng(seed_sequence), sample_count)
+
+
+def get_reliability_estimates(failures: dict, sample_count: int) -> dict:
+    '''Returns the failure probability, reliability index and coefficient of
+    variation of the failure probability estimate of each limit state.'''
+    estimates = {
+        "samples": sample_count,
+        "failures": dict(failures),
+        "failure_probability": {},
+        "reliability_index": {},
+        "coefficient_of_variation": {},
+        }
+    for limit_state, count in failures.items():
+        if count is None:
+            failure_probability = reliability_index = coefficient_of_variation = None
+        else:
+            failure_probability = count / sample_count
+            if count == 0:
+                reliability_index, coefficient_of_variation = inf, inf
+            elif count == sample_count:
+                reliability_index, coefficient_of_variation = -inf, 0.0
+            else:
+                reliability_index = -NormalDist().inv_cdf(failure_probability)
+                coefficient_of_variation = sqrt((1 - failure_probability) / count)
+        estimates["failure_probability"][limit_state] = failure_probability
+        estimates["reliability_index"][limit_state] = reliability_index
+        estimates["coefficient_of_variation"][limit_state] = coefficient_of_variation
+    return estimates
+
+
+def iter_reliability_estimates(model: dict,
+                               sample_count: int,
+                               chunk_size: int = 2**18,
+                               workers: int = None,
+                               seed=None,
+                               max_chunks_in_flight: int = None):
+    '''Yields running reliability estimates, see get_reliability_estimates,
+    after each chunk of up to chunk_size samples, the last for all of them.
+
+    Chunks are evaluated across a pool of worker processes (default the number
+    of CPUs, 1 runs in process) with at most max_chunks_in_flight chunks
+    (default twice the number of workers) submitted at once, so memory is
+    bounded by the chunk size. Every chunk draws from its own child of
+    seed, so the estimates do not depend on the number of workers.
+    '''
+    if sample_count < 1:
+        raise ValueError(f"Sample count, {sample_count}, must be at least 1.")
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size, {chunk_size}, must be at least 1.")
+    workers = workers or os.cpu_count() or 1
+    chunk_sizes = (min(chunk_size, sample_count - start) for start in range(0, sample_count, chunk_size))
+    seed_sequence = np.random.SeedSequence(seed)
+    failures = dict.fromkeys(LIMIT_STATES, 0)
+    samples = 0
+
+    def add_chunk(chunk_sample_count: int, chunk_failures: dict) -> dict:
+        nonlocal samples
+        samples += chunk_sample_count
+        for limit_state, count in chunk_failures.items():
+            failures[limit_state] = None if count is None else failures[limit_state] + count
+        return get_reliability_estimates(failures, samples)
+
+    if workers == 1:
+        for chunk_sample_count in chunk_sizes:
+            yield add_chunk(chunk_sample_count, _count_chunk_failures(
+                model, seed_sequence.spawn(1)[0], chunk_sample_count))
+        return
+
+    max_chunks_in_flight = max_chunks_in_flight or 2 * workers
+    if max_chunks_in_flight < 1:
+        raise ValueError(f"Max chunks in flight, {max_chunks_in_flight}, must be at least 1.")
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(in_flight) < max_chunks_in_flight:
+                chunk_sample_count = next(chunk_sizes, None)
+                if chunk_sample_count is None:
+                    break
+                in_flight.append((chunk_sample_count, executor.submit(
+                    _count_chunk_failures, model, seed_sequence.spawn(1)[0], chunk_sample_count)))
+            if not in_flight:
+                return
+            chunk_sample_count, future = in_flight.popleft()
+            yield add_chunk(chunk_sample_count, future.result())
+
+
+def find_reliability_estimates(model: dict,
+                               sample_count: int,
+                               chunk_size: int = 2**18,
+                               workers: int = None,
+                               seed=None
+                               ) -> dict:
+    '''Returns the reliability estimates of all sample_count samples,
+    see iter_reliability_estimates.'''
+    for estimates in iter_reliability_estimates(model, sample_count, chunk_size, workers, seed):
+        pass
+    return estimates
@@ -0,0 +1,284 @@
+'''Batch auto-design of member schedules.
+
+A member schedule is a CSV, JSON lines or JSON file with one row per member.
+Members are designed in chunks across a process pool and the results are
+streamed out in the same order as the schedule.
+
+Usage:
+    python -m timber.schedule members.csv results.csv --workers 8
+'''
+import argparse
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from .material import TimberMaterial, get_shared_material
+from .design import TimberDesign
+
+
+DESIGN_METHODS = ["list", "height", "breadth"]
+
+# schedule column: (type, default), a default of None means it is required
+MEMBER_FIELDS = {
+    "id": (str, ""),
+    "length": (float, None),
+    "permanent_udl": (float, None),
+    "imposed_udl": (float, None),
+    "material_type": (str, "softwood"),
+    "strength_grade": (str, "C24"),
+    "service_class": (int, 1),
+    "load_duration": (str, "medium_term"),
+    "is_load_sharing": (bool, False),
+    "imposed_combination_factor": (float, 0.3),
+    "deflection_limit": (float, ""),
+    "deflection_limit_ratio": (float, ""),
+    "is_restrained": (bool, True),
+    "permanent_load_factor": (float, 1.35),
+    "variable_load_factor": (float, 1.5),
+    "with_creep": (bool, True),
+    "effective_length_factor": (float, 1.0),
+    "design_method": (str, "list"),
+    "search_method": (str, "direct"),
+    "breadth": (float, ""),
+    "height": (float, ""),
+    }
+
+RESULT_FIELDS = ["id", "material_type", "strength_grade", "design_method", "length",
+                 "breadth", "height", "bending_UR", "shear_UR", "LTB_UR", "deflection_UR",
+                 "passes", "error"]
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in ["true", "yes", "y", "1"]:
+        return True
+    if value in ["false", "no", "n", "0"]:
+        return False
+    raise ValueError(f"Boolean value '{value}' is invalid.")
+
+
+def parse_member(row: dict) -> dict:
+    '''Returns a member dict with schedule values converted and defaults filled in.
+
+    Blank values are treated as missing. Either a deflection limit in [mm]
+    or a deflection limit ratio (span / ratio) must be given. Raises
+    ValueError for non-positive lengths and limits or an invalid load duration.
+    '''
+    member = {}
+    for field, (field_type, default) in MEMBER_FIELDS.items():
+        value = row.get(field)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            if default is None:
+                raise ValueError(f"Member field '{field}' is required.")
+            member[field] = default
+        elif field_type is bool:
+            member[field] = _parse_bool(value)
+        else:
+            member[field] = field_type(value.strip() if isinstance(value, str) else value)
+    for field in ["length", "deflection_limit", "deflection_limit_ratio", "effective_length_factor"]:
+        if member[field] != "" and not member[field] > 0:
+            raise ValueError(f"Member field '{field}', {member[field]}, must be positive.")
+    TimberMaterial.get_load_duration_index(member["load_duration"])
+    if member["deflection_limit"] == "":
+        if member["deflection_limit_ratio"] == "":
+            raise ValueError("Member requires a deflection_limit or deflection_limit_ratio.")
+        member["deflection_limit"] = member["length"] / member["deflection_limit_ratio"]
+    if member["design_method"] not in DESIGN_METHODS:
+        raise ValueError(f"Design method '{member['design_method']}' is invalid. " +
+                         f"Valid design methods: {DESIGN_METHODS}.")
+    if member["design_method"] == "height" and member["breadth"] == "":
+        raise ValueError("Designing the height requires a breadth.")
+    if member["design_method"] == "breadth" and member["height"] == "":
+        raise ValueError("Designing the breadth requires a height.")
+    return member
+
+
+def design_member(member: dict) -> dict:
+    '''Auto designs a single parsed member and returns its result row.'''
+    material = get_shared_material(member["material_type"],
+                                   member["strength_grade"],
+                                   member["service_class"])
+    design = TimberDesign(member["length"],
+                          member["breadth"] or 100,
+                          member["height"] or 100,
+                          material,
+                          member["effective_length_factor"])
+    design_args = (member["load_duration"],
+                   member["is_load_sharing"],
+                   member["permanent_udl"],
+                   member["imposed_udl"],
+                   member["imposed_combination_factor"],
+                   member["deflection_limit"],
+                   member["is_restrained"],
+                   member["permanent_load_factor"],
+                   member["variable_load_factor"],
+                   member["with_creep"])
+    match member["design_method"]:
+        case "list":
+            design_results = design.get_auto_designed_timber_size_list(*design_args)
+        case "height":
+            design_results = design.get_auto_designed_timber_size_height(
+                *design_args, search_method=member["search_method"])
+        case "breadth":
+            design_results = design.get_auto_designed_timber_size_breadth(
+                *design_args, search_method=member["search_method"])
+    results = {
+        "id": member["id"],
+        "material_type": member["material_type"],
+        "strength_grade": member["strength_grade"],
+        "design_method": member["design_method"],
+        "length": member["length"],
+        }
+    results.update(design_results)
+    results["passes"] = all(design_results[check] is None or design_results[check] <= 1
+                            for check in ["bending_UR", "shear_UR", "LTB_UR", "deflection_UR"])
+    results["error"] = ""
+    return results
+
+
+def design_schedule_row(row: dict) -> dict:
+    '''Parses and designs a raw schedule row. Errors are reported in the
+    result row rather than raised so one bad member does not stop a batch.'''
+    try:
+        return design_member(parse_member(row))
+    except (ValueError, KeyError, TypeError, ArithmeticError) as error:
+        results = dict.fromkeys(RESULT_FIELDS, "")
+        results["id"] = row.get("id", "")
+        results["error"] = str(error)
+        return results
+
+
+def design_schedule_rows(rows: list) -> list:
+    '''Designs a chunk of raw schedule rows in order.'''
+    return [design_schedule_row(row) for row in rows]
+
+
+def iter_member_designs(rows,
+                        workers: int = 1,
+                        chunk_size: int = 256,
+                        max_chunks_in_flight: int = None):
+    '''Yields a result row for each member row, lazily and in input order.
+
+    rows can be any iterable of member rows, e.g. a generator over a file,
+    and is only consumed as results are needed. With more than one worker,
+    rows are designed in chunks of chunk_size across a process pool with at
+    most max_chunks_in_flight chunks (default twice the number of workers)
+    submitted ahead of the consumer, so memory stays bounded however many
+    members there are.
+    '''
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size, {chunk_size}, must be at least 1.")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for row in rows:
+            yield design_schedule_row(row)
+        return
+
+    max_chunks_in_flight = max_chunks_in_flight or 2 * workers
+    if max_chunks_in_flight < 1:
+        raise ValueError(f"Max chunks in flight, {max_chunks_in_flight}, must be at least 1.")
+    rows = iter(rows)
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(in_flight) < max_chunks_in_flight:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                in_flight.append(executor.submit(design_schedule_rows, chunk))
+            if not in_flight:
+                return
+            yield from in_flight.popleft().result()
+
+
+def design_schedule(rows: list, workers: int = None, chunk_size: int = 256) -> list:
+    '''Designs all schedule rows and returns the results in schedule order.
+
+    Rows are split into chunks of chunk_size which are designed across
+    a pool of worker processes. With one worker everything runs in process.
+    '''
+    return list(iter_member_designs(rows, workers, chunk_size))
+
+
+def iter_member_schedule(file_path: str):
+    '''Yields member rows from a .csv, .jsonl (one object per line)
+    or .json file holding a list of objects.
+
+    CSV and JSON lines files are read lazily one row at a time.
+    '''
+    if file_path.lower().endswith(".json"):
+        with open(file_path, encoding='utf-8') as f:
+            rows = json.load(f)
+        if not isinstance(rows, list):
+            raise ValueError("JSON member schedules must be a list of members.")
+        yield from rows
+    elif file_path.lower().endswith(".jsonl"):
+        with open(file_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(file_path, encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+
+
+def read_member_schedule(file_path: str) -> list:
+    '''Reads member rows from a .csv, .jsonl or .json schedule file.'''
+    return list(iter_member_schedule(file_path))
+
+
+def write_results(results, file_path: str) -> int:
+    '''Writes result rows to a .csv, .jsonl or .json file as they are
+    produced and returns the number of rows written.'''
+    count = 0
+    with open(file_path, "w", encoding='utf-8', newline='') as f:
+        if file_path.lower().endswith(".jsonl"):
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+                count += 1
+        elif file_path.lower().endswith(".json"):
+            f.write("[")
+            for result in results:
+                f.write(("," if count else "") + "\n    " + json.dumps(result))
+                count += 1
+            f.write("\n]\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            for result in results:
+                writer.writerow(result)
+                count += 1
+    return count
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description="Auto design a timber member schedule.")
+    parser.add_argument("schedule", help="member schedule, .csv, .jsonl or .json")
+    parser.add_argument("output", help="results file, .csv, .jsonl or .json")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes, defaults to the number of CPUs")
+    parser.add_argument("--chunk-size", type=int, default=256,
+                        help="number of members sent to a worker at a time")
+    args = parser.parse_args(argv)
+
+    failures = 0
+
+    def count_failures(results):
+        nonlocal failures
+        for result in results:
+            if result["error"] or not result["passes"]:
+                failures += 1
+            yield result
+
+    rows = iter_member_schedule(args.schedule)
+    results = iter_member_designs(rows, args.workers, args.chunk_size)
+    count = write_results(count_failures(results), args.output)
+    print(f"Designed {count} members, {failures} failing or in error.")
+
+
+if __name__ == "__main__":
+    main()
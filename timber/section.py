@@ -1,4 +1,40 @@
-from timber_material import TimberMaterial
+from functools import wraps
+from .material import TimberMaterial
+
+
+# geometric inputs each cached derived value depends on, by method name
+DERIVED_VALUE_DEPENDENCIES = {}
+
+
+def cached_derived_value(*dependencies):
+    '''Caches the result of a load independent method on the instance.
+
+    Input the geometric inputs the value depends on, "breadth", "height"
+    or "effective_length". Cached values are dropped when one of their
+    inputs is changed through the property setters, or when the material
+    properties change.
+    '''
+    def decorator(method):
+        name = method.__name__
+        DERIVED_VALUE_DEPENDENCIES[name] = frozenset(dependencies)
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (name, args, tuple(kwargs.items())) if args or kwargs else name
+            material_properties = self.material.material_properties
+            if material_properties is not self._derived_values_material_properties:
+                self._derived_values.clear()
+                self._derived_values_material_properties = material_properties
+            try:
+                value = self._derived_values[key]
+            except KeyError:
+                self._cache_misses += 1
+                value = self._derived_values[key] = method(self, *args, **kwargs)
+                return value
+            self._cache_hits += 1
+            return value
+        return wrapper
+    return decorator
 
 
 class TimberSection():
@@ -7,6 +43,10 @@ class TimberSection():
                  height:float,
                  material: TimberMaterial):
         self.material = material
+        self._derived_values = {}
+        self._derived_values_material_properties = None
+        self._cache_hits = 0
+        self._cache_misses = 0
         self._breadth = 1
         self._height = 1
         self._area = None
@@ -25,6 +65,7 @@ class TimberSection():
             raise ValueError(f"Breadth, {new_breadth}mm, must be positive.")
         self._breadth = new_breadth
         self._set_area()
+        self._invalidate_derived_values("breadth")
 
     @property
     def height(self) -> float:
@@ -38,6 +79,7 @@ class TimberSection():
             raise ValueError(f"Height, {new_height}mm, must be positive.")
         self._height = new_height
         self._set_area()
+        self._invalidate_derived_values("height")
 
     @property
     def area(self) -> float:
@@ -49,16 +91,41 @@ class TimberSection():
         '''Private setter to update the area attribute when breadth or height is changed.'''
         self._area = self.breadth * self.height
 
+    def _invalidate_derived_values(self, changed_input: str) -> None:
+        '''Drops the cached values which depend on the changed geometric input.'''
+        derived_values = self._derived_values
+        for key in [key for key in derived_values
+                    if changed_input in DERIVED_VALUE_DEPENDENCIES[key if key.__class__ is str else key[0]]]:
+            del derived_values[key]
+
+    def get_cache_stats(self) -> dict:
+        '''Returns the hits, misses and current size of the cache
+        of load independent derived values.'''
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._derived_values),
+            }
+
+    def clear_cache(self) -> None:
+        '''Clears the cached derived values and resets the cache stats.'''
+        self._derived_values.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    @cached_derived_value("breadth", "height")
     def get_second_moment_of_area(self, is_major_axis: bool = True) -> float:
         if is_major_axis:
             return self.breadth * self.height**3 / 12
         return self.height * self.breadth**3 /12
 
+    @cached_derived_value("breadth", "height")
     def get_elastic_section_modulus(self, is_major_axis: bool = True) -> float:
         if is_major_axis:
             return self.breadth * self.height**2 / 6
         return self.height * self.breadth**2 /6
 
+    @cached_derived_value("breadth", "height")
     def get_torsion_coefficient_beta(self) -> float:
         '''Aspect ratio coefficient for torsional moment of inertia.
         No exact formulas for non-circular cross-sections exist.
@@ -69,12 +136,14 @@ class TimberSection():
         short_side = min(self.height, self.breadth)
         return (1/3) - 0.21 * (short_side / long_side) * (1 - (short_side**4) / (12 * long_side**4))
 
+    @cached_derived_value("breadth", "height")
     def get_torsional_moment_of_inertia(self) -> float:
         beta = self.get_torsion_coefficient_beta()
         long_side = max(self.height, self.breadth)
         short_side = min(self.height, self.breadth)
         return beta * long_side * short_side**3
 
+    @cached_derived_value("breadth", "height")
     def get_g_005(self) -> float:
         '''5th percentile shear modulus derived from EC5 Eq6.31, Eq6.32 & EN 384'''
         g_005 = self.material.material_properties["G_005"]
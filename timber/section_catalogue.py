@@ -0,0 +1,113 @@
+import json
+from bisect import bisect_left
+from threading import RLock
+from ._data import open_data_file
+
+
+_CATALOGUE_LOCK = RLock()
+_MATERIAL_CATALOGUES = {}
+
+
+class TimberSectionCatalogue():
+    '''An ordered list of rectangular section sizes with precomputed properties.
+
+    Sections are ordered by height then breadth, i.e. the order in which
+    the auto-designer tries them. Section properties are computed once and
+    indexed by elastic section modulus, second moment of area and area
+    so that sections which cannot satisfy lower bounds are skipped.
+    '''
+    def __init__(self, section_sizes):
+        '''Input an iterable of (breadth, height) pairs in [mm].'''
+        section_sizes = sorted({(breadth, height) for breadth, height in section_sizes},
+                               key=lambda size: (size[1], size[0]))
+        if not section_sizes:
+            raise ValueError("Section catalogue must contain at least one section size.")
+        for breadth, height in section_sizes:
+            if breadth <= 0 or height <= 0:
+                raise ValueError(f"Section size, {breadth}x{height}mm, must be positive.")
+        self._breadths = tuple(breadth for breadth, _ in section_sizes)
+        self._heights = tuple(height for _, height in section_sizes)
+        self._areas = tuple(breadth * height for breadth, height in section_sizes)
+        self._elastic_section_moduli = tuple(breadth * height**2 / 6 for breadth, height in section_sizes)
+        self._second_moments_of_area = tuple(breadth * height**3 / 12 for breadth, height in section_sizes)
+        self._elastic_section_modulus_index = self._build_index(self._elastic_section_moduli)
+        self._second_moment_of_area_index = self._build_index(self._second_moments_of_area)
+        self._area_index = self._build_index(self._areas)
+
+    @classmethod
+    def from_breadths_and_heights(cls, breadths, heights) -> "TimberSectionCatalogue":
+        '''Returns a catalogue of every breadth and height combination.'''
+        return cls((breadth, height) for height in heights for breadth in breadths)
+
+    @classmethod
+    def for_material(cls, material_type: str) -> "TimberSectionCatalogue":
+        '''Returns the shared standard section catalogue for a material type.'''
+        catalogue = _MATERIAL_CATALOGUES.get(material_type)
+        if catalogue is None:
+            with _CATALOGUE_LOCK:
+                catalogue = _MATERIAL_CATALOGUES.get(material_type)
+                if catalogue is None:
+                    with open_data_file("section_size_data.json") as f:
+                        section_size_data = json.load(f)
+                    if material_type not in section_size_data:
+                        raise ValueError("Unsupported material type. " +
+                                         f"Supported types: {list(section_size_data)}")
+                    catalogue = cls.from_breadths_and_heights(
+                        section_size_data[material_type]["breadths"],
+                        section_size_data[material_type]["heights"])
+                    _MATERIAL_CATALOGUES[material_type] = catalogue
+        return catalogue
+
+    @staticmethod
+    def _build_index(values: tuple) -> tuple:
+        '''Returns the section indices and their values sorted by value.'''
+        order = sorted(range(len(values)), key=values.__getitem__)
+        return tuple(order), tuple(values[index] for index in order)
+
+    def __len__(self) -> int:
+        return len(self._breadths)
+
+    def __getitem__(self, index: int) -> tuple:
+        '''Returns the (breadth, height) of the section at index.'''
+        return self._breadths[index], self._heights[index]
+
+    def __iter__(self):
+        return zip(self._breadths, self._heights)
+
+    @property
+    def min_height(self) -> float:
+        return self._heights[0]
+
+    def get_area(self, index: int) -> float:
+        return self._areas[index]
+
+    def get_elastic_section_modulus(self, index: int) -> float:
+        '''Returns the major axis elastic section modulus in [mm^3].'''
+        return self._elastic_section_moduli[index]
+
+    def get_second_moment_of_area(self, index: int) -> float:
+        '''Returns the major axis second moment of area in [mm^4].'''
+        return self._second_moments_of_area[index]
+
+    def get_feasible_indices(self,
+                             min_elastic_section_modulus: float = 0,
+                             min_second_moment_of_area: float = 0,
+                             min_area: float = 0
+                             ) -> list:
+        '''Returns, in catalogue order, the indices of the sections meeting all
+        of the lower bounds on major axis section properties.'''
+        bounds = [
+            (self._elastic_section_modulus_index, self._elastic_section_moduli, min_elastic_section_modulus),
+            (self._second_moment_of_area_index, self._second_moments_of_area, min_second_moment_of_area),
+            (self._area_index, self._areas, min_area),
+            ]
+        # start from the most selective bound and filter by the others
+        suffixes = []
+        for (order, sorted_values), values, min_value in bounds:
+            start = bisect_left(sorted_values, min_value)
+            suffixes.append((len(order) - start, order[start:], values, min_value))
+        suffixes.sort(key=lambda suffix: suffix[0])
+        candidates = suffixes[0][1]
+        for _, _, values, min_value in suffixes[1:]:
+            candidates = [index for index in candidates if values[index] >= min_value]
+        return sorted(candidates)
@@ -0,0 +1,122 @@
+'''Vectorised optimisers over the breadth x height design space of a TimberDesign.
+
+Used by TimberDesign.get_pareto_optimal_sizes and
+TimberDesign.get_auto_designed_timber_size_min_cost, which describe the inputs.
+'''
+from bisect import bisect_left, bisect_right
+import numpy as np
+from .batch import find_utilisation_results_batch, get_max_utilisation_array
+
+
+def find_design_space_results(design, design_args: tuple, breadths, heights) -> tuple:
+    '''Returns height x breadth grids of the breadths, heights, the batched
+    utilisation results with selfweight and the max utilisation.'''
+    if breadths is None:
+        breadths = np.arange(40, 301, 5)
+    if heights is None:
+        heights = np.arange(100, 601, 5)
+    breadths = np.unique(np.asarray(breadths, dtype=float))
+    heights = np.unique(np.asarray(heights, dtype=float))
+    if breadths.size == 0 or heights.size == 0:
+        raise ValueError("The design space must have at least one breadth and height.")
+    if breadths[0] <= 0 or heights[0] <= 0:
+        raise ValueError("Breadths and heights must be positive.")
+    breadth, height = np.meshgrid(breadths, heights)
+    (load_duration, is_load_sharing, permanent_udl, imposed_udl, imposed_combination_factor,
+     deflection_limit, is_restrained, permanent_load_factor, variable_load_factor,
+     with_creep) = design_args
+    ur_results = find_utilisation_results_batch(
+        design.material,
+        design.length,
+        breadth,
+        height,
+        load_duration,
+        is_load_sharing,
+        permanent_udl,
+        imposed_udl,
+        imposed_combination_factor,
+        deflection_limit,
+        is_restrained,
+        permanent_load_factor,
+        variable_load_factor,
+        with_creep,
+        design.effective_length / design.length,
+        include_selfweight=True)
+    return breadth, height, ur_results, get_max_utilisation_array(ur_results)
+
+
+def get_pareto_front_indices(area, height, max_ur) -> np.ndarray:
+    '''Returns the indices of the points not dominated in all three objectives.
+
+    Points are swept in order of area keeping the (height, max_ur) staircase
+    of the points so far, so each dominance check is a bisection.
+    '''
+    order = np.lexsort((max_ur, height, area))
+    staircase_heights = []
+    staircase_urs = []
+    front = []
+    for index, point_height, point_ur in zip(order.tolist(),
+                                             height[order].tolist(),
+                                             max_ur[order].tolist()):
+        position = bisect_right(staircase_heights, point_height) - 1
+        if position >= 0 and staircase_urs[position] <= point_ur:
+            continue
+        front.append(index)
+        start = end = bisect_left(staircase_heights, point_height)
+        while end < len(staircase_urs) and staircase_urs[end] >= point_ur:
+            end += 1
+        staircase_heights[start:end] = [point_height]
+        staircase_urs[start:end] = [point_ur]
+    return np.array(front, dtype=int)
+
+
+def get_pareto_optimal_sizes(design, design_args: tuple, breadths, heights) -> dict:
+    '''Returns the Pareto front of the design space as a dict of arrays sorted by volume.'''
+    breadth, height, ur_results, max_ur = find_design_space_results(design, design_args,
+                                                                    breadths, heights)
+
+    # a section is dominated by a smaller one of the same height or breadth with no
+    # higher utilisation, prune these in bulk before the full dominance sweep
+    masked_ur = np.where(max_ur <= 1, max_ur, np.inf)
+    is_candidate = np.isfinite(masked_ur)
+    for axis in (0, 1):
+        previous_min_ur = np.minimum.accumulate(masked_ur, axis=axis)
+        previous_min_ur = np.roll(previous_min_ur, 1, axis=axis)
+        previous_min_ur[(slice(None), 0) if axis else (0, slice(None))] = np.inf
+        is_candidate &= masked_ur < previous_min_ur
+
+    candidates = np.flatnonzero(is_candidate)
+    area = (breadth * height).ravel()[candidates]
+    front = candidates[get_pareto_front_indices(area,
+                                                height.ravel()[candidates],
+                                                max_ur.ravel()[candidates])]
+    front = front[np.argsort(breadth.ravel()[front] * height.ravel()[front], kind="stable")]
+
+    results = {
+        "breadth": breadth.flat[front],
+        "height": height.flat[front],
+        "volume": design.length * breadth.flat[front] * height.flat[front] / 10**9,
+        "max_UR": max_ur.flat[front],
+        }
+    for check, values in ur_results.items():
+        results[check] = values.flat[front]
+    return results
+
+
+def get_min_cost_section(design, design_args: tuple, cost_function, breadths, heights) -> tuple:
+    '''Returns the breadth, height and cost of the passing section of least
+    cost, or of the section with the least max utilisation if none pass.'''
+    breadth, height, ur_results, max_ur = find_design_space_results(design, design_args,
+                                                                    breadths, heights)
+    if cost_function is None:
+        cost = design.length * breadth * height
+    else:
+        cost = np.broadcast_to(np.asarray(cost_function(design.length, breadth, height, ur_results),
+                                          dtype=float), breadth.shape)
+    passes = max_ur <= 1
+    if passes.any():
+        # the grid is ordered by height so argmin takes the smaller height on ties
+        index = np.argmin(np.where(passes, cost, np.inf))
+    else:
+        index = np.argmin(max_ur)
+    return breadth.flat[index].item(), height.flat[index].item(), cost.flat[index].item()
@@ -0,0 +1,160 @@
+'''Closed-form inverse sizing of a TimberDesign.
+
+Solves the bending, shear and deflection utilisations, with selfweight,
+for the smallest height of a given breadth or breadth of a given height.
+Used by TimberDesign.get_required_height and TimberDesign.get_required_breadth,
+which describe the inputs.
+'''
+from math import inf, sqrt
+
+REQUIRED_SIZE_CHECKS = ["bending_UR", "shear_UR", "deflection_UR"]
+
+# iterations are stopped at this relative change in the size
+_TOLERANCE = 1e-13
+_MAX_ITERATIONS = 100
+
+
+def _get_unit_utilisation_coefficients(design, design_args: tuple) -> dict:
+    '''Returns the coefficients of the utilisations of a unit section.
+
+    With q the factored udl and p the creep weighted udl in [kN/m]:
+        bending_UR = q * bending / (breadth * height**2 * k_h)
+        shear_UR = q * shear / (breadth * height)
+        deflection_UR = p * (flexural_deflection / height**3
+                             + shear_deflection / height) / (breadth * deflection_limit)
+    and the selfweight in [kN/m] is selfweight * breadth * height.
+    '''
+    (load_duration, is_load_sharing, permanent_udl, imposed_udl, imposed_combination_factor,
+     deflection_limit, is_restrained, permanent_load_factor, variable_load_factor,
+     with_creep) = design_args
+    material = design.material
+    properties = material.material_properties
+    length = design.length
+    gamma_m = material.get_gamma_factor()
+    k_sys = material.get_k_sys(is_load_sharing)
+    k_mod = material.get_k_mod(load_duration)
+    k_def = material.get_k_def() if with_creep else 0
+    bending_strength = k_mod * k_sys * properties["f_m_y_k"] / gamma_m
+    shear_strength = k_mod * k_sys * properties["f_v_k"] / gamma_m
+    return {
+        "bending": (length / 1000)**2 / 8 * 10**6 * 6 / bending_strength,
+        "shear": 3 * (length / 1000) / 2 * 10**3 / (2 * material.get_k_cr() * shear_strength),
+        "flexural_deflection": 5 * length**4 * 12 / (384 * properties["E_0_mean"]),
+        "shear_deflection": material.get_k_form() * length**2 / (8 * properties["G_mean"]),
+        "selfweight": properties["density_mean"] * 9.81 / 10**9,
+        "factored_udl": permanent_load_factor * permanent_udl + variable_load_factor * imposed_udl,
+        "factored_selfweight": permanent_load_factor,
+        "creep_udl": (permanent_udl * (1 + k_def)
+                      + imposed_udl * (1 + imposed_combination_factor * k_def)),
+        "creep_selfweight": 1 + k_def,
+        "deflection_limit": deflection_limit,
+        }
+
+
+def _has_monotone_utilisations(design_args: tuple) -> bool:
+    '''Returns True if the loads and factors are not negative, so that
+    every utilisation falls as the section grows.'''
+    (load_duration, is_load_sharing, permanent_udl, imposed_udl, imposed_combination_factor,
+     deflection_limit, is_restrained, permanent_load_factor, variable_load_factor,
+     with_creep) = design_args
+    return min(permanent_udl, imposed_udl, imposed_combination_factor,
+               permanent_load_factor, variable_load_factor) >= 0
+
+
+def _solve_linear_size(load: float, load_per_size: float, capacity_per_size: float) -> float:
+    '''Returns the size x at which load + load_per_size * x = capacity_per_size * x,
+    or inf if the capacity never catches up with the load.'''
+    if capacity_per_size <= load_per_size:
+        return inf
+    return load / (capacity_per_size - load_per_size)
+
+
+def find_required_heights(design, design_args: tuple) -> dict:
+    '''Returns {check: height} of the smallest heights in [mm] of the current
+    breadth at which bending, shear and deflection utilisations reach 1,
+    inf if no height does, or None if the loads are negative.'''
+    if not _has_monotone_utilisations(design_args):
+        return None
+    coefficients = _get_unit_utilisation_coefficients(design, design_args)
+    breadth = design.breadth
+    material = design.material
+    selfweight = coefficients["selfweight"] * breadth
+    factored_udl = coefficients["factored_udl"]
+    factored_selfweight = coefficients["factored_selfweight"] * selfweight
+
+    # breadth * k_h * height**2 = bending * (factored_udl + factored_selfweight * height),
+    # a quadratic in height for a given k_h, iterated as k_h changes slowly with height
+    bending = coefficients["bending"]
+    k_h = 1.0
+    bending_height = 0
+    for _ in range(_MAX_ITERATIONS):
+        linear_term = bending * factored_selfweight
+        previous_height = bending_height
+        bending_height = ((linear_term + sqrt(linear_term**2 + 4 * k_h * breadth * bending * factored_udl))
+                          / (2 * k_h * breadth))
+        if bending_height == 0:
+            break
+        k_h = material.get_k_h(bending_height)
+        if abs(bending_height - previous_height) <= _TOLERANCE * bending_height:
+            break
+
+    shear = coefficients["shear"]
+    shear_height = _solve_linear_size(shear * factored_udl, shear * factored_selfweight, breadth)
+
+    # deflection_UR - 1 is convex and decreasing in height, so Newton's method converges
+    # monotonically from the lower bounds of the flexural deflection of each load
+    flexural_deflection = coefficients["flexural_deflection"]
+    shear_deflection = coefficients["shear_deflection"]
+    creep_udl = coefficients["creep_udl"]
+    creep_selfweight = coefficients["creep_selfweight"] * selfweight
+    capacity = breadth * coefficients["deflection_limit"]
+    if creep_selfweight * shear_deflection >= capacity:
+        deflection_height = inf
+    elif creep_udl == 0 and creep_selfweight == 0:
+        deflection_height = 0
+    else:
+        deflection_height = max((creep_udl * flexural_deflection / capacity)**(1 / 3),
+                                sqrt(creep_selfweight * flexural_deflection / capacity))
+        for _ in range(_MAX_ITERATIONS):
+            height = deflection_height
+            load = creep_udl + creep_selfweight * height
+            compliance = flexural_deflection / height**3 + shear_deflection / height
+            excess = load * compliance - capacity
+            slope = (creep_selfweight * compliance
+                     - load * (3 * flexural_deflection / height**4 + shear_deflection / height**2))
+            deflection_height = height - excess / slope
+            if abs(deflection_height - height) <= _TOLERANCE * deflection_height:
+                break
+
+    return {
+        "bending_UR": bending_height,
+        "shear_UR": shear_height,
+        "deflection_UR": deflection_height,
+        }
+
+
+def find_required_breadths(design, design_args: tuple) -> dict:
+    '''Returns {check: breadth} of the smallest breadths in [mm] of the current
+    height at which bending, shear and deflection utilisations reach 1,
+    inf if no breadth does, or None if the loads are negative.'''
+    if not _has_monotone_utilisations(design_args):
+        return None
+    coefficients = _get_unit_utilisation_coefficients(design, design_args)
+    height = design.height
+    # with a fixed height every utilisation is linear in breadth
+    selfweight = coefficients["selfweight"] * height
+    factored_udl = coefficients["factored_udl"]
+    factored_selfweight = coefficients["factored_selfweight"] * selfweight
+    bending = coefficients["bending"]
+    shear = coefficients["shear"]
+    compliance = (coefficients["flexural_deflection"] / height**3
+                  + coefficients["shear_deflection"] / height)
+    return {
+        "bending_UR": _solve_linear_size(bending * factored_udl,
+                                         bending * factored_selfweight,
+                                         design.get_k_h() * height**2),
+        "shear_UR": _solve_linear_size(shear * factored_udl, shear * factored_selfweight, height),
+        "deflection_UR": _solve_linear_size(coefficients["creep_udl"] * compliance,
+                                            coefficients["creep_selfweight"] * selfweight * compliance,
+                                            coefficients["deflection_limit"]),
+        }
@@ -0,0 +1,119 @@
+'''Analytic partial derivatives of the TimberDesign utilisation ratios.
+
+Used by TimberDesign.get_utilisation_sensitivities and
+TimberDesign.get_height_increase_effect, which describe the inputs.
+'''
+
+
+def get_torsion_coefficient_beta_derivative(short_side: float, long_side: float) -> float:
+    '''Returns the derivative of the torsion coefficient beta with respect
+    to the aspect ratio short_side / long_side.'''
+    aspect_ratio = short_side / long_side
+    return -0.21 + 0.21 * 5 * aspect_ratio**4 / 12
+
+
+def find_utilisation_sensitivities(design, design_args: tuple, include_selfweight: bool) -> dict:
+    '''Returns {check: {"UR", "d_breadth", "d_height", "d_length"}} for the
+    current section, with the derivatives in [1/mm] and None where a check
+    is not applicable.'''
+    (load_duration, is_load_sharing, permanent_udl, imposed_udl, imposed_combination_factor,
+     deflection_limit, is_restrained, permanent_load_factor, variable_load_factor,
+     with_creep) = design_args
+    if include_selfweight:
+        ur_results = design._find_utilisation_results_with_selfweight(*design_args)
+        selfweight = design.get_beam_selfweight_per_m()
+        permanent_udl = permanent_udl + selfweight
+    else:
+        ur_results = design._find_utilisation_results(*design_args)
+        selfweight = 0
+    material = design.material
+    properties = material.material_properties
+    breadth = design.breadth
+    height = design.height
+    length = design.length
+
+    # the selfweight is proportional to the area
+    d_udl = {
+        "d_breadth": selfweight / breadth,
+        "d_height": selfweight / height,
+        "d_length": 0,
+        }
+    factored_udl = (permanent_load_factor * permanent_udl
+                    + variable_load_factor * imposed_udl)
+
+    bending_strength = design.get_bending_strength(is_load_sharing, load_duration)
+    bending_ur_per_udl = ((length / 1000)**2 / 8 * 10**6
+                          / design.get_elastic_section_modulus(True) / bending_strength)
+    bending_ur = ur_results["bending_UR"]
+    k_h_log_derivative = material.get_k_h_derivative(height) / design.get_k_h()
+    bending = {
+        "d_breadth": -1 / breadth,
+        "d_height": -2 / height - k_h_log_derivative,
+        "d_length": 2 / length,
+        }
+    for key, log_derivative in bending.items():
+        bending[key] = (bending_ur_per_udl * permanent_load_factor * d_udl[key]
+                        + bending_ur * log_derivative)
+
+    shear_strength = design.get_shear_strength(is_load_sharing, load_duration)
+    shear_ur_per_udl = ((3 * (length / 1000) / 2 * 10**3)
+                        / (2 * design.area * material.get_k_cr()) / shear_strength)
+    shear_ur = ur_results["shear_UR"]
+    shear = {
+        "d_breadth": -1 / breadth,
+        "d_height": -1 / height,
+        "d_length": 1 / length,
+        }
+    for key, log_derivative in shear.items():
+        shear[key] = (shear_ur_per_udl * permanent_load_factor * d_udl[key]
+                      + shear_ur * log_derivative)
+
+    ltb_ur = ur_results["LTB_UR"]
+    if ltb_ur is None:
+        ltb = dict.fromkeys(bending)
+    else:
+        # LTB only applies with height > breadth, so the aspect ratio of the
+        # torsion coefficient is breadth / height
+        beta = design.get_torsion_coefficient_beta()
+        beta_log_derivative = get_torsion_coefficient_beta_derivative(breadth, height) / beta
+        # the derived G_005 of softwood is inversely proportional to beta, which cancels
+        # beta in the torsional stiffness G_005 * I_tor
+        if properties["G_005"] is None and material.material_type in ["softwood"]:
+            beta_log_derivative = 0
+        critical_stress_log_derivative = {
+            "d_breadth": 2 / breadth + 0.5 * beta_log_derivative / height,
+            "d_height": -1 / height - 0.5 * beta_log_derivative * breadth / height**2,
+            "d_length": -1 / length,
+            }
+        relative_slenderness = design.get_relative_slenderness()
+        k_crit = material.get_k_crit(relative_slenderness)
+        k_crit_derivative = material.get_k_crit_derivative(relative_slenderness)
+        ltb = {}
+        for key, log_derivative in critical_stress_log_derivative.items():
+            d_k_crit = k_crit_derivative * -0.5 * relative_slenderness * log_derivative
+            ltb[key] = bending[key] / k_crit - ltb_ur * d_k_crit / k_crit
+
+    k_def = material.get_k_def() if with_creep else 0
+    creep_udl = (permanent_udl * (1 + k_def)
+                 + imposed_udl * (1 + imposed_combination_factor * k_def))
+    flexural_deflection_per_udl = (5 * length**4 / (384 * properties["E_0_mean"]
+                                                   * design.get_second_moment_of_area(True)))
+    shear_deflection_per_udl = (material.get_k_form() * length**2
+                                / (8 * properties["G_mean"] * design.area))
+    deflection_ur_per_udl = (flexural_deflection_per_udl + shear_deflection_per_udl) / deflection_limit
+    deflection_ur = ur_results["deflection_UR"]
+    deflection = {
+        "d_breadth": deflection_ur_per_udl * (1 + k_def) * d_udl["d_breadth"] - deflection_ur / breadth,
+        "d_height": (deflection_ur_per_udl * (1 + k_def) * d_udl["d_height"]
+                     - creep_udl * (3 * flexural_deflection_per_udl + shear_deflection_per_udl)
+                     / (height * deflection_limit)),
+        "d_length": (creep_udl * (4 * flexural_deflection_per_udl + 2 * shear_deflection_per_udl)
+                     / (length * deflection_limit)),
+        }
+
+    results = {}
+    for check, derivatives in (("bending_UR", bending), ("shear_UR", shear),
+                               ("LTB_UR", ltb), ("deflection_UR", deflection)):
+        results[check] = {"UR": ur_results[check]}
+        results[check].update(derivatives)
+    return results